@@ -0,0 +1,98 @@
+"""
+Benchmark for the streaming feed parser against feedparser on large feeds.
+
+Builds one large feed per sample in tests/fixtures/feeds by repeating its items
+until it holds --items of them, then reports best wall time and peak traced
+memory per feed for three parsers: feedparser, the streaming parser reading the
+whole feed, and the streaming parser stopping at STREAM_MAX_ITEMS as
+NewsScraper.read_feed does. A correctness check confirms the streaming parser
+yields the same titles and sanitised summaries as feedparser.
+
+Usage:
+    uv run python -m benchmarks.feed_parser [--items 2000] [--repeat 3]
+"""
+
+import argparse
+import re
+import time
+import tracemalloc
+from pathlib import Path
+
+import feedparser
+
+from daily_panda_image.utils.feed_parser import STREAM_MAX_ITEMS, parse_feed
+from daily_panda_image.utils.news_scraper import NewsScraper
+
+FIXTURES = Path(__file__).resolve().parent.parent / "tests" / "fixtures" / "feeds"
+
+_ITEMS = re.compile(rb"<item>.*?</item>\s*", re.DOTALL)
+
+
+def enlarge(body: bytes, items: int) -> bytes:
+    """Repeat a sample's items in place until the feed holds the requested number."""
+    found = _ITEMS.findall(body)
+    if not found:
+        raise ValueError("sample has no <item> elements")
+    start = body.index(found[0])
+    end = body.index(found[-1]) + len(found[-1])
+    repeated = b"".join(found[i % len(found)] for i in range(items))
+    return body[:start] + repeated + body[end:]
+
+
+def measure(func, body: bytes, repeat: int) -> tuple[float, int]:
+    """Best wall time in seconds and peak traced allocation in bytes."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(body)
+        best = min(best, time.perf_counter() - started)
+    tracemalloc.start()
+    try:
+        func(body)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+
+def check(body: bytes) -> None:
+    """Fail loudly if the streaming parser disagrees with feedparser."""
+    expected = [
+        (e.get("title"), NewsScraper.sanitize_summary(e.get("summary") or ""))
+        for e in feedparser.parse(body).entries
+    ]
+    actual = [
+        (e["title"], NewsScraper.sanitize_summary(e["summary"]))
+        for e in parse_feed(body, max_items=None)
+    ]
+    if actual != expected:
+        raise SystemExit("Streaming parser output differs from feedparser")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    samples = sorted(FIXTURES.glob("*.xml"))
+    if not samples:
+        raise SystemExit(f"No feed samples found in {FIXTURES}")
+    parsers = [
+        ("feedparser", lambda body: feedparser.parse(body).entries),
+        ("streaming, whole feed", lambda body: parse_feed(body, max_items=None)),
+        (f"streaming, {STREAM_MAX_ITEMS} items", parse_feed),
+    ]
+    for path in samples:
+        body = enlarge(path.read_bytes(), args.items)
+        check(body)
+        print(
+            f"{path.stem}: {args.items} items, {len(body) / 1024:,.0f} KiB, best of {args.repeat}"
+        )
+        for name, func in parsers:
+            seconds, peak = measure(func, body, args.repeat)
+            print(f"  {name:<24}: {seconds * 1000:9.2f} ms  {peak / 1024:10,.0f} KiB peak")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark for NewsScraper.sanitize_summary on the feed samples in tests/fixtures/feeds.
+
+Parses every sample feed once, then times the streaming sanitiser against a
+whole-body baseline (regex tag strip plus html.unescape over the full text) and
+reports how much smaller the summaries handed to the prompt become. The "long"
+corpus repeats each article body to show that the sanitiser's cost stays flat
+once SUMMARY_MAX_CHARS of text have been collected.
+
+Usage:
+    uv run python -m benchmarks.news_scraper [--repeat 5] [--long-factor 20]
+"""
+
+import argparse
+import html
+import re
+import time
+from pathlib import Path
+
+import feedparser
+
+from daily_panda_image.utils.news_scraper import SUMMARY_MAX_CHARS, NewsScraper
+from daily_panda_image.utils.text_processor import TextProcessor
+
+FIXTURES = Path(__file__).resolve().parent.parent / "tests" / "fixtures" / "feeds"
+
+_TAG = re.compile(r"<[^>]*>")
+
+
+def load_summaries() -> list[str]:
+    """Raw summary fields of every entry in the sample feeds, as feedparser returns them."""
+    summaries = []
+    for path in sorted(FIXTURES.glob("*.xml")):
+        for entry in feedparser.parse(path.read_bytes()).entries:
+            summary = entry.get("summary") or entry.get("description")
+            if summary:
+                summaries.append(summary)
+    return summaries
+
+
+def baseline_sanitize(summary: str) -> str:
+    """Whole-body regex strip, the usual quick alternative to a parser."""
+    text = html.unescape(_TAG.sub(" ", summary))
+    return TextProcessor.enforce_ascii(" ".join(text.split()))[:SUMMARY_MAX_CHARS]
+
+
+def measure(func, summaries: list[str], repeat: int) -> float:
+    """Best wall time over several runs for the whole corpus, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for summary in summaries:
+            func(summary)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def report(name: str, summaries: list[str], repeat: int) -> None:
+    sanitized = [NewsScraper.sanitize_summary(summary) for summary in summaries]
+    chars_before = sum(len(summary) for summary in summaries)
+    chars_after = sum(len(summary) for summary in sanitized)
+    tokens_before = sum(TextProcessor.estimate_tokens(summary) for summary in summaries)
+    tokens_after = sum(TextProcessor.estimate_tokens(summary) for summary in sanitized)
+
+    baseline = measure(baseline_sanitize, summaries, repeat)
+    current = measure(NewsScraper.sanitize_summary, summaries, repeat)
+    per_item = 1_000_000 / len(summaries)
+
+    print(f"{name} corpus: {len(summaries)} summaries, {chars_before:,} chars, best of {repeat}")
+    print(f"  size                : {chars_before:,} -> {chars_after:,} chars")
+    print(f"  estimated tokens    : {tokens_before:,} -> {tokens_after:,}")
+    print(f"  regex whole body    : {baseline * per_item:8.1f} us/summary")
+    print(f"  streaming sanitiser : {current * per_item:8.1f} us/summary")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--long-factor", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    summaries = load_summaries()
+    if not summaries:
+        raise SystemExit(f"No feed samples found in {FIXTURES}")
+    report("samples", summaries, args.repeat)
+    report("long", [summary * args.long_factor for summary in summaries], args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+"""
+End-to-end benchmark of the daily run and the batch paths, fully offline.
+
+A local StubServer stands in for both the news sites and the OpenAI API: it
+replays the recorded feeds in tests/fixtures/feeds, a recorded chat completion
+from tests/fixtures/openai and a synthetic PNG for image requests, each with a
+configurable injected latency. Output is written to a throwaway project root.
+
+Three scenarios are timed:
+    daily    PandaImageGenerator.generate_daily_panda, once per --repeat
+    backfill BackfillRunner over --dates missing dates
+    async    PandaImageGenerator.agenerate_many over --dates dates
+
+For each scenario the report gives p50/p95 wall time, a per-span breakdown from
+the telemetry registry, bytes written and the process's peak RSS so far. The
+results are saved as JSON (with the git commit) and can be compared with an
+earlier run via --compare.
+
+Usage:
+    uv run python -m benchmarks.pipeline [--repeat 5] [--dates 6] [--image-latency 0.5]
+        [--chat-latency 0.2] [--feed-latency 0.05] [--optimize] [--output PATH]
+        [--compare PATH]
+"""
+
+import argparse
+import asyncio
+import base64
+import datetime
+import io
+import json
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Iterator
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+from PIL import Image
+from tests.stub_server import StubResponse, StubServer
+
+from daily_panda_image.generators.backfill import BackfillRunner
+from daily_panda_image.generators.image_generator import PandaImageGenerator
+from daily_panda_image.generators.openai_clients import create_async_client, create_client
+from daily_panda_image.utils import news_scraper
+from daily_panda_image.utils.file_manager import FileManager
+from daily_panda_image.utils.image_post_processor import ImagePostProcessor
+from daily_panda_image.utils.telemetry import REGISTRY, configure_logging
+
+ROOT = Path(__file__).resolve().parent.parent
+FEEDS = ROOT / "tests" / "fixtures" / "feeds"
+CHAT_COMPLETION = ROOT / "tests" / "fixtures" / "openai" / "chat_completion.json"
+RESULTS = ROOT / "benchmarks" / "results"
+
+# Spans whose byte counts are output written to disk
+WRITE_SPANS = ("file.write", "manifest.append")
+
+START_DATE = datetime.date(2026, 6, 1)
+
+
+def synthetic_png(size: int) -> bytes:
+    """A photo-like PNG: smooth gradients plus noise, so it compresses like a real image."""
+    rng = np.random.default_rng(0)
+    y, x = np.mgrid[0:size, 0:size] / size
+    base = np.stack([x * 200, y * 180, (1 - x) * 160], axis=-1)
+    pixels = np.clip(base + rng.normal(0, 12, base.shape), 0, 255).astype(np.uint8)
+    buffer = io.BytesIO()
+    Image.fromarray(pixels).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def start_stub(args: argparse.Namespace, stack: ExitStack) -> StubServer:
+    """Serve the recorded feeds and OpenAI endpoints, and point the scraper at them."""
+    server = stack.enter_context(StubServer())
+    feeds = []
+    for path in sorted(FEEDS.glob("*.xml")):
+        route = f"/feeds/{path.name}"
+        server.add(
+            route,
+            StubResponse(
+                path.read_bytes(),
+                headers={"Content-Type": "application/rss+xml"},
+                delay=args.feed_latency,
+            ),
+        )
+        feeds.append((path.stem, server.url(route)))
+    stack.enter_context(patch.object(news_scraper, "NEWS_FEEDS", feeds))
+
+    json_headers = {"Content-Type": "application/json"}
+    server.add(
+        "/v1/chat/completions",
+        StubResponse(CHAT_COMPLETION.read_bytes(), headers=json_headers, delay=args.chat_latency),
+    )
+    image = base64.b64encode(synthetic_png(args.image_size)).decode()
+
+    def images(request):
+        n = json.loads(request.body).get("n", 1)
+        body = {
+            "created": 0,
+            "data": [{"b64_json": image}] * n,
+            "usage": {"input_tokens": 150, "output_tokens": 4160, "total_tokens": 4310},
+        }
+        return StubResponse(json.dumps(body), headers=json_headers, delay=args.image_latency)
+
+    server.add("/v1/images/generations", images)
+    return server
+
+
+@contextmanager
+def project_root() -> Iterator[Path]:
+    """Redirect every FileManager path to a throwaway root holding a copy of the README."""
+    with tempfile.TemporaryDirectory(prefix="panda-bench-") as directory:
+        root = Path(directory)
+        shutil.copy(ROOT / "README.md", root / "README.md")
+        with patch.object(FileManager, "get_project_root", return_value=root):
+            yield root
+
+
+def peak_rss_bytes() -> int:
+    """Peak resident set size of this process so far."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def snapshot(samples: list[float]) -> dict:
+    """Wall-time percentiles and the telemetry breakdown collected since the last reset."""
+    stages = {
+        name: {
+            "count": stats.count,
+            "errors": stats.errors,
+            "total_s": round(stats.seconds, 4),
+            "mean_ms": round(stats.seconds / stats.count * 1000, 2),
+            "max_ms": round(stats.max_seconds * 1000, 2),
+            **{key: int(value) for key, value in stats.totals.items()},
+        }
+        for name, stats in sorted(REGISTRY.stats.items())
+    }
+    written = sum(stages.get(name, {}).get("bytes", 0) for name in WRITE_SPANS)
+    return {
+        "runs": len(samples),
+        "p50_s": round(float(np.percentile(samples, 50)), 4),
+        "p95_s": round(float(np.percentile(samples, 95)), 4),
+        "samples_s": [round(sample, 4) for sample in samples],
+        "bytes_written": written,
+        "peak_rss_bytes": peak_rss_bytes(),
+        "stages": stages,
+    }
+
+
+def make_generator(server: StubServer, post_processor: ImagePostProcessor | None):
+    return PandaImageGenerator(
+        create_client("bench-key", server.url("/v1")),
+        create_async_client("bench-key", server.url("/v1")),
+        post_processor=post_processor,
+    )
+
+
+def run_daily(server, post_processor, args) -> dict:
+    """generate_daily_panda for consecutive dates into one project root."""
+    samples = []
+    with project_root():
+        generator = make_generator(server, post_processor)
+        for day in range(args.repeat):
+            started = time.perf_counter()
+            generator.generate_daily_panda(START_DATE + datetime.timedelta(days=day))
+            samples.append(time.perf_counter() - started)
+    return snapshot(samples)
+
+
+def run_backfill(server, post_processor, args) -> dict:
+    """BackfillRunner over a fresh range each repeat, without the production rate limits."""
+    samples = []
+    end = START_DATE + datetime.timedelta(days=args.dates - 1)
+    for _ in range(args.repeat):
+        with project_root():
+            generator = make_generator(server, post_processor)
+            runner = BackfillRunner(
+                generator, args.workers, chats_per_minute=None, images_per_minute=None
+            )
+            started = time.perf_counter()
+            report = runner.run(START_DATE, end)
+            samples.append(time.perf_counter() - started)
+            if report.failed:
+                raise SystemExit(f"Backfill failed: {report.failed}")
+    return snapshot(samples)
+
+
+def run_async(server, post_processor, args) -> dict:
+    """agenerate_many over a fresh range each repeat."""
+    samples = []
+    dates = [START_DATE + datetime.timedelta(days=day) for day in range(args.dates)]
+
+    async def generate(generator):
+        try:
+            return await generator.agenerate_many(dates, max_concurrency=args.workers)
+        finally:
+            await generator.aclose()
+
+    for _ in range(args.repeat):
+        with project_root():
+            generator = make_generator(server, post_processor)
+            started = time.perf_counter()
+            outcomes = asyncio.run(generate(generator))
+            samples.append(time.perf_counter() - started)
+            failures = {day: error for day, error in outcomes.items() if error is not None}
+            if failures:
+                raise SystemExit(f"Async batch failed: {failures}")
+    return snapshot(samples)
+
+
+SCENARIOS = {"daily": run_daily, "backfill": run_backfill, "async": run_async}
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_report(name: str, result: dict) -> None:
+    print(
+        f"{name}: p50 {result['p50_s']:.3f}s, p95 {result['p95_s']:.3f}s over {result['runs']} "
+        f"runs, {result['bytes_written'] / 1e6:.1f} MB written, "
+        f"peak RSS {result['peak_rss_bytes'] / 1e6:.0f} MB"
+    )
+    for stage, stats in result["stages"].items():
+        print(
+            f"  {stage:<18} {stats['count']:>4}x  mean {stats['mean_ms']:>9.2f} ms  "
+            f"total {stats['total_s']:>8.3f} s"
+        )
+
+
+def print_comparison(previous: dict, current: dict) -> None:
+    print(f"\nCompared with {previous.get('commit') or 'previous run'}:")
+    for name, result in current["scenarios"].items():
+        before = previous.get("scenarios", {}).get(name)
+        if not before:
+            continue
+        for key in ("p50_s", "p95_s"):
+            change = (result[key] - before[key]) / before[key] * 100 if before[key] else 0.0
+            print(f"  {name} {key[:3]}: {before[key]:.3f}s -> {result[key]:.3f}s ({change:+.1f}%)")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--dates", type=int, default=6, help="dates per batch run")
+    parser.add_argument("--workers", type=int, default=2, help="image requests in flight")
+    parser.add_argument("--image-latency", type=float, default=0.5)
+    parser.add_argument("--chat-latency", type=float, default=0.2)
+    parser.add_argument("--feed-latency", type=float, default=0.05)
+    parser.add_argument("--image-size", type=int, default=1024)
+    parser.add_argument("--optimize", action="store_true", help="include post-processing")
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--output", type=Path, help="result file (default: benchmarks/results/)")
+    parser.add_argument("--compare", type=Path, help="earlier result file to compare against")
+    args = parser.parse_args(argv)
+
+    configure_logging("WARNING")
+    commit = git_commit()
+    results = {
+        "benchmark": "pipeline",
+        "commit": commit,
+        "recorded_at": datetime.datetime.now(datetime.UTC).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "parameters": {
+            key: value
+            for key, value in vars(args).items()
+            if key not in ("output", "compare", "scenarios")
+        },
+        "scenarios": {},
+    }
+
+    with ExitStack() as stack:
+        server = start_stub(args, stack)
+        post_processor = ImagePostProcessor() if args.optimize else None
+        if post_processor is not None:
+            stack.callback(post_processor.close)
+        for name in args.scenarios:
+            REGISTRY.reset()
+            results["scenarios"][name] = SCENARIOS[name](server, post_processor, args)
+            print_report(name, results["scenarios"][name])
+
+    output = args.output or RESULTS / f"pipeline-{commit or 'unknown'}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2) + "\n")
+    print(f"\nResults saved to {output}")
+
+    if args.compare:
+        print_comparison(json.loads(args.compare.read_text()), results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Micro-benchmark for TextProcessor.enforce_ascii on large headline/summary corpora.
+
+Compares the single-pass encoder/translation-table implementation against the
+previous one (one str.replace per ASCII_REPLACEMENTS entry plus a regex pass) on
+two corpora: "dense" packs a non-ASCII character every few words, "headlines"
+matches typical English feeds where most lines are plain ASCII.
+
+Usage:
+    uv run python -m benchmarks.text_processor [--megabytes 4] [--repeat 5]
+"""
+
+import argparse
+import re
+import time
+
+from daily_panda_image.utils.text_processor import TextProcessor
+
+DENSE_SAMPLE = (
+    "“Ceasefire talks resume” — negotiators meet in Doha… "
+    "Zürich’s central bank holds rates at 1.5% as the € slips against the £. "
+    "São Paulo floods displace 10,000; Kraków festival draws crowds → record turnout. "
+    "Plain ASCII headline about a panda cub born at the national zoo. "
+)
+
+HEADLINE_SAMPLE = (
+    "Plain ASCII headline about a panda cub born at the national zoo. " * 20
+    + "Zürich’s “central bank” holds rates — again. "
+)
+
+CORPORA = {"dense": DENSE_SAMPLE, "headlines": HEADLINE_SAMPLE}
+
+
+def legacy_enforce_ascii(text: str) -> str:
+    """The pre-translation-table implementation, kept here as the baseline."""
+    for old, new in TextProcessor.ASCII_REPLACEMENTS.items():
+        text = text.replace(old, new)
+    return re.sub(r"[^\x00-\x7F]+", "", text)
+
+
+def build_corpus(sample: str, megabytes: float) -> str:
+    """Repeat a sample until the UTF-8 encoded corpus reaches the requested size."""
+    target = int(megabytes * 1024 * 1024)
+    sample_bytes = len(sample.encode("utf-8"))
+    return sample * (target // sample_bytes + 1)
+
+
+def measure(func, text: str, repeat: int) -> float:
+    """Best wall time over several runs, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(text)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--megabytes", type=float, default=4.0)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    for name, sample in CORPORA.items():
+        corpus = build_corpus(sample, args.megabytes)
+        size_mb = len(corpus.encode("utf-8")) / (1024 * 1024)
+
+        if TextProcessor.enforce_ascii(corpus) != legacy_enforce_ascii(corpus):
+            raise SystemExit(f"Output mismatch on the {name} corpus")
+
+        legacy = measure(legacy_enforce_ascii, corpus, args.repeat)
+        current = measure(TextProcessor.enforce_ascii, corpus, args.repeat)
+
+        print(f"{name} corpus: {size_mb:.1f} MB, best of {args.repeat}")
+        print(f"  legacy replace loop : {legacy * 1000:8.1f} ms  ({size_mb / legacy:7.1f} MB/s)")
+        print(f"  single pass         : {current * 1000:8.1f} ms  ({size_mb / current:7.1f} MB/s)")
+        print(f"  speed-up            : {legacy / current:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Channels - Bot variants that share one headline fetch but differ in subject, style and output.
+
+Channels are read from a TOML file, one table per channel:
+
+    [channels.panda]                      # every field is optional
+    [channels.red-panda]
+    subject = "red panda"
+    output_root = "channels/red-panda"    # relative to the project root
+    image_size = "1536x1024"
+    system_prompt = "You are a prompt engineer for watercolour red panda scenes..."
+    feeds = [
+        { name = "BBC News", url = "https://feeds.bbci.co.uk/news/rss.xml" },
+    ]
+
+Fields left out fall back to the single-bot defaults (NEWS_FEEDS, the panda
+system prompt, the generators' models and size, and the project root).
+"""
+
+import tomllib
+from dataclasses import dataclass, fields
+from pathlib import Path
+
+# Channel file looked up in the project root when none is given
+CHANNELS_FILE = "channels.toml"
+
+
+@dataclass(frozen=True)
+class Channel:
+    """One bot variant; None fields use the single-bot defaults."""
+
+    name: str
+    feeds: tuple[tuple[str, str], ...] | None = None
+    subject: str = "panda"
+    system_prompt: str | None = None
+    chat_model: str | None = None
+    image_model: str | None = None
+    image_size: str | None = None
+    output_root: Path | None = None
+
+    @classmethod
+    def from_dict(cls, name: str, data: dict) -> "Channel":
+        """
+        Build a channel from its TOML table.
+
+        Args:
+            name: Table name, used as the channel name
+            data: Table contents
+
+        Returns:
+            Channel instance
+
+        Raises:
+            ValueError: If the table has unknown keys or malformed feeds
+        """
+        unknown = set(data) - {field.name for field in fields(cls)}
+        if unknown:
+            raise ValueError(f"Unknown keys in channel '{name}': {', '.join(sorted(unknown))}")
+        options = dict(data)
+        if "feeds" in options:
+            try:
+                options["feeds"] = tuple((feed["name"], feed["url"]) for feed in options["feeds"])
+            except (KeyError, TypeError) as e:
+                raise ValueError(f"Feeds of channel '{name}' need a name and a url") from e
+        if "output_root" in options:
+            options["output_root"] = Path(options["output_root"])
+        return cls(name=name, **options)
+
+
+def load_channels(path: str | Path) -> list[Channel]:
+    """
+    Read the channels defined in a TOML file, in file order.
+
+    Args:
+        path: Channel configuration file
+
+    Returns:
+        Configured channels
+
+    Raises:
+        ValueError: If the file defines no channels or a channel is malformed
+    """
+    with open(path, "rb") as f:
+        tables = tomllib.load(f).get("channels", {})
+    if not tables:
+        raise ValueError(f"No [channels.<name>] tables in {path}")
+    return [Channel.from_dict(name, data) for name, data in tables.items()]
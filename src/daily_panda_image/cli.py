@@ -0,0 +1,433 @@
+"""
+Command-line interface - Subcommands for the daily run, backfills and archive maintenance.
+
+Only the standard library is imported at module load. openai, feedparser,
+pydantic, NumPy and Pillow are imported inside the subcommands that need them,
+so "--help" and archive-only commands start in a few tens of milliseconds.
+"""
+
+import argparse
+import datetime
+import importlib
+import logging
+import sys
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Subcommand used when the command line starts with an option or is empty
+DEFAULT_COMMAND = "run"
+
+# Repository root, where the benchmarks package lives
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+
+
+def _common_options() -> argparse.ArgumentParser:
+    """Options every subcommand accepts."""
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument(
+        "--log-level",
+        default="INFO",
+        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        help="minimum log level; DEBUG adds span timings and intermediate prompts",
+    )
+    parser.add_argument(
+        "--json-logs",
+        action="store_true",
+        help="emit one JSON object per log line, with span fields, instead of plain text",
+    )
+    parser.add_argument(
+        "--metrics-file",
+        metavar="PATH",
+        help="write per-span timings, bytes and tokens to PATH in Prometheus text format",
+    )
+    return parser
+
+
+def _generator_options() -> argparse.ArgumentParser:
+    """Options of the subcommands that call the OpenAI API."""
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument(
+        "--stream-prompt",
+        action="store_true",
+        help="stream the chat completion and stop at the last complete sentence",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="always call the API instead of reusing cached prompts and images",
+    )
+    parser.add_argument(
+        "--variants",
+        type=int,
+        default=1,
+        help="images generated per prompt in one request; the best-scoring one is kept",
+    )
+    parser.add_argument(
+        "--duplicate-retries",
+        type=int,
+        metavar="N",
+        help="check each image against the archive's perceptual hashes and regenerate up to N "
+        "times on a near match (0 only warns; default: no check)",
+    )
+    parser.add_argument(
+        "--no-optimize",
+        action="store_true",
+        help="save the PNG as returned by the API, without recompression or WebP/AVIF copies",
+    )
+    return parser
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser with every subcommand."""
+    common = _common_options()
+    generator = _generator_options()
+    parser = argparse.ArgumentParser(
+        prog="daily-panda", description="Generate the daily panda image."
+    )
+    commands = parser.add_subparsers(dest="command", metavar="COMMAND")
+
+    commands.add_parser(
+        "run", parents=[common, generator], help="generate today's panda (the default)"
+    )
+
+    backfill = commands.add_parser(
+        "backfill", parents=[common, generator], help="generate every missing date in a range"
+    )
+    backfill.add_argument("start", type=datetime.date.fromisoformat, help="first date, YYYY-MM-DD")
+    backfill.add_argument("end", type=datetime.date.fromisoformat, help="last date, inclusive")
+    backfill.add_argument(
+        "--workers", type=int, help="image requests in flight (default: BACKFILL_WORKERS)"
+    )
+    backfill.add_argument(
+        "--prompt-workers",
+        type=int,
+        help="chat completions in flight (default: BACKFILL_PROMPT_WORKERS)",
+    )
+    backfill.add_argument(
+        "--images-per-minute",
+        type=float,
+        help="image request rate limit (default: BACKFILL_IMAGES_PER_MINUTE)",
+    )
+
+    daemon = commands.add_parser(
+        "daemon",
+        parents=[common, generator],
+        help="stay running and publish at every scheduled time from warm clients",
+    )
+    daemon.add_argument(
+        "--schedule",
+        default=None,
+        help='cron expression in UTC (default: DEFAULT_SCHEDULE, "0 4 * * *")',
+    )
+    daemon.add_argument(
+        "--prefetch-minutes",
+        type=float,
+        help="fetch and rank headlines this long before publishing (default: PREFETCH_LEAD)",
+    )
+
+    channels = commands.add_parser(
+        "run-channels",
+        parents=[common, generator],
+        help="generate every configured channel from one shared headline fetch",
+    )
+    channels.add_argument(
+        "--config",
+        type=Path,
+        help="channel file with [channels.<name>] tables (default: channels.toml)",
+    )
+    channels.add_argument(
+        "--date", type=datetime.date.fromisoformat, help="date to generate (default: today)"
+    )
+    channels.add_argument(
+        "--concurrency", type=int, help="channels generating at once (default: FANOUT_CONCURRENCY)"
+    )
+
+    commands.add_parser(
+        "status",
+        parents=[common],
+        help="print the daemon's status file; exits 1 if the daemon is not healthy",
+    )
+
+    headlines = commands.add_parser(
+        "fetch-headlines",
+        parents=[common],
+        help="fetch and rank today's headlines without calling the OpenAI API",
+    )
+    headlines.add_argument(
+        "--date", type=datetime.date.fromisoformat, help="date to rank for (default: today)"
+    )
+    headlines.add_argument(
+        "--no-cache", action="store_true", help="ignore the feed cache's validators and entries"
+    )
+    headlines.add_argument(
+        "--fast-parse",
+        action="store_true",
+        help="read only the first items' titles and summaries with the streaming parser, "
+        "falling back to feedparser on malformed feeds",
+    )
+
+    commands.add_parser(
+        "rebuild-index",
+        parents=[common],
+        help="regenerate archive/manifest.jsonl from the images/ and prompts/ folders",
+    )
+
+    index_images = commands.add_parser(
+        "index-images",
+        parents=[common],
+        help="update archive/image_hashes.npy and list near-duplicate images in the archive",
+    )
+    index_images.add_argument(
+        "--workers", type=int, help="processes hashing images (default: one per core)"
+    )
+    index_images.add_argument(
+        "--rebuild", action="store_true", help="rehash every image instead of only new ones"
+    )
+    index_images.add_argument(
+        "--max-distance",
+        type=int,
+        help="differing bits (of 64) that still count as a near duplicate "
+        "(default: NEAR_DUPLICATE_DISTANCE)",
+    )
+
+    bench = commands.add_parser(
+        "bench", parents=[common], help="run a benchmark from the benchmarks/ folder"
+    )
+    bench.add_argument("name", help="benchmark module, e.g. pipeline or news_scraper")
+    bench.add_argument("bench_args", nargs=argparse.REMAINDER, help="arguments for the benchmark")
+    return parser
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """
+    Parse command-line arguments.
+
+    A command line without a subcommand (such as the bare invocation the
+    scheduled workflow uses) runs DEFAULT_COMMAND.
+
+    Args:
+        argv: Arguments without the program name (defaults to sys.argv[1:])
+
+    Returns:
+        Parsed arguments with a "command" attribute
+    """
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if not argv or (argv[0].startswith("-") and argv[0] not in ("-h", "--help")):
+        argv = [DEFAULT_COMMAND, *argv]
+    return build_parser().parse_args(argv)
+
+
+def _build_generator(args: argparse.Namespace, post_processor):
+    from daily_panda_image.config import get_settings
+    from daily_panda_image.generators.image_generator import PandaImageGenerator
+    from daily_panda_image.utils.response_cache import ResponseCache
+
+    get_settings()
+    image_index = None
+    if args.duplicate_retries is not None:
+        from daily_panda_image.utils.image_hash import ImageHashIndex
+
+        image_index = ImageHashIndex.load()
+    return PandaImageGenerator(
+        stream_prompts=args.stream_prompt,
+        response_cache=None if args.no_cache else ResponseCache.load(),
+        post_processor=post_processor,
+        variants=args.variants,
+        image_index=image_index,
+        duplicate_retries=args.duplicate_retries or 0,
+    )
+
+
+def _generate(args: argparse.Namespace) -> int:
+    """Run the daily generation or a backfill; returns the exit status."""
+    from daily_panda_image.utils.image_post_processor import ImagePostProcessor
+
+    post_processor = None if args.no_optimize else ImagePostProcessor()
+    try:
+        generator = _build_generator(args, post_processor)
+        if args.command == "run":
+            generator.generate_daily_panda()
+            return 0
+
+        from daily_panda_image.generators.backfill import BackfillRunner
+
+        options = {
+            "max_workers": args.workers,
+            "prompt_workers": args.prompt_workers,
+            "images_per_minute": args.images_per_minute,
+        }
+        runner = BackfillRunner(
+            generator, **{key: value for key, value in options.items() if value is not None}
+        )
+        report = runner.run(args.start, args.end)
+        return 1 if report.failed else 0
+    finally:
+        if post_processor is not None:
+            post_processor.close()
+
+
+def _daemon(args: argparse.Namespace) -> int:
+    """Run the scheduler until SIGTERM or SIGINT."""
+    import signal
+
+    from daily_panda_image.generators.daemon import PandaDaemon
+    from daily_panda_image.utils.image_post_processor import ImagePostProcessor
+    from daily_panda_image.utils.schedule import CronSchedule
+
+    post_processor = None if args.no_optimize else ImagePostProcessor()
+    try:
+        options = {}
+        if args.schedule:
+            options["schedule"] = CronSchedule(args.schedule)
+        if args.prefetch_minutes is not None:
+            options["prefetch_lead"] = datetime.timedelta(minutes=args.prefetch_minutes)
+        daemon = PandaDaemon(_build_generator(args, post_processor), **options)
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, lambda *_: daemon.stop())
+        daemon.run()
+        return 0
+    finally:
+        if post_processor is not None:
+            post_processor.close()
+
+
+def _run_channels(args: argparse.Namespace) -> int:
+    """Generate every channel once; returns 1 if any channel failed."""
+    from daily_panda_image.channels import CHANNELS_FILE, load_channels
+    from daily_panda_image.config import get_settings
+    from daily_panda_image.generators.fanout import FANOUT_CONCURRENCY, ChannelFanout
+    from daily_panda_image.utils.file_manager import FileManager
+    from daily_panda_image.utils.image_post_processor import ImagePostProcessor
+    from daily_panda_image.utils.response_cache import ResponseCache
+
+    get_settings()
+    channels = load_channels(args.config or FileManager.get_project_root() / CHANNELS_FILE)
+    post_processor = None if args.no_optimize else ImagePostProcessor()
+    try:
+        fanout = ChannelFanout(
+            channels,
+            response_cache=None if args.no_cache else ResponseCache.load(),
+            post_processor=post_processor,
+            max_concurrency=args.concurrency or FANOUT_CONCURRENCY,
+            stream_prompts=args.stream_prompt,
+            variants=args.variants,
+        )
+        if args.duplicate_retries is not None:
+            from daily_panda_image.utils.image_hash import ImageHashIndex
+
+            # Each channel checks against its own archive
+            for channel in channels:
+                generator = fanout.generators[channel.name]
+                with FileManager.output_root(channel.output_root):
+                    generator.image_index = ImageHashIndex.load()
+                generator.duplicate_retries = args.duplicate_retries
+        outcomes = fanout.run(args.date)
+    finally:
+        if post_processor is not None:
+            post_processor.close()
+    for name, error in outcomes.items():
+        print(f"{name}: {'ok' if error is None else f'failed ({error})'}")
+    return 1 if any(outcomes.values()) else 0
+
+
+def _status(args: argparse.Namespace) -> int:
+    import json
+
+    from daily_panda_image.generators.daemon import read_status
+
+    status = read_status()
+    print(json.dumps(status, indent=2))
+    return 0 if status["healthy"] else 1
+
+
+def _fetch_headlines(args: argparse.Namespace) -> int:
+    from daily_panda_image.utils.feed_cache import FeedCache
+    from daily_panda_image.utils.headline_index import HeadlineIndex
+    from daily_panda_image.utils.headline_ranker import HeadlineRanker
+    from daily_panda_image.utils.news_scraper import NewsScraper
+
+    current_date = args.date or datetime.date.today()
+    history = HeadlineIndex.load(before=current_date)
+    headlines = NewsScraper.fetch_headlines(
+        current_date,
+        cache=None if args.no_cache else FeedCache.load(),
+        history=history,
+        fast_parse=args.fast_parse,
+    )
+    ranked, report = HeadlineRanker.rank(headlines, history, current_date)
+    print(report.summary())
+    print(NewsScraper.format_for_prompt(ranked))
+    return 0
+
+
+def _rebuild_index(args: argparse.Namespace) -> int:
+    from daily_panda_image.utils.archive_manifest import ArchiveManifest
+    from daily_panda_image.utils.file_manager import FileManager
+
+    ArchiveManifest(FileManager.manifest_path()).rebuild()
+    return 0
+
+
+def _index_images(args: argparse.Namespace) -> int:
+    from daily_panda_image.utils.image_hash import NEAR_DUPLICATE_DISTANCE, ImageHashIndex
+
+    if args.rebuild:
+        ImageHashIndex.default_path().unlink(missing_ok=True)
+    index = ImageHashIndex.load(workers=args.workers)
+    max_distance = NEAR_DUPLICATE_DISTANCE if args.max_distance is None else args.max_distance
+    pairs = index.duplicate_pairs(max_distance)
+    print(f"{len(index)} images indexed, {len(pairs)} near-duplicate pairs.")
+    for earlier, later, distance in pairs:
+        print(f"  {earlier}  {later}  {distance} bits differ")
+    return 0
+
+
+def _bench(args: argparse.Namespace) -> int:
+    if str(_PROJECT_ROOT) not in sys.path:
+        sys.path.insert(0, str(_PROJECT_ROOT))
+    try:
+        module = importlib.import_module(f"benchmarks.{args.name}")
+    except ModuleNotFoundError as e:
+        raise SystemExit(f"Unknown benchmark '{args.name}': {e}") from e
+    module.main(args.bench_args)
+    return 0
+
+
+COMMANDS = {
+    "run": _generate,
+    "backfill": _generate,
+    "daemon": _daemon,
+    "run-channels": _run_channels,
+    "status": _status,
+    "fetch-headlines": _fetch_headlines,
+    "rebuild-index": _rebuild_index,
+    "index-images": _index_images,
+    "bench": _bench,
+}
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Main entry point for the application."""
+    args = parse_args(argv)
+
+    from daily_panda_image.utils.telemetry import configure_logging
+
+    configure_logging(args.log_level, args.json_logs)
+    try:
+        status = COMMANDS[args.command](args)
+    except Exception as e:
+        logger.error("Fatal error: %s", e)
+        status = 1
+    finally:
+        if args.metrics_file:
+            from daily_panda_image.utils.file_manager import FileManager
+            from daily_panda_image.utils.telemetry import REGISTRY
+
+            FileManager.atomic_write(args.metrics_file, REGISTRY.render_prometheus())
+    if status:
+        sys.exit(status)
+
+
+if __name__ == "__main__":
+    main()
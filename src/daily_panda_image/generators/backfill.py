@@ -0,0 +1,250 @@
+"""
+Backfill - Generates pandas for a range of past dates that the daily job missed.
+"""
+
+import contextlib
+import datetime
+import logging
+from dataclasses import dataclass, field
+
+from daily_panda_image.generators.image_generator import PandaImageGenerator
+from daily_panda_image.generators.pipeline import Pipeline, Stage, StageMetrics
+from daily_panda_image.generators.prompt_generator import PromptGenerator
+from daily_panda_image.utils.archive_manifest import ArchiveManifest
+from daily_panda_image.utils.feed_cache import FeedCache
+from daily_panda_image.utils.file_manager import FileManager
+from daily_panda_image.utils.headline_index import HeadlineIndex
+from daily_panda_image.utils.news_scraper import NewsScraper
+from daily_panda_image.utils.telemetry import span
+
+logger = logging.getLogger(__name__)
+
+# Parallel image requests; image models have low per-minute limits on most tiers
+BACKFILL_WORKERS = 2
+
+# Parallel chat completions feeding the image stage
+BACKFILL_PROMPT_WORKERS = 1
+
+# Per-endpoint token bucket rates during a backfill, in requests per minute; rate
+# limited requests are retried by the generator's resilience layer
+BACKFILL_CHATS_PER_MINUTE = 20
+BACKFILL_IMAGES_PER_MINUTE = 5
+
+
+def date_range(start: datetime.date, end: datetime.date) -> list[datetime.date]:
+    """
+    List every date from start to end, both inclusive.
+
+    Args:
+        start: First date
+        end: Last date
+
+    Returns:
+        Dates in ascending order (empty if end is before start)
+    """
+    return [start + datetime.timedelta(days=i) for i in range((end - start).days + 1)]
+
+
+@dataclass
+class BackfillReport:
+    """Outcome of a backfill run."""
+
+    generated: list[datetime.date] = field(default_factory=list)
+    skipped: list[datetime.date] = field(default_factory=list)
+    failed: dict[datetime.date, str] = field(default_factory=dict)
+    metrics: dict[str, StageMetrics] = field(default_factory=dict)
+
+
+@dataclass
+class BackfillJob:
+    """One date as it moves through the backfill stages."""
+
+    day: datetime.date
+    prompt: str
+    image_bytes: bytes | None = None
+    derivatives: dict[str, bytes] | None = None
+    # Losing variants when the generator requests several images per prompt
+    variants: list[bytes] | None = None
+    # Seconds per step, recorded in the archive manifest as a single run does
+    timings: dict[str, float] = field(default_factory=dict)
+    # Feed title the prompt was written from, indexed as the date's headline
+    source_headline: str | None = None
+
+
+class BackfillRunner:
+    """Runs prompt generation, image generation and saving for many dates as a pipeline."""
+
+    def __init__(
+        self,
+        generator: PandaImageGenerator,
+        max_workers: int = BACKFILL_WORKERS,
+        prompt_workers: int = BACKFILL_PROMPT_WORKERS,
+        chats_per_minute: float | None = BACKFILL_CHATS_PER_MINUTE,
+        images_per_minute: float | None = BACKFILL_IMAGES_PER_MINUTE,
+    ):
+        """
+        Initialize the backfill runner.
+
+        Args:
+            generator: Panda generator shared by all workers
+            max_workers: Number of image requests in flight at once
+            prompt_workers: Number of chat completions in flight at once
+            chats_per_minute: Chat completion rate limit during the run (None for none)
+            images_per_minute: Image generation rate limit during the run (None for none)
+        """
+        self.generator = generator
+        self.max_workers = max_workers
+        self.prompt_workers = prompt_workers
+        self.chats_per_minute = chats_per_minute
+        self.images_per_minute = images_per_minute
+
+    def rate_limits(self) -> contextlib.ExitStack:
+        """
+        Apply the backfill's rate limits to the generator's resilience layer.
+
+        The limits are lifted when the returned context exits, so a daemon or a
+        daily run sharing the generator keeps its own limits.
+
+        Returns:
+            Context manager holding the limits
+        """
+        stack = contextlib.ExitStack()
+        resilience = self.generator.resilience
+        if self.chats_per_minute is not None:
+            stack.enter_context(
+                resilience.limited("chat", self.chats_per_minute, burst=self.prompt_workers)
+            )
+        if self.images_per_minute is not None:
+            stack.enter_context(
+                resilience.limited("image", self.images_per_minute, burst=self.max_workers)
+            )
+        return stack
+
+    @staticmethod
+    def pending_dates(start: datetime.date, end: datetime.date) -> list[datetime.date]:
+        """
+        Dates in the range whose image or prompt has not been saved yet.
+
+        The manifest answers for most dates; the files are checked for the rest,
+        since a date can be on disk without a record (a crash between the image
+        write and its manifest append, or images merged in from git).
+
+        Args:
+            start: First date
+            end: Last date
+
+        Returns:
+            Dates still to generate, in ascending order
+        """
+        manifest = ArchiveManifest.load()
+        return [
+            day
+            for day in date_range(start, end)
+            if not (manifest.has_output(day) or FileManager.has_output(day))
+        ]
+
+    def run(self, start: datetime.date, end: datetime.date) -> BackfillReport:
+        """
+        Generate every missing date in the range.
+
+        Dates flow through prompt, image, optional optimize and save stages
+        connected by bounded queues, so the image request for one date overlaps
+        the chat completion for the next. Headlines are fetched once and shared
+        by all dates: RSS feeds only carry current news, so backfilled pandas
+        are themed on the news of the run day.
+
+        Args:
+            start: First date
+            end: Last date
+
+        Returns:
+            Report of generated, skipped and failed dates
+        """
+        report = BackfillReport()
+        pending = self.pending_dates(start, end)
+        report.skipped = [day for day in date_range(start, end) if day not in pending]
+        logger.info(
+            "Backfill: %d dates to generate, %d already done.", len(pending), len(report.skipped)
+        )
+        if not pending:
+            return report
+
+        headlines = NewsScraper.fetch_headlines(
+            cache=FeedCache.load(), history=HeadlineIndex.load()
+        )
+
+        def prompt_stage(day: datetime.date) -> BackfillJob:
+            generate = self.generator.prompt_generator.generate_prompt
+            with span("prompt", date=str(day)) as step:
+                prompt = generate(day, headlines)
+            return BackfillJob(
+                day,
+                prompt,
+                timings={"prompt": round(step.seconds, 3)},
+                source_headline=PromptGenerator.source_headline(prompt, headlines),
+            )
+
+        def image_stage(job: BackfillJob) -> BackfillJob:
+            with span("image", date=str(job.day)) as step:
+                image_generator = self.generator.image_generator
+                if self.generator.variants > 1:
+                    job.image_bytes, job.variants = image_generator.generate_best(
+                        job.prompt, self.generator.variants
+                    )
+                else:
+                    job.image_bytes = image_generator.generate_image(job.prompt)
+                if image_index is not None:
+                    # Indexed right away, so dates in flight are also checked against each other
+                    job.image_bytes, image_hash = self.generator.screen_duplicates(
+                        job.prompt, job.image_bytes, job.day
+                    )
+                    image_index.add(job.day, image_hash)
+            job.timings["image"] = round(step.seconds, 3)
+            return job
+
+        def optimize_stage(job: BackfillJob) -> BackfillJob:
+            with span("image.optimize", bytes=len(job.image_bytes)):
+                processed = post_processor.submit(job.image_bytes).result()
+            logger.info("%s: %s", job.day, processed.summary())
+            job.image_bytes, job.derivatives = processed.png, processed.derivatives
+            job.timings["post_process"] = round(processed.seconds, 3)
+            return job
+
+        def save_stage(job: BackfillJob) -> None:
+            self.generator.save_outputs(
+                job.day,
+                job.prompt,
+                job.image_bytes,
+                update_current=False,
+                derivatives=job.derivatives,
+                variants=job.variants,
+                timings=job.timings,
+                source_headline=job.source_headline,
+            )
+
+        image_index = self.generator.image_index
+        stages = [
+            Stage("prompt", prompt_stage, workers=self.prompt_workers),
+            Stage("image", image_stage, workers=self.max_workers),
+        ]
+        post_processor = self.generator.post_processor
+        if post_processor is not None:
+            stages.append(Stage("optimize", optimize_stage, workers=post_processor.max_workers))
+        stages.append(Stage("save", save_stage))
+        with self.rate_limits():
+            result = Pipeline(stages).run(pending)
+        if image_index is not None:
+            image_index.save()
+
+        report.generated = sorted(result.outputs)
+        report.failed = {day: str(error) for day, (_, error) in result.errors.items()}
+        report.metrics = result.metrics
+        for metrics in result.metrics.values():
+            logger.info("  %s", metrics.summary())
+        logger.info(
+            "Backfill finished in %.1fs: %d generated, %d failed.",
+            result.wall_seconds,
+            len(report.generated),
+            len(report.failed),
+        )
+        return report
@@ -0,0 +1,278 @@
+"""
+PandaDaemon - Long-running scheduler that publishes the daily panda from a warm process.
+
+A scheduled run pays for a cold start every day: imports, settings, new API
+clients and TLS handshakes, and the feed downloads, all before the image call.
+The daemon does that work once, or ahead of time:
+
+    publish - prefetch_lead   fetch and rank the headlines for the publish date
+    publish - warmup_lead     open the API connection so the pool holds it
+    publish                   generate and save the panda from the prefetched headlines
+
+Its state is written to a JSON status file after every step and at least every
+HEARTBEAT_SECONDS while it waits, so a supervisor can tell a healthy daemon
+from a stuck one. Time is read through injectable now/sleep callables, so the
+whole schedule can be driven by a fake clock in tests.
+"""
+
+import datetime
+import json
+import logging
+import os
+import threading
+from collections.abc import Callable
+from pathlib import Path
+
+from daily_panda_image.generators.image_generator import PandaImageGenerator
+from daily_panda_image.utils.feed_cache import FeedCache
+from daily_panda_image.utils.file_manager import FileManager
+from daily_panda_image.utils.headline_index import HeadlineIndex
+from daily_panda_image.utils.headline_ranker import HeadlineRanker
+from daily_panda_image.utils.news_scraper import NewsScraper
+from daily_panda_image.utils.schedule import CronSchedule
+from daily_panda_image.utils.telemetry import span
+
+logger = logging.getLogger(__name__)
+
+# Publish time of the scheduled workflow (.github/workflows/image_publisher.yml), in UTC
+DEFAULT_SCHEDULE = "0 4 * * *"
+
+# How long before publishing the headlines are fetched and ranked
+PREFETCH_LEAD = datetime.timedelta(minutes=10)
+
+# How long before publishing the API connection is opened; well inside POOL_KEEPALIVE_EXPIRY
+WARMUP_LEAD = datetime.timedelta(seconds=30)
+
+# Longest uninterrupted sleep, so the status heartbeat stays fresh
+HEARTBEAT_SECONDS = 60.0
+
+# A status file whose heartbeat is older than this means the daemon is gone or stuck
+STALE_AFTER = datetime.timedelta(seconds=3 * HEARTBEAT_SECONDS)
+
+# Publish attempts per date, and the pause between them
+PUBLISH_ATTEMPTS = 3
+RETRY_DELAY = datetime.timedelta(minutes=5)
+
+# Status file under the project root
+STATUS_FILE = os.path.join("cache", "daemon_status.json")
+
+
+def utc_now() -> datetime.datetime:
+    """Current time as an aware UTC datetime."""
+    return datetime.datetime.now(datetime.UTC)
+
+
+def status_path() -> Path:
+    """Location of the daemon's status file."""
+    return FileManager.get_project_root() / STATUS_FILE
+
+
+def read_status(path: Path | None = None, now: datetime.datetime | None = None) -> dict:
+    """
+    Read the daemon's status file and judge whether the daemon is healthy.
+
+    Args:
+        path: Status file (defaults to cache/daemon_status.json)
+        now: Current time (defaults to the system clock)
+
+    Returns:
+        The recorded status plus a "healthy" flag; {"healthy": False} if there is none
+    """
+    try:
+        status = json.loads((path or status_path()).read_text())
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {"healthy": False}
+    age = (now or utc_now()) - datetime.datetime.fromisoformat(status["heartbeat"])
+    status["healthy"] = status["state"] != "stopped" and age <= STALE_AFTER
+    return status
+
+
+def prefetch_headlines(current_date: datetime.date) -> list[dict]:
+    """
+    Fetch and rank the headlines for a date, as get_text_prompt would.
+
+    Args:
+        current_date: Publish date
+
+    Returns:
+        Ranked headlines, ready to pass to generate_daily_panda
+    """
+    history = HeadlineIndex.load(before=current_date)
+    headlines = NewsScraper.fetch_headlines(current_date, cache=FeedCache.load(), history=history)
+    ranked, report = HeadlineRanker.rank(headlines, history, current_date)
+    logger.info(report.summary())
+    return ranked
+
+
+class PandaDaemon:
+    """Publishes one panda per scheduled time, keeping clients and prefetched headlines warm."""
+
+    def __init__(
+        self,
+        generator: PandaImageGenerator,
+        schedule: CronSchedule | None = None,
+        prefetch_lead: datetime.timedelta = PREFETCH_LEAD,
+        warmup_lead: datetime.timedelta = WARMUP_LEAD,
+        status_file: Path | None = None,
+        now: Callable[[], datetime.datetime] = utc_now,
+        sleep: Callable[[float], None] | None = None,
+        prefetch: Callable[[datetime.date], list[dict]] = prefetch_headlines,
+    ):
+        """
+        Initialize the daemon.
+
+        Args:
+            generator: Generator whose API clients stay open between publishes
+            schedule: When to publish (defaults to DEFAULT_SCHEDULE)
+            prefetch_lead: How long before publishing the headlines are fetched
+            warmup_lead: How long before publishing the API connection is opened
+            status_file: Status file path (defaults to cache/daemon_status.json)
+            now: Aware UTC time source
+            sleep: Function used to wait (defaults to waiting on the stop event)
+            prefetch: Fetches and ranks the headlines for a date
+        """
+        self.generator = generator
+        self.schedule = schedule or CronSchedule(DEFAULT_SCHEDULE)
+        self.prefetch_lead = prefetch_lead
+        self.warmup_lead = warmup_lead
+        self.status_file = status_file or status_path()
+        self.now = now
+        self._stop = threading.Event()
+        self.sleep = sleep or self._stop.wait
+        self.prefetch = prefetch
+        self.status = {
+            "pid": os.getpid(),
+            "started_at": now().isoformat(),
+            "schedule": self.schedule.expression,
+            "publishes": 0,
+            "failures": 0,
+        }
+
+    def stop(self) -> None:
+        """Ask the daemon to exit at its next wake-up; safe to call from a signal handler."""
+        self._stop.set()
+
+    @property
+    def stopping(self) -> bool:
+        """Whether stop has been requested."""
+        return self._stop.is_set()
+
+    def _write_status(self, state: str, **fields) -> None:
+        self.status.update(fields, state=state, heartbeat=self.now().isoformat())
+        try:
+            self.status_file.parent.mkdir(parents=True, exist_ok=True)
+            FileManager.atomic_write(self.status_file, json.dumps(self.status, indent=2) + "\n")
+        except OSError as e:
+            logger.warning("Could not write daemon status: %s", e)
+
+    def _sleep_until(self, moment: datetime.datetime, state: str) -> bool:
+        """Wait for a moment, refreshing the heartbeat; returns False if stopped first."""
+        while not self.stopping:
+            remaining = (moment - self.now()).total_seconds()
+            if remaining <= 0:
+                return True
+            self._write_status(state)
+            self.sleep(min(remaining, HEARTBEAT_SECONDS))
+        return False
+
+    def _prefetch(self, current_date: datetime.date) -> list[dict] | None:
+        self._write_status("prefetching", next_date=str(current_date))
+        try:
+            with span("daemon.prefetch", date=str(current_date)) as step:
+                headlines = self.prefetch(current_date)
+                step.set(entries=len(headlines))
+        except Exception as e:
+            # The publish step fetches the headlines itself if the prefetch failed
+            logger.warning("Headline prefetch for %s failed: %s", current_date, e)
+            return None
+        logger.info("Prefetched %d headlines for %s.", len(headlines), current_date)
+        self.status["prefetched_headlines"] = len(headlines)
+        return headlines
+
+    def _warm_up(self) -> None:
+        self._write_status("warming")
+        try:
+            with span("daemon.warmup"):
+                self.generator.client.models.list()
+        except Exception as e:
+            logger.warning("Connection warm-up failed: %s", e)
+
+    def publish(self, current_date: datetime.date, headlines: list[dict] | None) -> bool:
+        """
+        Generate and save the panda for a date, retrying on failure.
+
+        Args:
+            current_date: Date to publish
+            headlines: Prefetched headlines (None fetches them now)
+
+        Returns:
+            True if the panda was published
+        """
+        for attempt in range(1, PUBLISH_ATTEMPTS + 1):
+            self._write_status("publishing", next_date=str(current_date), attempt=attempt)
+            started = self.now()
+            try:
+                self.generator.generate_daily_panda(current_date, headlines)
+            except Exception as e:
+                logger.error("Publish attempt %d for %s failed: %s", attempt, current_date, e)
+                self.status["failures"] += 1
+                self.status["last_error"] = str(e)
+                if attempt < PUBLISH_ATTEMPTS and not self._sleep_until(
+                    self.now() + RETRY_DELAY, "retrying"
+                ):
+                    return False
+                continue
+            seconds = (self.now() - started).total_seconds()
+            self.status["publishes"] += 1
+            self.status["last_publish"] = {
+                "date": str(current_date),
+                "finished_at": self.now().isoformat(),
+                "seconds": round(seconds, 3),
+            }
+            logger.info("Published the panda for %s in %.1fs.", current_date, seconds)
+            return True
+        return False
+
+    def run_once(self) -> bool:
+        """
+        Wait for the next scheduled time and publish for it.
+
+        Returns:
+            False if the daemon was stopped before publishing
+        """
+        publish_at = self.schedule.next_after(self.now())
+        current_date = publish_at.date()
+        self.status["next_publish"] = publish_at.isoformat()
+        if FileManager.has_output(current_date):
+            logger.info("Panda for %s already exists; waiting for the next slot.", current_date)
+            return self._sleep_until(publish_at, "waiting")
+
+        logger.info("Next publish at %s.", publish_at.isoformat())
+        if not self._sleep_until(publish_at - self.prefetch_lead, "waiting"):
+            return False
+        headlines = self._prefetch(current_date)
+        if not self._sleep_until(publish_at - self.warmup_lead, "prefetched"):
+            return False
+        self._warm_up()
+        if not self._sleep_until(publish_at, "ready"):
+            return False
+        self.publish(current_date, headlines)
+        return True
+
+    def run(self, max_runs: int | None = None) -> None:
+        """
+        Publish at every scheduled time until stopped.
+
+        Args:
+            max_runs: Stop after this many scheduled times (None runs until stop)
+        """
+        logger.info("Daemon started with schedule %r.", self.schedule.expression)
+        runs = 0
+        try:
+            while not self.stopping and (max_runs is None or runs < max_runs):
+                if not self.run_once():
+                    break
+                runs += 1
+        finally:
+            self._write_status("stopped")
+            logger.info("Daemon stopped.")
@@ -0,0 +1,190 @@
+"""
+ChannelFanout - Runs several channels from one headline fetch and one connection pool.
+
+Running channels as separate processes fetches and parses the same feeds once
+per channel. The fan-out downloads the union of every channel's feeds once,
+then gives each channel the merged headlines of its own feeds, deduplicated
+against its own history. The channels then generate concurrently on a shared
+AsyncOpenAI client and Resilience layer, each writing below its own output
+root through FileManager.
+"""
+
+import asyncio
+import datetime
+import logging
+
+from openai import AsyncOpenAI, OpenAI
+
+from daily_panda_image.channels import Channel
+from daily_panda_image.generators.image_generator import PandaImageGenerator
+from daily_panda_image.generators.openai_clients import create_async_client, create_client
+from daily_panda_image.generators.resilience import Resilience
+from daily_panda_image.utils.feed_cache import FeedCache
+from daily_panda_image.utils.file_manager import FileManager
+from daily_panda_image.utils.headline_index import HeadlineIndex
+from daily_panda_image.utils.headline_ranker import HeadlineRanker
+from daily_panda_image.utils.image_post_processor import ImagePostProcessor
+from daily_panda_image.utils.news_scraper import NEWS_FEEDS, NewsScraper
+from daily_panda_image.utils.response_cache import ResponseCache
+from daily_panda_image.utils.telemetry import span
+
+logger = logging.getLogger(__name__)
+
+# Channels generating at once; each holds one chat and then one image request open
+FANOUT_CONCURRENCY = 4
+
+
+def channel_feeds(channel: Channel) -> list[tuple[str, str]]:
+    """(source name, URL) pairs a channel reads, in priority order."""
+    return list(NEWS_FEEDS if channel.feeds is None else channel.feeds)
+
+
+class ChannelFanout:
+    """Generates every channel's panda for a date from one shared fetch and client pool."""
+
+    def __init__(
+        self,
+        channels: list[Channel],
+        openai_client: OpenAI | None = None,
+        async_client: AsyncOpenAI | None = None,
+        response_cache: ResponseCache | None = None,
+        post_processor: ImagePostProcessor | None = None,
+        max_concurrency: int = FANOUT_CONCURRENCY,
+        **generator_options,
+    ):
+        """
+        Initialize the fan-out with one generator per channel.
+
+        Args:
+            channels: Channels to run; their names and output roots must be unique
+            openai_client: Optional pre-configured OpenAI client shared by every channel
+            async_client: Optional pre-configured AsyncOpenAI client shared by every channel
+            response_cache: Cache of prompts and images shared by every channel
+            post_processor: Post-processor shared by every channel
+            max_concurrency: Channels generating at once
+            **generator_options: Further PandaImageGenerator options, e.g. variants
+
+        Raises:
+            ValueError: If two channels share a name or an output root
+        """
+        names = [channel.name for channel in channels]
+        roots = [channel.output_root for channel in channels]
+        if len(set(names)) != len(names) or len(set(roots)) != len(roots):
+            raise ValueError("Channels need unique names and output roots")
+        if openai_client is None and async_client is None:
+            async_client = create_async_client()
+        self.client = openai_client or create_client()
+        self.async_client = async_client
+        self.resilience = Resilience()
+        self.channels = channels
+        self.max_concurrency = max_concurrency
+        self.generators = {
+            channel.name: PandaImageGenerator(
+                self.client,
+                self.async_client,
+                response_cache=response_cache,
+                post_processor=post_processor,
+                resilience=self.resilience,
+                channel=channel,
+                **generator_options,
+            )
+            for channel in channels
+        }
+
+    def fetch_headlines(self, current_date: datetime.date) -> dict[str, list[dict]]:
+        """
+        Fetch the union of every channel's feeds once, then merge and rank them per channel.
+
+        Each channel's headlines are deduplicated against the history index under
+        its own output root, so channels do not suppress each other's stories.
+
+        Args:
+            current_date: Date to fetch headlines for
+
+        Returns:
+            Headlines of each channel, keyed by channel name
+        """
+        # A feed read by several channels is downloaded once, under its first name
+        union: dict[str, tuple[str, str]] = {}
+        for channel in self.channels:
+            for name, url in channel_feeds(channel):
+                union.setdefault(url, (name, url))
+        feeds = list(union.values())
+        cache = FeedCache.load()
+        with span("headlines.fetch", feeds=len(feeds)) as fetch:
+            entries = dict(
+                zip(
+                    (url for _, url in feeds),
+                    NewsScraper.fetch_feeds(feeds, cache=cache),
+                    strict=True,
+                )
+            )
+            fetch.set(entries=sum(len(feed_entries) for feed_entries in entries.values()))
+        try:
+            cache.save()
+        except OSError as e:
+            logger.warning("Could not save feed cache: %s", e)
+
+        headlines = {}
+        for channel in self.channels:
+            with FileManager.output_root(channel.output_root):
+                history = HeadlineIndex.load(before=current_date)
+            merged = NewsScraper.merge_entries(
+                [entries[url] for _, url in channel_feeds(channel)], history, current_date
+            )
+            headlines[channel.name], report = HeadlineRanker.rank(merged, history, current_date)
+            logger.info("%s: %s", channel.name, report.summary())
+        logger.info("Fetched %d feeds once for %d channels.", len(feeds), len(self.channels))
+        return headlines
+
+    async def agenerate(
+        self, current_date: datetime.date | None = None
+    ) -> dict[str, Exception | None]:
+        """
+        Generate every channel's panda for a date concurrently.
+
+        Args:
+            current_date: Date to generate (defaults to today)
+
+        Returns:
+            Mapping of each channel name to None on success or the exception it raised
+        """
+        current_date = current_date or datetime.date.today()
+        headlines = await asyncio.to_thread(self.fetch_headlines, current_date)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def generate(name: str) -> Exception | None:
+            async with semaphore:
+                with span("channel", channel=name):
+                    try:
+                        await self.generators[name].agenerate_daily_panda(
+                            current_date, headlines[name]
+                        )
+                    except Exception as e:
+                        logger.error("Channel %s failed: %s", name, e)
+                        return e
+            return None
+
+        names = list(self.generators)
+        outcomes = await asyncio.gather(*(generate(name) for name in names))
+        return dict(zip(names, outcomes, strict=True))
+
+    def run(self, current_date: datetime.date | None = None) -> dict[str, Exception | None]:
+        """
+        Sync entry point: generate every channel, then close the shared connection pool.
+
+        Args:
+            current_date: Date to generate (defaults to today)
+
+        Returns:
+            Mapping of each channel name to None on success or the exception it raised
+        """
+
+        async def run_and_close():
+            try:
+                return await self.agenerate(current_date)
+            finally:
+                if self.async_client is not None:
+                    await self.async_client.close()
+
+        return asyncio.run(run_and_close())
@@ -5,34 +5,263 @@ This module provides functionality to generate creative prompts based on current
 events and create corresponding images using OpenAI's GPT-4.1 Nano and DALL-E-3 models.
 """
 
+import asyncio
 import base64
 import datetime
+import logging
+from dataclasses import dataclass
+from pathlib import Path
 
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 
-from daily_panda_image.config import get_settings
+from daily_panda_image.channels import Channel
+from daily_panda_image.generators.openai_clients import create_async_client, create_client
 from daily_panda_image.generators.prompt_generator import PromptGenerator
+from daily_panda_image.generators.resilience import Resilience
+from daily_panda_image.generators.sync_bridge import offload, run_blocking
 from daily_panda_image.utils.file_manager import FileManager
+from daily_panda_image.utils.image_hash import ImageHash, ImageHashIndex, hash_image
+from daily_panda_image.utils.image_post_processor import ImagePostProcessor
+from daily_panda_image.utils.image_scorer import pick_best
+from daily_panda_image.utils.image_sink import (
+    TeeWriter,
+    Writable,
+    as_writer,
+    copy_into,
+    decode_into,
+)
+from daily_panda_image.utils.response_cache import ResponseCache, cache_key
+from daily_panda_image.utils.telemetry import span
+
+logger = logging.getLogger(__name__)
+
+# Image model and output size, unless a channel overrides them
+IMAGE_MODEL = "gpt-image-1-mini"
+IMAGE_SIZE = "1024x1024"
+
+
+@dataclass
+class ImagePayload:
+    """A generated image not yet decoded: base64 text from the API or a cached file."""
+
+    b64_json: str | None = None
+    cached_path: Path | None = None
+    cache: ResponseCache | None = None
+    cache_key: str | None = None
+
+    def write_to(self, sink: Writable | memoryview | bytearray) -> int:
+        """
+        Decode the image chunk by chunk into a sink, caching it on the way.
+
+        Args:
+            sink: Open binary file, mmap, BytesIO or writable buffer
+
+        Returns:
+            Number of image bytes written
+
+        Raises:
+            ValueError: If the data is not a valid PNG or does not fit the sink
+        """
+        with span("image.decode", streamed=True) as decoded:
+            if self.cached_path is not None:
+                with open(self.cached_path, "rb") as source:
+                    written = copy_into(source, sink)
+            elif self.cache is None or self.cache_key is None:
+                written = decode_into(self.b64_json, sink)
+            else:
+                with self.cache.writer(self.cache_key) as cached:
+                    written = decode_into(self.b64_json, TeeWriter(as_writer(sink), cached))
+            decoded.set(bytes=written)
+        return written
 
 
 class ImageGenerator:
     """Handles image generation using DALL-E-3."""
 
-    def __init__(self, client: OpenAI):
+    def __init__(
+        self,
+        client: OpenAI,
+        async_client: AsyncOpenAI | None = None,
+        cache: ResponseCache | None = None,
+        resilience: Resilience | None = None,
+        channel: Channel | None = None,
+    ):
         """
         Initialize the image generator.
 
         Args:
             client: Configured OpenAI client instance
+            async_client: Configured AsyncOpenAI client for the async path
+            cache: Response cache consulted before calling the API
+            resilience: Retry, rate-limit and circuit-breaker layer calls go through
+                (calls go straight to the client without one)
+            channel: Channel whose image model and size are used
         """
         self.client = client
+        self.async_client = async_client
+        self.cache = cache
+        self.resilience = resilience
+        self.channel = channel
 
-    def generate_image(self, prompt: str) -> bytes:
+    @staticmethod
+    def request_key(request: dict) -> str:
+        """
+        Content address of an image request: final prompt, model and size.
+
+        Args:
+            request: Image generation arguments from build_request
+
+        Returns:
+            Cache key for the generated image
+        """
+        return cache_key("image", request["prompt"], request["model"], request["size"])
+
+    def _cached_image(self, request: dict) -> bytes | None:
+        if self.cache is None:
+            return None
+        image_bytes = self.cache.get(self.request_key(request))
+        if image_bytes is not None:
+            logger.info("Using cached image for unchanged prompt.")
+        return image_bytes
+
+    def _store_image(self, request: dict, image_bytes: bytes, degraded: bool = False) -> bytes:
+        # Fallback results are not cached, so the next run tries the full quality again
+        if self.cache is not None and not degraded:
+            self.cache.put(self.request_key(request), image_bytes)
+        return image_bytes
+
+    def _require_async_client(self) -> None:
+        if self.async_client is None:
+            raise ValueError("ImageGenerator has no async client configured.")
+
+    async def _send(self, request: dict, blocking: bool):
+        """Generate images; returns the response and whether a fallback served it."""
+        client = self.client if blocking else self.async_client
+        with span("image.generate", **self._span_attributes(request)) as call:
+            if self.resilience is None:
+                response = client.images.generate(**request)
+                sent = request
+                if not blocking:
+                    response = await response
+            elif blocking:
+                response, sent = self.resilience.call("image", client.images.generate, request)
+            else:
+                response, sent = await self.resilience.acall(
+                    "image", client.images.generate, request
+                )
+            call.set(**self._span_attributes(sent))
+            call.record_usage(response)
+        return response, sent is not request
+
+    @staticmethod
+    def _span_attributes(request: dict) -> dict:
+        attributes = {"model": request["model"], "size": request["size"], "n": request.get("n", 1)}
+        if "quality" in request:
+            attributes["quality"] = request["quality"]
+        return attributes
+
+    @staticmethod
+    def build_request(prompt: str, n: int = 1, channel: Channel | None = None) -> dict:
+        """
+        Build the image generation arguments for a prompt.
+
+        Args:
+            prompt: Text prompt for image generation
+            n: Number of images to generate in the one request
+            channel: Channel overriding the model and size
+
+        Returns:
+            Keyword arguments for images.generate
+        """
+        request = {
+            "model": (channel and channel.image_model) or IMAGE_MODEL,
+            "prompt": prompt,
+            "size": (channel and channel.image_size) or IMAGE_SIZE,
+        }
+        if n > 1:
+            request["n"] = n
+        return request
+
+    @staticmethod
+    def decode_image(response) -> bytes:
+        """
+        Extract the image bytes from an image generation response.
+
+        Args:
+            response: Images API response
+
+        Returns:
+            Image data as bytes
+
+        Raises:
+            ValueError: If no image data is returned from the API
+        """
+        if not response.data or not response.data[0].b64_json:
+            raise ValueError("No image data returned from the API")
+
+        with span("image.decode") as decoded:
+            image_bytes = base64.b64decode(response.data[0].b64_json)
+            decoded.set(bytes=len(image_bytes))
+        return image_bytes
+
+    @staticmethod
+    def decode_images(response) -> list[bytes]:
+        """
+        Extract every image from an image generation response.
+
+        Args:
+            response: Images API response
+
+        Returns:
+            Image data of each returned image with data
+
+        Raises:
+            ValueError: If no image data is returned from the API
+        """
+        with span("image.decode") as decoded:
+            images = [
+                base64.b64decode(item.b64_json) for item in response.data or [] if item.b64_json
+            ]
+            decoded.set(bytes=sum(len(image) for image in images))
+        if not images:
+            raise ValueError("No image data returned from the API")
+        return images
+
+    @staticmethod
+    def select_variant(images: list[bytes]) -> tuple[bytes, list[bytes]]:
+        """
+        Pick the best of several variants with the local scorer.
+
+        Args:
+            images: Variants of the same prompt
+
+        Returns:
+            The winning image and the remaining variants
+        """
+        best, scores = pick_best(images)
+        for index, score in enumerate(scores):
+            marker = "*" if index == best else " "
+            logger.info(" %s variant %d: %s", marker, index + 1, score.summary())
+        logger.info("Selected variant %d of %d.", best + 1, len(images))
+        return images[best], images[:best] + images[best + 1 :]
+
+    async def _generate_image(self, prompt: str, refresh: bool, blocking: bool) -> bytes:
+        request = self.build_request(prompt, channel=self.channel)
+        cached = None if refresh else await offload(blocking, self._cached_image, request)
+        if cached is not None:
+            return cached
+        response, degraded = await self._send(request, blocking)
+        image_bytes = self.decode_image(response)
+        return await offload(blocking, self._store_image, request, image_bytes, degraded)
+
+    def generate_image(self, prompt: str, refresh: bool = False) -> bytes:
         """
         Generate an image based on the provided prompt.
 
         Args:
             prompt: Text prompt for image generation
+            refresh: Skip the cache lookup and replace the cached image, e.g. to
+                get a different image for the same prompt
 
         Returns:
             Image data as bytes
@@ -40,60 +269,537 @@ class ImageGenerator:
         Raises:
             ValueError: If no image data is returned from the API
         """
-        response = self.client.images.generate(
-            model="gpt-image-1-mini", prompt=prompt, size="1024x1024"
-        )
+        return run_blocking(self._generate_image(prompt, refresh, blocking=True))
 
+    def _payload(self, request: dict, response, degraded: bool) -> ImagePayload:
         if not response.data or not response.data[0].b64_json:
             raise ValueError("No image data returned from the API")
+        # Fallback results are not cached, so the next run tries the full quality again
+        return ImagePayload(
+            b64_json=response.data[0].b64_json,
+            cache=None if degraded else self.cache,
+            cache_key=self.request_key(request),
+        )
 
-        image_bytes = base64.b64decode(response.data[0].b64_json)
-        return image_bytes
+    def _cached_payload(self, request: dict) -> ImagePayload | None:
+        if self.cache is None:
+            return None
+        path = self.cache.path_for(self.request_key(request))
+        if path is None:
+            return None
+        logger.info("Using cached image for unchanged prompt.")
+        return ImagePayload(cached_path=path)
+
+    async def _fetch_image(self, prompt: str, blocking: bool) -> ImagePayload:
+        request = self.build_request(prompt, channel=self.channel)
+        cached = await offload(blocking, self._cached_payload, request)
+        if cached is not None:
+            return cached
+        response, degraded = await self._send(request, blocking)
+        return self._payload(request, response, degraded)
+
+    def fetch_image(self, prompt: str) -> ImagePayload:
+        """
+        Generate an image without decoding it, for streaming to a sink.
+
+        Args:
+            prompt: Text prompt for image generation
+
+        Returns:
+            Payload whose write_to decodes the image into a file or buffer
+
+        Raises:
+            ValueError: If no image data is returned from the API
+        """
+        return run_blocking(self._fetch_image(prompt, blocking=True))
+
+    def generate_image_into(self, prompt: str, sink: Writable | memoryview | bytearray) -> int:
+        """
+        Generate an image and decode it straight into a sink.
+
+        Unlike generate_image, no decoded copy of the image is held in memory.
+
+        Args:
+            prompt: Text prompt for image generation
+            sink: Open binary file, mmap, BytesIO or writable buffer
+
+        Returns:
+            Number of image bytes written
+
+        Raises:
+            ValueError: If the API returns no PNG or it does not fit the sink
+        """
+        return self.fetch_image(prompt).write_to(sink)
+
+    async def _generate_best(
+        self, prompt: str, variants: int, blocking: bool
+    ) -> tuple[bytes, list[bytes]]:
+        request = self.build_request(prompt, channel=self.channel)
+        cached = await offload(blocking, self._cached_image, request)
+        if cached is not None:
+            return cached, []
+        response, degraded = await self._send(
+            self.build_request(prompt, variants, self.channel), blocking
+        )
+        image_bytes, losers = await offload(
+            blocking, self.select_variant, self.decode_images(response)
+        )
+        stored = await offload(blocking, self._store_image, request, image_bytes, degraded)
+        return stored, losers
+
+    def generate_best(self, prompt: str, variants: int) -> tuple[bytes, list[bytes]]:
+        """
+        Generate several variants in one request and keep the best-scoring one.
+
+        The variants come from a single call with the API's n parameter, so the
+        wall-clock time stays close to that of one image. The winner is cached
+        like a single image, so a rerun with the same prompt reuses it.
+
+        Args:
+            prompt: Text prompt for image generation
+            variants: Number of images to generate
+
+        Returns:
+            The winning image and the losing variants (none on a cache hit)
+
+        Raises:
+            ValueError: If no image data is returned from the API
+        """
+        return run_blocking(self._generate_best(prompt, variants, blocking=True))
+
+    async def agenerate_image(self, prompt: str, refresh: bool = False) -> bytes:
+        """
+        Async variant of generate_image using the AsyncOpenAI client.
+
+        Args:
+            prompt: Text prompt for image generation
+            refresh: Skip the cache lookup and replace the cached image
+
+        Returns:
+            Image data as bytes
+
+        Raises:
+            ValueError: If no image data is returned or no async client is configured
+        """
+        self._require_async_client()
+        return await self._generate_image(prompt, refresh, blocking=False)
+
+    async def afetch_image(self, prompt: str) -> ImagePayload:
+        """
+        Async variant of fetch_image using the AsyncOpenAI client.
+
+        Args:
+            prompt: Text prompt for image generation
+
+        Returns:
+            Payload whose write_to decodes the image into a file or buffer
+
+        Raises:
+            ValueError: If no image data is returned or no async client is configured
+        """
+        self._require_async_client()
+        return await self._fetch_image(prompt, blocking=False)
+
+    async def agenerate_image_into(
+        self, prompt: str, sink: Writable | memoryview | bytearray
+    ) -> int:
+        """
+        Async variant of generate_image_into; decoding runs in a worker thread.
+
+        Args:
+            prompt: Text prompt for image generation
+            sink: Open binary file, mmap, BytesIO or writable buffer
+
+        Returns:
+            Number of image bytes written
+
+        Raises:
+            ValueError: If the API returns no PNG, it does not fit the sink or no async
+                client is configured
+        """
+        payload = await self.afetch_image(prompt)
+        return await asyncio.to_thread(payload.write_to, sink)
+
+    async def agenerate_best(self, prompt: str, variants: int) -> tuple[bytes, list[bytes]]:
+        """
+        Async variant of generate_best; scoring runs in a worker thread.
+
+        Args:
+            prompt: Text prompt for image generation
+            variants: Number of images to generate
+
+        Returns:
+            The winning image and the losing variants (none on a cache hit)
+
+        Raises:
+            ValueError: If no image data is returned or no async client is configured
+        """
+        self._require_async_client()
+        return await self._generate_best(prompt, variants, blocking=False)
 
 
 class PandaImageGenerator:
     """Main orchestrator for the panda image generation process."""
 
-    def __init__(self, openai_client: OpenAI | None = None):
+    def __init__(
+        self,
+        openai_client: OpenAI | None = None,
+        async_client: AsyncOpenAI | None = None,
+        stream_prompts: bool = False,
+        response_cache: ResponseCache | None = None,
+        post_processor: ImagePostProcessor | None = None,
+        variants: int = 1,
+        resilience: Resilience | None = None,
+        image_index: ImageHashIndex | None = None,
+        duplicate_retries: int = 0,
+        channel: Channel | None = None,
+    ):
         """
         Initialize the panda image generator.
 
+        Without an openai_client, a sync client is built from the configured API
+        key. The async client is only built when an async method first needs it,
+        so sync-only runs never open a second connection pool.
+
         Args:
             openai_client: Optional pre-configured OpenAI client
+            async_client: Optional pre-configured AsyncOpenAI client for the async path
+            stream_prompts: Stream chat completions and cut off at the last full sentence
+            response_cache: Cache of prompts and images checked before calling the API, so
+                reruns with unchanged headlines reuse the earlier results
+            post_processor: Recompresses the PNG and renders WebP/AVIF/thumbnail derivatives
+            variants: Images requested per prompt; above 1 the best-scoring one is kept
+            resilience: Retry, rate-limit and circuit-breaker state shared by the prompt
+                and image calls (a default Resilience is built if omitted)
+            image_index: Perceptual hashes of the archive; each new image is checked
+                against it before saving and then added to it
+            duplicate_retries: Images regenerated when the new one is a near duplicate
+                of an archived one (0 only logs a warning)
+            channel: Channel whose subject, models, feeds and output root are used
+                (the single panda bot if omitted)
         """
-        self.client = openai_client or OpenAI(
-            api_key=get_settings().openai_api_key.get_secret_value()
+        self.client = openai_client or create_client()
+        self._async_client = async_client
+        self.resilience = resilience or Resilience()
+        self.prompt_generator = PromptGenerator(
+            self.client, async_client, stream_prompts, response_cache, self.resilience, channel
+        )
+        self.image_generator = ImageGenerator(
+            self.client, async_client, response_cache, self.resilience, channel
+        )
+        self.channel = channel
+        self.output_root = channel.output_root if channel else None
+        self.post_processor = post_processor
+        self.variants = variants
+        self.image_index = image_index
+        self.duplicate_retries = duplicate_retries
+
+    def open_async_client(self) -> AsyncOpenAI:
+        """AsyncOpenAI client shared by the prompt and image generators, built on first use."""
+        if self._async_client is None:
+            self._async_client = create_async_client()
+            self.prompt_generator.async_client = self._async_client
+            self.image_generator.async_client = self._async_client
+        return self._async_client
+
+    @property
+    def streams_images(self) -> bool:
+        """Whether images go straight from the API response to disk without a bytes copy."""
+        return self.post_processor is None and self.variants <= 1 and self.image_index is None
+
+    def _near_duplicate(
+        self, image_bytes: bytes, current_date: datetime.date, attempt: int
+    ) -> tuple[ImageHash, bool]:
+        """Hash an image and log whether it nearly matches an archived one."""
+        with span("image.dedupe", attempt=attempt) as check:
+            image_hash = hash_image(image_bytes)
+            matches = self.image_index.near_duplicates(image_hash, exclude=current_date)
+            check.set(matches=len(matches))
+        if not matches:
+            return image_hash, False
+        match_date, distance = matches[0]
+        retry = attempt < self.duplicate_retries
+        logger.warning(
+            "Image for %s is a near duplicate of %s (%d bits differ); %s.",
+            current_date,
+            match_date,
+            distance,
+            "regenerating" if retry else "keeping it",
         )
-        self.prompt_generator = PromptGenerator(self.client)
-        self.image_generator = ImageGenerator(self.client)
+        return image_hash, retry
 
-    def generate_daily_panda(self) -> None:
+    async def _screen_duplicates(
+        self, prompt: str, image_bytes: bytes, current_date: datetime.date, blocking: bool
+    ) -> tuple[bytes, ImageHash]:
+        for attempt in range(self.duplicate_retries + 1):
+            image_hash, retry = await offload(
+                blocking, self._near_duplicate, image_bytes, current_date, attempt
+            )
+            if not retry:
+                break
+            if blocking:
+                image_bytes = self.image_generator.generate_image(prompt, refresh=True)
+            else:
+                image_bytes = await self.image_generator.agenerate_image(prompt, refresh=True)
+        return image_bytes, image_hash
+
+    def screen_duplicates(
+        self, prompt: str, image_bytes: bytes, current_date: datetime.date
+    ) -> tuple[bytes, ImageHash]:
+        """
+        Regenerate an image while it nearly matches an archived one.
+
+        The prompt stays the same; the cache is bypassed, so each retry is a
+        fresh image that also replaces the cached duplicate.
+
+        Args:
+            prompt: Prompt the image was generated from
+            image_bytes: Generated image
+            current_date: Date being generated, left out of the comparison
+
+        Returns:
+            The image to keep and its hashes
+        """
+        return run_blocking(
+            self._screen_duplicates(prompt, image_bytes, current_date, blocking=True)
+        )
+
+    async def ascreen_duplicates(
+        self, prompt: str, image_bytes: bytes, current_date: datetime.date
+    ) -> tuple[bytes, ImageHash]:
+        """Async variant of screen_duplicates; hashing runs in a worker thread."""
+        self.open_async_client()
+        return await self._screen_duplicates(prompt, image_bytes, current_date, blocking=False)
+
+    def _index_image(self, current_date: datetime.date, image_hash: ImageHash | None) -> None:
+        if self.image_index is not None and image_hash is not None:
+            self.image_index.add(current_date, image_hash)
+            self.image_index.save()
+
+    @staticmethod
+    def save_payload(
+        payload: ImagePayload, current_date: datetime.date, update_current: bool = True
+    ) -> int:
+        """
+        Decode a fetched image straight into images/panda_{date}.png.
+
+        Args:
+            payload: Image from fetch_image or afetch_image
+            current_date: Date the panda was generated for
+            update_current: Also repoint panda_current.png
+
+        Returns:
+            Number of image bytes written
+        """
+        with FileManager.image_writer(current_date, update_current) as sink:
+            return payload.write_to(sink)
+
+    async def _image_step(self, prompt: str, blocking: bool) -> tuple:
+        """Generate the image the configured way; returns (bytes, payload, losing variants)."""
+        image = self.image_generator
+        if self.variants > 1:
+            if blocking:
+                image_bytes, losers = image.generate_best(prompt, self.variants)
+            else:
+                image_bytes, losers = await image.agenerate_best(prompt, self.variants)
+            return image_bytes, None, losers
+        if self.streams_images:
+            payload = image.fetch_image(prompt) if blocking else await image.afetch_image(prompt)
+            return None, payload, None
+        image_bytes = (
+            image.generate_image(prompt) if blocking else await image.agenerate_image(prompt)
+        )
+        return image_bytes, None, None
+
+    async def _generate(
+        self,
+        current_date: datetime.date | None,
+        headlines: list[dict] | None,
+        update_current: bool,
+        blocking: bool,
+    ) -> None:
+        """
+        Generate and save the panda for a date: prompt, image, dedupe, optimize, save, record.
+
+        The one implementation behind generate_daily_panda (blocking=True, sync
+        client, inline file writes) and agenerate_daily_panda (blocking=False,
+        AsyncOpenAI client, file writes in worker threads).
+        """
+        if current_date is None:
+            current_date = datetime.date.today()
+
+        with FileManager.output_root(self.output_root):
+            try:
+                timings = {}
+
+                logger.info("Generating prompt for %s...", current_date)
+                with span("prompt", date=str(current_date)) as step:
+                    if headlines is None:
+                        headlines = await offload(
+                            blocking, self.prompt_generator.fetch_headlines, current_date
+                        )
+                    if blocking:
+                        prompt = self.prompt_generator.generate_prompt(current_date, headlines)
+                    else:
+                        prompt = await self.prompt_generator.agenerate_prompt(
+                            current_date, headlines
+                        )
+                timings["prompt"] = round(step.seconds, 3)
+                logger.info("Generated prompt: %s", prompt)
+                source_headline = PromptGenerator.source_headline(prompt, headlines)
+
+                logger.info("Generating image for %s...", current_date)
+                with span("image", date=str(current_date)) as step:
+                    image_bytes, payload, losers = await self._image_step(prompt, blocking)
+                    image_hash = None
+                    if self.image_index is not None:
+                        image_bytes, image_hash = await self._screen_duplicates(
+                            prompt, image_bytes, current_date, blocking
+                        )
+                timings["image"] = round(step.seconds, 3)
+                logger.info("Image generation successful. Saving files...")
+
+                derivatives = None
+                if self.post_processor is not None:
+                    if blocking:
+                        processed = self.post_processor.process(image_bytes)
+                    else:
+                        processed = await self.post_processor.aprocess(image_bytes)
+                    image_bytes, derivatives = processed.png, processed.derivatives
+                    timings["post_process"] = round(processed.seconds, 3)
+
+                with span("save", date=str(current_date)):
+                    if payload is not None:
+                        await offload(
+                            blocking, self.save_payload, payload, current_date, update_current
+                        )
+                    await offload(
+                        blocking,
+                        self.save_outputs,
+                        current_date,
+                        prompt,
+                        image_bytes,
+                        update_current,
+                        derivatives,
+                        timings,
+                        losers,
+                        source_headline,
+                    )
+                    await offload(blocking, self._index_image, current_date, image_hash)
+                logger.info("Panda for %s completed successfully!", current_date)
+
+            except Exception as e:
+                logger.error("Error during panda generation for %s: %s", current_date, e)
+                raise
+
+    def generate_daily_panda(
+        self,
+        current_date: datetime.date | None = None,
+        headlines: list[dict] | None = None,
+        update_current: bool = True,
+    ) -> None:
         """
         Generate and save a daily panda image with prompt.
 
+        Args:
+            current_date: Date to generate for (defaults to today)
+            headlines: Pre-fetched headlines to use instead of fetching them
+            update_current: Refresh the current image, prompt and README (off for backfills)
+
+        Raises:
+            Exception: If any step in the generation process fails
+        """
+        run_blocking(self._generate(current_date, headlines, update_current, blocking=True))
+
+    @staticmethod
+    def save_outputs(
+        current_date: datetime.date,
+        prompt: str,
+        image_bytes: bytes | None,
+        update_current: bool = True,
+        derivatives: dict[str, bytes] | None = None,
+        timings: dict[str, float] | None = None,
+        variants: list[bytes] | None = None,
+        source_headline: str | None = None,
+    ) -> None:
+        """
+        Save the image and prompt for a date, refreshing the current aliases and README.
+
+        Args:
+            current_date: Date the panda was generated for
+            prompt: Final image prompt
+            image_bytes: Generated image data (None if save_payload already streamed it)
+            update_current: Refresh the current image, prompt and README
+            derivatives: Post-processed derivatives to save alongside the PNG
+            timings: Seconds spent per generation step, recorded in the archive manifest
+            variants: Losing variants to archive under images/variants
+            source_headline: Feed title the prompt was written from
+        """
+        if image_bytes is not None:
+            FileManager.save_image(image_bytes, current_date, update_current)
+        if derivatives:
+            FileManager.save_derivatives(derivatives, current_date, update_current)
+        if variants:
+            FileManager.save_variants(variants, current_date)
+        FileManager.save_prompt(prompt, current_date, update_current, source_headline)
+        if timings:
+            FileManager.record(current_date, timings=timings)
+        if update_current:
+            FileManager.update_readme(prompt, current_date)
+
+    async def agenerate_daily_panda(
+        self,
+        current_date: datetime.date | None = None,
+        headlines: list[dict] | None = None,
+        update_current: bool = True,
+    ) -> None:
+        """
+        Async variant of generate_daily_panda on the shared AsyncOpenAI connection pool.
+
+        Args:
+            current_date: Date to generate for (defaults to today)
+            headlines: Pre-fetched headlines to use instead of fetching them
+            update_current: Refresh the current image, prompt and README (off for backfills)
+
         Raises:
             Exception: If any step in the generation process fails
         """
-        current_date = datetime.date.today()
+        self.open_async_client()
+        await self._generate(current_date, headlines, update_current, blocking=False)
 
-        try:
-            # Generate prompt
-            print(f"Generating prompt for {current_date}...\n")
-            prompt = self.prompt_generator.generate_prompt(current_date)
-            print(f"Generated prompt: {prompt}\n")
+    async def agenerate_many(
+        self,
+        dates: list[datetime.date],
+        headlines: list[dict] | None = None,
+        max_concurrency: int = 4,
+    ) -> dict[datetime.date, Exception | None]:
+        """
+        Generate several dates concurrently from one process.
+
+        None of the dates refresh the current aliases or README.
+
+        Args:
+            dates: Dates to generate
+            headlines: Pre-fetched headlines shared by all dates
+            max_concurrency: Dates in flight at once
 
-            # Generate image
-            print("Generating image based on prompt...\n")
-            image_bytes = self.image_generator.generate_image(prompt)
-            print("Image generation successful. Saving files...\n")
+        Returns:
+            Mapping of each date to None on success or the exception it raised
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
 
-            # Save files
-            FileManager.save_image(image_bytes, current_date)
-            FileManager.save_prompt(prompt, current_date)
-            FileManager.update_readme(prompt)
+        async def generate(day: datetime.date) -> Exception | None:
+            async with semaphore:
+                try:
+                    await self.agenerate_daily_panda(day, headlines, update_current=False)
+                except Exception as e:
+                    return e
+            return None
 
-            print("Daily panda generation completed successfully!\n")
+        outcomes = await asyncio.gather(*(generate(day) for day in dates))
+        return dict(zip(dates, outcomes, strict=True))
 
-        except Exception as e:
-            print(f"Error during panda generation: {e}")
-            raise
+    async def aclose(self) -> None:
+        """Close the async client's connection pool, if one was opened."""
+        if self._async_client is not None:
+            await self._async_client.close()
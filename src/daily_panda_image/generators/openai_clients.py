@@ -0,0 +1,76 @@
+"""
+OpenAI client factory - Builds sync and async clients on pooled keep-alive HTTP connections.
+"""
+
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient, DefaultHttpxClient, OpenAI
+
+from daily_panda_image.config import get_settings
+
+# Connections kept per client; enough for a backfill's prompt and image stages together
+POOL_MAX_CONNECTIONS = 20
+
+# Idle connections kept open for reuse between requests
+POOL_MAX_KEEPALIVE = 10
+
+# Seconds an idle connection stays in the pool
+POOL_KEEPALIVE_EXPIRY = 60.0
+
+# Image requests routinely take 20-60 seconds, so only the connect phase is kept short
+REQUEST_TIMEOUT = httpx.Timeout(180.0, connect=10.0)
+
+# The SDK's own retries are off; generators retry through the shared Resilience layer instead
+CLIENT_MAX_RETRIES = 0
+
+
+def pool_limits() -> httpx.Limits:
+    """Connection pool limits shared by every client this module builds."""
+    return httpx.Limits(
+        max_connections=POOL_MAX_CONNECTIONS,
+        max_keepalive_connections=POOL_MAX_KEEPALIVE,
+        keepalive_expiry=POOL_KEEPALIVE_EXPIRY,
+    )
+
+
+def _api_key(api_key: str | None) -> str:
+    return api_key or get_settings().openai_api_key.get_secret_value()
+
+
+def create_client(api_key: str | None = None, base_url: str | None = None) -> OpenAI:
+    """
+    Build a synchronous OpenAI client on a pooled keep-alive connection.
+
+    Args:
+        api_key: API key (defaults to the configured OPENAI_API_KEY)
+        base_url: Alternative API root, e.g. a local stand-in server
+
+    Returns:
+        Configured OpenAI client
+    """
+    return OpenAI(
+        api_key=_api_key(api_key),
+        base_url=base_url,
+        max_retries=CLIENT_MAX_RETRIES,
+        http_client=DefaultHttpxClient(limits=pool_limits(), timeout=REQUEST_TIMEOUT),
+    )
+
+
+def create_async_client(api_key: str | None = None, base_url: str | None = None) -> AsyncOpenAI:
+    """
+    Build an asynchronous OpenAI client on a pooled keep-alive connection.
+
+    One client serves every concurrent prompt and image request of a process.
+
+    Args:
+        api_key: API key (defaults to the configured OPENAI_API_KEY)
+        base_url: Alternative API root, e.g. a local stand-in server
+
+    Returns:
+        Configured AsyncOpenAI client
+    """
+    return AsyncOpenAI(
+        api_key=_api_key(api_key),
+        base_url=base_url,
+        max_retries=CLIENT_MAX_RETRIES,
+        http_client=DefaultAsyncHttpxClient(limits=pool_limits(), timeout=REQUEST_TIMEOUT),
+    )
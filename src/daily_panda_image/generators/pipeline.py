@@ -0,0 +1,163 @@
+"""
+Pipeline - Runs work items through stages connected by bounded queues.
+
+Each stage has its own worker threads, so a slow stage (image generation) for
+item N overlaps a faster one (prompt generation) for item N+1. Bounded queues
+provide backpressure: a stage that runs ahead blocks instead of piling up work.
+"""
+
+import logging
+import queue
+import threading
+import time
+from collections.abc import Callable, Hashable, Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+
+
+@dataclass
+class Stage:
+    """A pipeline step and its concurrency settings."""
+
+    name: str
+    func: Callable[[Any], Any]
+    workers: int = 1
+    queue_size: int = 1
+
+
+@dataclass
+class StageMetrics:
+    """Timing collected for one stage."""
+
+    name: str
+    items: int = 0
+    errors: int = 0
+    busy_seconds: float = 0.0
+    max_seconds: float = 0.0
+    blocked_seconds: float = 0.0
+
+    @property
+    def mean_seconds(self) -> float:
+        """Mean processing time per item."""
+        handled = self.items + self.errors
+        return self.busy_seconds / handled if handled else 0.0
+
+    def summary(self) -> str:
+        """One-line human readable summary."""
+        return (
+            f"{self.name}: {self.items} ok, {self.errors} failed, "
+            f"mean {self.mean_seconds:.2f}s, max {self.max_seconds:.2f}s, "
+            f"blocked {self.blocked_seconds:.2f}s"
+        )
+
+
+@dataclass
+class PipelineResult:
+    """Outputs, failures and per-stage metrics of a pipeline run."""
+
+    outputs: dict[Hashable, Any] = field(default_factory=dict)
+    errors: dict[Hashable, tuple[str, Exception]] = field(default_factory=dict)
+    metrics: dict[str, StageMetrics] = field(default_factory=dict)
+    wall_seconds: float = 0.0
+
+
+class Pipeline:
+    """Connects stages with bounded queues and runs each stage on its own threads."""
+
+    def __init__(self, stages: list[Stage]):
+        """
+        Initialize the pipeline.
+
+        Args:
+            stages: Stages in execution order; each receives the previous stage's output
+        """
+        if not stages:
+            raise ValueError("A pipeline needs at least one stage.")
+        self.stages = stages
+
+    def run(self, items: Iterable[Hashable]) -> PipelineResult:
+        """
+        Push items through every stage and wait for all of them to finish.
+
+        An item whose stage raises is recorded in the result's errors and dropped
+        from later stages; the remaining items keep flowing.
+
+        Args:
+            items: Inputs for the first stage; each also keys its output and errors
+
+        Returns:
+            Outputs of the last stage keyed by input item, plus errors and metrics
+        """
+        result = PipelineResult(metrics={s.name: StageMetrics(s.name) for s in self.stages})
+        queues = [queue.Queue(maxsize=stage.queue_size) for stage in self.stages]
+        live_workers = [stage.workers for stage in self.stages]
+        lock = threading.Lock()
+        started = time.monotonic()
+
+        def put(index: int, entry, metrics: StageMetrics | None) -> None:
+            waited = time.monotonic()
+            queues[index].put(entry)
+            if metrics is not None:
+                with lock:
+                    metrics.blocked_seconds += time.monotonic() - waited
+
+        def worker(index: int) -> None:
+            stage = self.stages[index]
+            metrics = result.metrics[stage.name]
+            is_last = index == len(self.stages) - 1
+            while True:
+                entry = queues[index].get()
+                if entry is _DONE:
+                    break
+                key, value = entry
+                begun = time.monotonic()
+                try:
+                    output = stage.func(value)
+                except Exception as e:
+                    elapsed = time.monotonic() - begun
+                    with lock:
+                        metrics.errors += 1
+                        metrics.busy_seconds += elapsed
+                        result.errors[key] = (stage.name, e)
+                    logger.warning("Stage '%s' failed for %s: %s", stage.name, key, e)
+                    continue
+                elapsed = time.monotonic() - begun
+                with lock:
+                    metrics.items += 1
+                    metrics.busy_seconds += elapsed
+                    metrics.max_seconds = max(metrics.max_seconds, elapsed)
+                    if is_last:
+                        result.outputs[key] = output
+                if not is_last:
+                    put(index + 1, (key, output), metrics)
+
+            # The last worker of a stage to finish tells the next stage to wind down
+            with lock:
+                live_workers[index] -= 1
+                closing = live_workers[index] == 0
+            if closing and not is_last:
+                for _ in range(self.stages[index + 1].workers):
+                    queues[index + 1].put(_DONE)
+
+        threads = [
+            threading.Thread(target=worker, args=(index,), name=f"{stage.name}-{n}", daemon=True)
+            for index, stage in enumerate(self.stages)
+            for n in range(stage.workers)
+        ]
+        for thread in threads:
+            thread.start()
+
+        for item in items:
+            put(0, (item, item), None)
+        for _ in range(self.stages[0].workers):
+            queues[0].put(_DONE)
+
+        for thread in threads:
+            thread.join()
+
+        result.wall_seconds = time.monotonic() - started
+        return result
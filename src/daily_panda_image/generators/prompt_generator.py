@@ -1,17 +1,41 @@
 import datetime
-
-from openai import OpenAI
-
+import functools
+import logging
+import re
+from collections.abc import AsyncIterable, AsyncIterator
+
+from openai import AsyncOpenAI, OpenAI
+
+from daily_panda_image.channels import Channel
+from daily_panda_image.generators.resilience import Resilience
+from daily_panda_image.generators.sync_bridge import iterate, offload, run_blocking
+from daily_panda_image.utils.feed_cache import FeedCache
+from daily_panda_image.utils.headline_index import HeadlineIndex, closest
+from daily_panda_image.utils.headline_ranker import HeadlineRanker
 from daily_panda_image.utils.news_scraper import NewsScraper
+from daily_panda_image.utils.response_cache import ResponseCache, cache_key
+from daily_panda_image.utils.telemetry import span
 from daily_panda_image.utils.text_processor import TextProcessor
 
+logger = logging.getLogger(__name__)
+
+# Chat model that writes the image prompt
+CHAT_MODEL = "gpt-4o"
+
+# Streaming stops after a sentence once fewer tokens than this remain in the budget,
+# since a further sentence would almost certainly be cut off and discarded
+STREAM_SENTENCE_RESERVE = 25
+
+# A sentence ends at ., ! or ? followed by whitespace (same rule as remove_incomplete_last_sentence)
+_SENTENCE_END = re.compile(r"[.!?](?=\s)")
 
-def get_system_prompt() -> str:
-    """Get the system prompt for the AI assistant."""
+
+def get_system_prompt(subject: str = "panda") -> str:
+    """Get the system prompt for the AI assistant, featuring the given animal."""
     return (
         "You are a creative prompt engineer specializing in photorealistic image descriptions "
-        "featuring a panda as the central character in real current news events. "
-        "Transform today's top news headlines into hyper-realistic scenes where the panda "
+        f"featuring a {subject} as the central character in real current news events. "
+        f"Transform today's top news headlines into hyper-realistic scenes where the {subject} "
         "actively participates in the story. "
         "Focus on photographic realism: natural lighting, accurate textures, "
         "detailed environments, cinematic composition, and lifelike detail. "
@@ -41,25 +65,131 @@ def _extract_response_text(response) -> str:
     return ""
 
 
-def get_text_prompt(current_date: datetime.date) -> str:
-    """Generate the user prompt using today's news headlines."""
-    formatted_date = current_date.strftime("%B %d, %Y")
-    print(f"Fetching news headlines for {formatted_date}...\n")
+async def iter_stream_text(stream: AsyncIterable) -> AsyncIterator[str]:
+    """Yield the text deltas of a streamed Chat Completions response."""
+    async for chunk in stream:
+        if not getattr(chunk, "choices", None):
+            continue
+        delta = getattr(chunk.choices[0], "delta", None)
+        content = getattr(delta, "content", None)
+        if content:
+            yield content
+
+
+async def iter_ascii(deltas: AsyncIterable[str]) -> AsyncIterator[str]:
+    """Apply ASCII enforcement to each delta as it arrives (the mapping is per character)."""
+    async for delta in deltas:
+        yield TextProcessor.enforce_ascii(delta)
+
+
+async def iter_sentences(deltas: AsyncIterable[str]) -> AsyncIterator[tuple[str, int]]:
+    """
+    Yield complete sentences from streamed text as soon as they are known to be complete.
+
+    A sentence is complete once its closing punctuation is followed by whitespace,
+    or by the end of the stream. A trailing fragment without closing punctuation
+    is dropped.
+
+    Args:
+        deltas: Text deltas, one per streamed token
+
+    Yields:
+        Tuples of (sentence, number of deltas consumed so far)
+    """
+    buffer = ""
+    consumed = 0
+    async for delta in deltas:
+        consumed += 1
+        buffer += delta
+        start = 0
+        for match in _SENTENCE_END.finditer(buffer):
+            yield buffer[start : match.end()].strip(), consumed
+            start = match.end()
+        buffer = buffer[start:]
+
+    tail = buffer.strip()
+    if tail and tail[-1] in ".!?":
+        yield tail, consumed
+
+
+async def take_prompt(
+    sentences: AsyncIterator[tuple[str, int]],
+    max_tokens: int,
+    reserve_tokens: int = STREAM_SENTENCE_RESERVE,
+) -> str:
+    """
+    Join streamed sentences, stopping early once another sentence would not fit the budget.
+
+    Args:
+        sentences: (sentence, tokens consumed) pairs from iter_sentences
+        max_tokens: Completion token budget of the request
+        reserve_tokens: Minimum tokens a further sentence is assumed to need
+
+    Returns:
+        The complete sentences joined by spaces
+    """
+    chosen = []
+    async for sentence, consumed in sentences:
+        chosen.append(sentence)
+        if max_tokens - consumed < reserve_tokens:
+            break
+    return " ".join(chosen)
+
+
+def fetch_headlines(
+    current_date: datetime.date,
+    channel: Channel | None = None,
+    history: HeadlineIndex | None = None,
+) -> list[dict]:
+    """
+    Fetch the merged headlines a prompt for a date is written from.
+
+    Args:
+        current_date: The date to generate news context for
+        channel: Channel whose feeds are read (the default feeds without one)
+        history: Index of past chosen headlines (loaded from the manifest if not given)
+
+    Returns:
+        Merged headlines from NewsScraper.fetch_headlines
+    """
+    logger.info("Fetching news headlines for %s...", current_date.strftime("%B %d, %Y"))
+    with span("headlines.fetch") as fetch:
+        headlines = NewsScraper.fetch_headlines(
+            current_date,
+            cache=FeedCache.load(),
+            history=history or HeadlineIndex.load(before=current_date),
+            feeds=channel.feeds if channel else None,
+        )
+        fetch.set(entries=len(headlines))
+    return headlines
 
-    headlines = NewsScraper.fetch_headlines(current_date)
+
+def get_text_prompt(
+    current_date: datetime.date, headlines: list[dict] | None = None, channel: Channel | None = None
+) -> str:
+    """Generate the user prompt using today's news headlines (fetched unless provided)."""
+    formatted_date = current_date.strftime("%B %d, %Y")
+    subject = channel.subject if channel else "panda"
+
+    # Loaded for provided headlines too, so prefetched ones are ranked for novelty as well
+    history = HeadlineIndex.load(before=current_date)
+    if headlines is None:
+        headlines = fetch_headlines(current_date, channel, history)
+    headlines, ranking = HeadlineRanker.rank(headlines, history, current_date)
+    logger.info(ranking.summary())
     formatted_headlines = NewsScraper.format_for_prompt(headlines)
-    print(f"Headlines:\n{formatted_headlines}\n")
+    logger.info("Headlines:\n%s", formatted_headlines)
 
     prompt_str = f"""Today is {formatted_date}. Here are today's top news headlines with article summaries:
 
 {formatted_headlines}
 
-Pick ONE headline from the list above and create a detailed, photorealistic image prompt featuring a panda as the main character actively participating in that news story.
+Pick ONE headline from the list above and create a detailed, photorealistic image prompt featuring a {subject} as the main character actively participating in that news story.
 
 Requirements:
 - Choose the most visually interesting or emotionally resonant headline
 - Use the article summary details to ground the scene in story-specific facts and details
-- The panda must be DOING something central to the chosen news story
+- The {subject} must be DOING something central to the chosen news story
 - Photorealistic style: natural lighting, sharp detail, accurate textures, no cartoon or illustration
 - Cinematic composition with depth of field and realistic shadows
 - Name a SPECIFIC, real-world location or landmark that directly connects to the story - never use a generic city street or skyline as the backdrop
@@ -71,59 +201,273 @@ Requirements:
 - Use only ASCII-safe characters
 - Allowed punctuation: ., !, ?, :, -, ' (apostrophe), " (quotation marks)
 
-Format: Start with "[Headline summary, Location]" followed by a new line, then "A photorealistic image of..." and describe the panda's active role in the news event."""  # noqa: E501
+Format: Start with "[Headline summary, Location]" followed by a new line, then "A photorealistic image of..." and describe the {subject}'s active role in the news event."""  # noqa: E501
 
-    print(f"{prompt_str}\n")
+    logger.debug(prompt_str)
     return prompt_str
 
 
 class PromptGenerator:
     """Generates creative prompts for panda images based on today's news."""
 
-    def __init__(self, client: OpenAI):
+    def __init__(
+        self,
+        client: OpenAI,
+        async_client: AsyncOpenAI | None = None,
+        stream: bool = False,
+        cache: ResponseCache | None = None,
+        resilience: Resilience | None = None,
+        channel: Channel | None = None,
+    ):
         """
         Initialize the prompt generator.
 
         Args:
             client: Configured OpenAI client instance
+            async_client: Configured AsyncOpenAI client for the async path
+            stream: Stream the chat completion and stop at the last sentence that fits
+            cache: Response cache consulted before calling the API
+            resilience: Retry, rate-limit and circuit-breaker layer calls go through
+                (calls go straight to the client without one)
+            channel: Channel whose subject, system prompt, model and feeds are used
         """
         self.client = client
+        self.async_client = async_client
+        self.stream = stream
+        self.cache = cache
+        self.resilience = resilience
+        self.channel = channel
+
+    @staticmethod
+    def request_key(request: dict) -> str:
+        """
+        Content address of a chat request: system prompt, user prompt and model.
+
+        Args:
+            request: Chat completion arguments from build_request
 
-    def generate_prompt(self, current_date: datetime.date) -> str:
+        Returns:
+            Cache key for the request's final prompt
         """
-        Generate a creative prompt for a panda participating in today's news.
+        system_prompt, text_prompt = (message["content"] for message in request["messages"])
+        return cache_key("chat", system_prompt, text_prompt, request["model"])
+
+    def _cached_prompt(self, request: dict) -> str | None:
+        if self.cache is None:
+            return None
+        prompt = self.cache.get_text(self.request_key(request))
+        if prompt is not None:
+            logger.info("Using cached prompt for unchanged headlines: %s", prompt)
+        return prompt
+
+    def _store_prompt(self, request: dict, prompt: str, degraded: bool = False) -> str:
+        # Fallback results are not cached, so the next run tries the primary model again
+        if self.cache is not None and not degraded:
+            self.cache.put_text(self.request_key(request), prompt)
+        return prompt
+
+    def _require_async_client(self) -> None:
+        if self.async_client is None:
+            raise ValueError("PromptGenerator has no async client configured.")
+
+    async def _send(self, request: dict, blocking: bool, **options):
+        """Create a chat completion; returns the response and whether a fallback served it."""
+        client = self.client if blocking else self.async_client
+        send = functools.partial(client.chat.completions.create, **options)
+        with span("chat.completion", model=request["model"]) as call:
+            if self.resilience is None:
+                response, sent = send(**request), request
+                if not blocking:
+                    response = await response
+            elif blocking:
+                response, sent = self.resilience.call("chat", send, request)
+            else:
+                response, sent = await self.resilience.acall("chat", send, request)
+            call.set(model=sent["model"])
+            call.record_usage(response)
+        return response, sent is not request
+
+    def fetch_headlines(self, current_date: datetime.date) -> list[dict]:
+        """
+        Fetch the headlines for a date from the channel's feeds.
 
         Args:
             current_date: The date to generate news context for
 
         Returns:
-            ASCII-compatible prompt text for image generation
+            Merged headlines, ready to pass to generate_prompt
+        """
+        return fetch_headlines(current_date, self.channel)
+
+    @staticmethod
+    def build_request(
+        current_date: datetime.date,
+        headlines: list[dict] | None = None,
+        channel: Channel | None = None,
+    ) -> dict:
+        """
+        Build the chat completion arguments for a date.
 
-        Raises:
-            ValueError: If model returns an empty response
+        Args:
+            current_date: The date to generate news context for
+            headlines: Pre-fetched headlines to use instead of fetching them
+            channel: Channel overriding the subject, system prompt, model and feeds
+
+        Returns:
+            Keyword arguments for chat.completions.create
         """
         system_prompt = get_system_prompt()
-        text_prompt = get_text_prompt(current_date)
-
-        response = self.client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
+        if channel is not None:
+            system_prompt = channel.system_prompt or get_system_prompt(channel.subject)
+        return {
+            "model": (channel and channel.chat_model) or CHAT_MODEL,
+            "messages": [
                 {"role": "system", "content": system_prompt},
-                {"role": "user", "content": text_prompt},
+                {"role": "user", "content": get_text_prompt(current_date, headlines, channel)},
             ],
-            max_completion_tokens=150,
-        )
+            "max_completion_tokens": 150,
+        }
 
+    @staticmethod
+    def finalize_prompt(response) -> str:
+        """
+        Turn a chat completion response into the final image prompt.
+
+        Args:
+            response: Chat Completions API response
+
+        Returns:
+            ASCII-compatible prompt text for image generation
+
+        Raises:
+            ValueError: If model returns an empty response
+        """
         raw_prompt = _extract_response_text(response).strip()
-        print(f"Raw prompt: {raw_prompt}\n")
+        logger.debug("Raw prompt: %s", raw_prompt)
 
         if not raw_prompt:
             raise ValueError("Model returned an empty response.")
 
         ascii_enforced_prompt = TextProcessor.enforce_ascii(raw_prompt)
-        print(f"ASCII-enforced prompt: {ascii_enforced_prompt}\n")
+        logger.debug("ASCII-enforced prompt: %s", ascii_enforced_prompt)
 
         final_prompt = TextProcessor.remove_incomplete_last_sentence(ascii_enforced_prompt)
-        print(f"Final prompt after sentence cleanup: {final_prompt}\n")
+        logger.debug("Final prompt after sentence cleanup: %s", final_prompt)
 
         return final_prompt
+
+    @staticmethod
+    def source_headline(prompt: str, headlines: list[dict]) -> str | None:
+        """
+        Feed title of the headline a prompt was written from.
+
+        The model paraphrases the headline it picks in the prompt's leading
+        "[Headline summary, Location]" line; that summary is matched against the
+        titles and summaries it was given.
+
+        Args:
+            prompt: Final image prompt
+            headlines: Headlines the prompt was generated from
+
+        Returns:
+            Title of the closest headline, or None if the prompt has no summary line
+        """
+        summary = TextProcessor.extract_headline(prompt)
+        if summary is None:
+            return None
+        candidates = [f"{h.get('title', '')} {h.get('summary', '')}" for h in headlines]
+        index = closest(summary, candidates)
+        return None if index is None else headlines[index].get("title")
+
+    async def _generate_prompt(
+        self, current_date: datetime.date, headlines: list[dict] | None, blocking: bool
+    ) -> str:
+        request = await offload(blocking, self.build_request, current_date, headlines, self.channel)
+        cached = await offload(blocking, self._cached_prompt, request)
+        if cached is not None:
+            return cached
+        if self.stream:
+            prompt, degraded = await self._stream_prompt(request, blocking)
+        else:
+            response, degraded = await self._send(request, blocking)
+            prompt = self.finalize_prompt(response)
+        return await offload(blocking, self._store_prompt, request, prompt, degraded)
+
+    def generate_prompt(
+        self, current_date: datetime.date, headlines: list[dict] | None = None
+    ) -> str:
+        """
+        Generate a creative prompt for a panda participating in today's news.
+
+        Args:
+            current_date: The date to generate news context for
+            headlines: Pre-fetched headlines to use instead of fetching them
+
+        Returns:
+            ASCII-compatible prompt text for image generation
+
+        Raises:
+            ValueError: If model returns an empty response
+        """
+        return run_blocking(self._generate_prompt(current_date, headlines, blocking=True))
+
+    async def _stream_prompt(self, request: dict, blocking: bool) -> tuple[str, bool]:
+        with span("chat.stream") as streamed:
+            stream, degraded = await self._send(request, blocking, stream=True)
+            try:
+                chunks = iterate(stream) if blocking else stream
+                sentences = iter_sentences(iter_ascii(iter_stream_text(chunks)))
+                final_prompt = await take_prompt(sentences, request["max_completion_tokens"])
+            finally:
+                if blocking:
+                    stream.close()
+                else:
+                    await stream.close()
+
+        if not final_prompt:
+            raise ValueError("Model returned no complete sentence.")
+
+        logger.info("Streamed prompt in %.2fs: %s", streamed.seconds, final_prompt)
+        return final_prompt, degraded
+
+    def stream_prompt(self, request: dict) -> tuple[str, bool]:
+        """
+        Stream a chat completion and return as soon as the prompt is settled.
+
+        ASCII enforcement runs on each delta, and the stream is closed after the
+        last complete sentence that fits the token budget, instead of waiting for
+        the full completion and discarding its incomplete tail afterwards.
+
+        Args:
+            request: Chat completion arguments from build_request
+
+        Returns:
+            ASCII-compatible prompt text made of complete sentences, and whether
+            the fallback model produced it
+
+        Raises:
+            ValueError: If the stream contains no complete sentence
+        """
+        return run_blocking(self._stream_prompt(request, blocking=True))
+
+    async def agenerate_prompt(
+        self, current_date: datetime.date, headlines: list[dict] | None = None
+    ) -> str:
+        """
+        Async variant of generate_prompt using the AsyncOpenAI client.
+
+        Headline fetching, when needed, runs in a worker thread so the event loop
+        stays free for other requests.
+
+        Args:
+            current_date: The date to generate news context for
+            headlines: Pre-fetched headlines to use instead of fetching them
+
+        Returns:
+            ASCII-compatible prompt text for image generation
+
+        Raises:
+            ValueError: If model returns an empty response or no async client is configured
+        """
+        self._require_async_client()
+        return await self._generate_prompt(current_date, headlines, blocking=False)
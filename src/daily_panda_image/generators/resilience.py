@@ -0,0 +1,452 @@
+"""
+Resilience - Retries, rate limiting, circuit breaking and model fallback around OpenAI calls.
+
+Every chat and image request goes through Resilience.call (or acall on the async
+path), keyed by endpoint name:
+
+1. A per-endpoint token bucket, when one is installed, spaces out batch calls.
+2. Transient failures (429, 5xx, dropped connections, timeouts) are retried with
+   jittered exponential backoff, or after exactly the delay the server asks for
+   in Retry-After.
+3. Each failed attempt counts against the endpoint's circuit breaker. Once it
+   opens, requests skip the primary model for a cool-down period.
+4. While the breaker is open the request is sent with the endpoint's fallback
+   settings (a cheaper model or quality), which have their own breaker.
+"""
+
+import asyncio
+import contextlib
+import email.utils
+import logging
+import random
+import threading
+import time
+from collections.abc import Awaitable, Callable, Iterator
+from dataclasses import dataclass
+from typing import Any
+
+from openai import APIConnectionError, APIStatusError, InternalServerError, RateLimitError
+
+logger = logging.getLogger(__name__)
+
+# Attempts per request, including the first
+MAX_ATTEMPTS = 4
+
+# Backoff before the first retry; doubles with every further attempt
+BASE_DELAY = 1.0
+
+# Longest backoff between two attempts, unless the server asks for more via Retry-After
+MAX_DELAY = 30.0
+
+# Consecutive failed attempts after which an endpoint's breaker opens
+FAILURE_THRESHOLD = 3
+
+# Seconds an open breaker waits before letting one trial request through
+RESET_TIMEOUT = 60.0
+
+# Request overrides used while an endpoint's breaker is open. gpt-image-1-mini has no
+# smaller square size, so the image fallback lowers the quality instead.
+FALLBACKS = {
+    "chat": {"model": "gpt-4o-mini"},
+    "image": {"quality": "low"},
+}
+
+# Errors worth another attempt; anything else (bad request, auth) fails straight away
+RETRYABLE_ERRORS = (RateLimitError, InternalServerError, APIConnectionError)
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised when an endpoint's breaker is open and no fallback is available."""
+
+
+def retry_after(error: Exception) -> float | None:
+    """
+    Delay the server asked for in a Retry-After or retry-after-ms header.
+
+    Args:
+        error: Exception raised by the OpenAI client
+
+    Returns:
+        Seconds to wait, or None if the response carries no usable header
+    """
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        return float(headers["retry-after-ms"]) / 1000
+    except (KeyError, TypeError, ValueError):
+        pass
+    value = headers.get("retry-after")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+@dataclass
+class RetryPolicy:
+    """How often and how long to back off after a transient failure."""
+
+    max_attempts: int = MAX_ATTEMPTS
+    base_delay: float = BASE_DELAY
+    max_delay: float = MAX_DELAY
+
+    def delay(self, attempt: int, error: Exception, rng: random.Random) -> float:
+        """
+        Pause before the next attempt.
+
+        Args:
+            attempt: Number of the attempt that just failed, starting at 1
+            error: The failure
+            rng: Source of jitter
+
+        Returns:
+            The server's Retry-After if given, otherwise a "full jitter" delay drawn
+            uniformly up to the exponential backoff cap
+        """
+        requested = retry_after(error)
+        if requested is not None:
+            return requested
+        return rng.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+
+class TokenBucket:
+    """Allows rate calls per second on average, with bursts of up to capacity calls."""
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize a full bucket.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Most tokens the bucket holds, i.e. the largest burst
+            clock: Monotonic time source
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self._tokens = capacity
+        self._updated = clock()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        Take a token, going into debt if none is left.
+
+        Returns:
+            Seconds the caller has to wait before using the token
+        """
+        with self._lock:
+            now = self.clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, self._paused_until - now)
+
+    def back_off(self, seconds: float) -> None:
+        """
+        Hold back every caller for at least the given time, e.g. after a 429 response.
+
+        Args:
+            seconds: Pause length, typically the server's Retry-After value
+        """
+        with self._lock:
+            self._paused_until = max(self._paused_until, self.clock() + seconds)
+
+
+class CircuitBreaker:
+    """Stops calls to a failing endpoint, then probes it with one request after a cool-down."""
+
+    def __init__(
+        self,
+        failure_threshold: int = FAILURE_THRESHOLD,
+        reset_timeout: float = RESET_TIMEOUT,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize a closed breaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open the breaker
+            reset_timeout: Seconds before an open breaker lets a trial request through
+            clock: Monotonic time source
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.failures = 0
+        self._opened_at: float | None = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """Current state: "closed", "open" or "half-open"."""
+        if self._opened_at is None:
+            return "closed"
+        if self.clock() - self._opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        """
+        Check whether a request may go out now.
+
+        Half-open breakers let exactly one trial request through at a time.
+
+        Returns:
+            True if the caller may send the request
+        """
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half-open" and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        """Close the breaker and reset the failure count."""
+        with self._lock:
+            self.failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def release(self) -> None:
+        """End a trial request that neither succeeded nor failed, so the next request can probe."""
+        with self._lock:
+            self._probing = False
+
+    def record_failure(self) -> None:
+        """Count a failure, opening (or re-opening) the breaker at the threshold."""
+        with self._lock:
+            self.failures += 1
+            if self._probing or self.failures >= self.failure_threshold:
+                self._opened_at = self.clock()
+            self._probing = False
+
+
+class Resilience:
+    """Retry, rate-limit and circuit-breaker state shared by the prompt and image generators."""
+
+    def __init__(
+        self,
+        policy: RetryPolicy | None = None,
+        fallbacks: dict[str, dict] | None = None,
+        failure_threshold: int = FAILURE_THRESHOLD,
+        reset_timeout: float = RESET_TIMEOUT,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+        rng: random.Random | None = None,
+    ):
+        """
+        Initialize the resilience layer.
+
+        Args:
+            policy: Retry settings (defaults to RetryPolicy())
+            fallbacks: Request overrides per endpoint used while its breaker is open
+                (defaults to FALLBACKS; pass {} to disable fallback)
+            failure_threshold: Consecutive failures that open an endpoint's breaker
+            reset_timeout: Seconds before an open breaker lets a trial request through
+            clock: Monotonic time source
+            sleep: Function used to wait on the sync path
+            rng: Source of backoff jitter
+        """
+        self.policy = policy or RetryPolicy()
+        self.fallbacks = FALLBACKS if fallbacks is None else fallbacks
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.sleep = sleep
+        self.rng = rng or random.Random()
+        self.buckets: dict[str, TokenBucket] = {}
+        self.breakers: dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def limit(self, endpoint: str, per_minute: float, burst: int = 1) -> None:
+        """
+        Rate limit an endpoint with a token bucket, e.g. for batch runs.
+
+        Args:
+            endpoint: Endpoint name ("chat" or "image")
+            per_minute: Average requests allowed per minute
+            burst: Requests allowed back to back
+        """
+        self.buckets[endpoint] = TokenBucket(per_minute / 60, burst, self.clock)
+
+    @contextlib.contextmanager
+    def limited(self, endpoint: str, per_minute: float, burst: int = 1) -> Iterator[None]:
+        """
+        Rate limit an endpoint inside a with block only, restoring its previous limit after.
+
+        Args:
+            endpoint: Endpoint name ("chat" or "image")
+            per_minute: Average requests allowed per minute
+            burst: Requests allowed back to back
+        """
+        previous = self.buckets.get(endpoint)
+        self.limit(endpoint, per_minute, burst)
+        try:
+            yield
+        finally:
+            if previous is None:
+                self.buckets.pop(endpoint, None)
+            else:
+                self.buckets[endpoint] = previous
+
+    def breaker(self, name: str) -> CircuitBreaker:
+        """
+        The circuit breaker for an endpoint or its fallback, created on first use.
+
+        Args:
+            name: Endpoint name, with a ":fallback" suffix for fallback requests
+
+        Returns:
+            CircuitBreaker instance
+        """
+        with self._lock:
+            if name not in self.breakers:
+                self.breakers[name] = CircuitBreaker(
+                    self.failure_threshold, self.reset_timeout, self.clock
+                )
+            return self.breakers[name]
+
+    def _routes(self, endpoint: str, request: dict) -> list[tuple[str, dict]]:
+        routes = [(endpoint, request)]
+        overrides = self.fallbacks.get(endpoint)
+        if overrides:
+            routes.append((f"{endpoint}:fallback", {**request, **overrides}))
+        return routes
+
+    def _before_attempt(self, endpoint: str, name: str) -> float:
+        """Check the breaker and take a token; returns the seconds to wait first."""
+        if not self.breaker(name).allow():
+            raise CircuitOpenError(f"Circuit for {name} is open")
+        bucket = self.buckets.get(endpoint)
+        return bucket.reserve() if bucket is not None else 0.0
+
+    def _after_failure(self, endpoint: str, name: str, attempt: int, error: Exception) -> float:
+        """Record a failed attempt; returns the backoff or re-raises once attempts run out."""
+        self.breaker(name).record_failure()
+        if attempt >= self.policy.max_attempts:
+            raise error
+        delay = self.policy.delay(attempt, error, self.rng)
+        bucket = self.buckets.get(endpoint)
+        if bucket is not None and isinstance(error, RateLimitError):
+            bucket.back_off(delay)
+        status = error.status_code if isinstance(error, APIStatusError) else type(error).__name__
+        logger.warning("%s request failed (%s), retry %d in %.1fs.", name, status, attempt, delay)
+        return delay
+
+    def call(self, endpoint: str, send: Callable[..., Any], request: dict) -> tuple[Any, dict]:
+        """
+        Send a request with retries, falling back while the endpoint's breaker is open.
+
+        Args:
+            endpoint: Endpoint name ("chat" or "image")
+            send: Client method called with the request as keyword arguments
+            request: Request arguments
+
+        Returns:
+            The response and the request that produced it (the fallback request if
+            the primary was skipped)
+
+        Raises:
+            CircuitOpenError: If every route's breaker is open
+            Exception: The last error once the retries are used up
+        """
+        routes = self._routes(endpoint, request)
+        for index, (name, routed) in enumerate(routes):
+            if index:
+                logger.warning(
+                    "%s circuit open, falling back to %s.", endpoint, self.fallbacks[endpoint]
+                )
+            try:
+                return self._attempt(endpoint, name, send, routed), routed
+            except CircuitOpenError:
+                if index == len(routes) - 1:
+                    raise
+        raise AssertionError("unreachable")
+
+    def _attempt(self, endpoint: str, name: str, send: Callable[..., Any], request: dict) -> Any:
+        for attempt in range(1, self.policy.max_attempts + 1):
+            wait = self._before_attempt(endpoint, name)
+            if wait > 0:
+                self.sleep(wait)
+            try:
+                response = send(**request)
+            except RETRYABLE_ERRORS as e:
+                self.sleep(self._after_failure(endpoint, name, attempt, e))
+            except BaseException:
+                # Client errors and cancellations say nothing about the endpoint's health
+                self.breaker(name).release()
+                raise
+            else:
+                self.breaker(name).record_success()
+                return response
+        raise AssertionError("unreachable")
+
+    async def acall(
+        self, endpoint: str, send: Callable[..., Awaitable[Any]], request: dict
+    ) -> tuple[Any, dict]:
+        """
+        Async variant of call; waits with asyncio.sleep so the event loop stays free.
+
+        Args:
+            endpoint: Endpoint name ("chat" or "image")
+            send: Async client method called with the request as keyword arguments
+            request: Request arguments
+
+        Returns:
+            The response and the request that produced it
+
+        Raises:
+            CircuitOpenError: If every route's breaker is open
+            Exception: The last error once the retries are used up
+        """
+        routes = self._routes(endpoint, request)
+        for index, (name, routed) in enumerate(routes):
+            if index:
+                logger.warning(
+                    "%s circuit open, falling back to %s.", endpoint, self.fallbacks[endpoint]
+                )
+            try:
+                return await self._aattempt(endpoint, name, send, routed), routed
+            except CircuitOpenError:
+                if index == len(routes) - 1:
+                    raise
+        raise AssertionError("unreachable")
+
+    async def _aattempt(
+        self, endpoint: str, name: str, send: Callable[..., Awaitable[Any]], request: dict
+    ) -> Any:
+        for attempt in range(1, self.policy.max_attempts + 1):
+            wait = self._before_attempt(endpoint, name)
+            if wait > 0:
+                await asyncio.sleep(wait)
+            try:
+                response = await send(**request)
+            except RETRYABLE_ERRORS as e:
+                await asyncio.sleep(self._after_failure(endpoint, name, attempt, e))
+            except BaseException:
+                self.breaker(name).release()
+                raise
+            else:
+                self.breaker(name).record_success()
+                return response
+        raise AssertionError("unreachable")
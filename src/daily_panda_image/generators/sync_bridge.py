@@ -0,0 +1,72 @@
+"""
+SyncBridge - Runs one coroutine implementation as either the sync or the async API.
+
+Each generation step is written once as a coroutine taking a ``blocking``
+flag. On the async path (blocking=False) it awaits the AsyncOpenAI client and
+moves blocking work to worker threads. On the sync path (blocking=True) it
+calls the sync client and blocking functions inline, so the coroutine never
+suspends and run_blocking can drive it to completion without an event loop.
+That keeps the sync API usable from threads, from code already inside an event
+loop, and without an AsyncOpenAI client.
+"""
+
+import asyncio
+from collections.abc import AsyncIterator, Callable, Coroutine, Iterable
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+def run_blocking(coroutine: Coroutine[Any, Any, T]) -> T:
+    """
+    Run a coroutine that never suspends and return its result.
+
+    Args:
+        coroutine: Coroutine created with blocking=True
+
+    Returns:
+        The coroutine's return value
+
+    Raises:
+        RuntimeError: If the coroutine suspended, i.e. awaited real async I/O
+    """
+    try:
+        coroutine.send(None)
+    except StopIteration as done:
+        return done.value
+    coroutine.close()
+    raise RuntimeError("A blocking coroutine suspended; it must not await async I/O")
+
+
+async def offload(blocking: bool, func: Callable[..., T], *args) -> T:
+    """
+    Call a blocking function inline on the sync path, or in a worker thread on the async path.
+
+    Args:
+        blocking: Whether the caller runs on the sync path
+        func: Blocking function
+        *args: Positional arguments for func
+
+    Returns:
+        func's return value
+    """
+    if blocking:
+        return func(*args)
+    return await asyncio.to_thread(func, *args)
+
+
+async def iterate(iterable: Iterable[T]) -> AsyncIterator[T]:
+    """
+    Iterate a sync iterable with async for, pulling one item at a time.
+
+    Lets sync streams go through the same async consumers as async ones; the
+    items are taken lazily, so a consumer that stops early leaves the rest unread.
+
+    Args:
+        iterable: Sync iterable, e.g. an OpenAI Stream
+
+    Yields:
+        The iterable's items
+    """
+    for item in iterable:
+        yield item
@@ -3,24 +3,12 @@ Panda Image Generator - Automated daily generation of culturally-aware panda ima
 
 This module provides functionality to generate creative prompts based on current cultural
 events and create corresponding images using OpenAI's GPT-4.1 Nano and DALL-E-3 models.
-"""
-
-import sys
-
-from daily_panda_image.config import get_settings
-from daily_panda_image.generators.image_generator import PandaImageGenerator
 
+The command-line interface lives in daily_panda_image.cli; this module keeps
+"python -m daily_panda_image.main" working for the scheduled workflow.
+"""
 
-def main():
-    """Main entry point for the application."""
-    try:
-        get_settings()
-        generator = PandaImageGenerator()
-        generator.generate_daily_panda()
-    except Exception as e:
-        print(f"Fatal error: {e}")
-        sys.exit(1)
-
+from daily_panda_image.cli import main
 
 if __name__ == "__main__":
     main()
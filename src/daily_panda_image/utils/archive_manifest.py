@@ -0,0 +1,165 @@
+"""
+ArchiveManifest - Date-indexed view of the archive/manifest.jsonl records FileManager appends.
+"""
+
+import bisect
+import datetime
+import hashlib
+import json
+import logging
+from pathlib import Path
+
+from daily_panda_image.utils.file_manager import DERIVATIVES, FileManager
+from daily_panda_image.utils.text_processor import TextProcessor
+
+logger = logging.getLogger(__name__)
+
+
+class ArchiveManifest:
+    """In-memory index of the archive manifest with O(1) date lookups and range queries."""
+
+    def __init__(self, path: Path):
+        """
+        Initialize an empty manifest.
+
+        Args:
+            path: JSONL file the records are read from and compacted into
+        """
+        self.path = path
+        self.records: dict[str, dict] = {}
+        self._dates: list[str] = []
+
+    @classmethod
+    def load(cls, path: Path | None = None) -> "ArchiveManifest":
+        """
+        Load the manifest, rebuilding it from images/ and prompts/ if it does not exist yet.
+
+        Args:
+            path: Manifest file (defaults to archive/manifest.jsonl under the project root)
+
+        Returns:
+            ArchiveManifest instance
+        """
+        manifest = cls(path or FileManager.manifest_path())
+        try:
+            with open(manifest.path, encoding="utf-8") as f:
+                for number, line in enumerate(f, 1):
+                    try:
+                        manifest.merge(json.loads(line))
+                    except (ValueError, KeyError, TypeError) as e:
+                        # A torn last line from an interrupted run is expected; skip it
+                        logger.warning("Skipping manifest line %d: %s", number, e)
+        except FileNotFoundError:
+            manifest.rebuild()
+        return manifest
+
+    def merge(self, record: dict) -> None:
+        """
+        Fold a partial record into the index.
+
+        Args:
+            record: Manifest line with a "date" key and any recorded fields
+        """
+        date = record["date"]
+        existing = self.records.get(date)
+        if existing is None:
+            self.records[date] = dict(record)
+            bisect.insort(self._dates, date)
+        else:
+            existing.update(record)
+
+    def get(self, current_date: datetime.date) -> dict | None:
+        """
+        Merged record for a date.
+
+        Args:
+            current_date: Date to look up
+
+        Returns:
+            Record or None if nothing was saved for the date
+        """
+        return self.records.get(str(current_date))
+
+    def has_output(self, current_date: datetime.date) -> bool:
+        """
+        Check whether both the image and the prompt for a date were recorded.
+
+        Args:
+            current_date: Date to check
+
+        Returns:
+            True if the record has image and prompt fields
+        """
+        record = self.get(current_date)
+        return record is not None and "image" in record and "prompt" in record
+
+    def range(self, start: datetime.date, end: datetime.date) -> list[dict]:
+        """
+        Records from start to end, both inclusive.
+
+        Args:
+            start: First date
+            end: Last date
+
+        Returns:
+            Records in ascending date order
+        """
+        low = bisect.bisect_left(self._dates, str(start))
+        high = bisect.bisect_right(self._dates, str(end))
+        return [self.records[date] for date in self._dates[low:high]]
+
+    def latest(self, count: int) -> list[dict]:
+        """
+        Most recent records.
+
+        Args:
+            count: Number of records
+
+        Returns:
+            Up to count records, newest first
+        """
+        return [self.records[date] for date in reversed(self._dates[-count:])]
+
+    def rebuild(self) -> None:
+        """
+        Regenerate the index from images/ and prompts/, then compact it to disk.
+
+        Fields the folders cannot provide (such as timings) are kept from the
+        previous records.
+        """
+        root = FileManager.get_project_root()
+        previous = self.records
+        self.records, self._dates = {}, []
+
+        for image_path in sorted((root / "images").glob("panda_????-??-??.png")):
+            date = image_path.stem.removeprefix("panda_")
+            record = dict(previous.get(date, {}), date=date)
+            with open(image_path, "rb") as f:
+                digest = hashlib.file_digest(f, "sha256").hexdigest()
+            record["image"] = {"sha256": digest, "bytes": image_path.stat().st_size}
+
+            prompt_path = root / "prompts" / f"prompt_{date}.txt"
+            if prompt_path.is_file():
+                prompt = prompt_path.read_text(encoding="utf-8")
+                record["prompt"] = prompt
+                record["headline"] = TextProcessor.extract_headline(prompt)
+
+            derivatives = {}
+            for kind in DERIVATIVES:
+                derivative = Path(FileManager.derivative_path(kind, date))
+                if derivative.is_file():
+                    derivatives[kind] = derivative.stat().st_size
+            if derivatives:
+                record["derivatives"] = derivatives
+            self.merge(record)
+
+        self.save()
+        logger.info("Manifest rebuilt with %d dates.", len(self.records))
+
+    def save(self) -> None:
+        """Atomically write one merged record per date, oldest first."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        lines = [
+            json.dumps(self.records[date], separators=(",", ":")) + "\n" for date in self._dates
+        ]
+        FileManager.atomic_write(self.path, "".join(lines))
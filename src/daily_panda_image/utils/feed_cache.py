@@ -0,0 +1,191 @@
+"""
+FeedCache - Persists feed validators and parsed entries between runs for conditional GETs.
+"""
+
+import json
+import logging
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from daily_panda_image.utils.file_manager import FileManager
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIRECTORY = "cache"
+FEED_CACHE_FILE = "feeds.json"
+
+# Seconds cached entries may be served as a fallback when a feed is down
+FEED_CACHE_TTL = 12 * 60 * 60
+
+# Seconds a feed's validators and entries are kept for conditional requests; the daily
+# run lands about 24h after the last fetch, so this must cover several days
+FEED_CACHE_RETENTION = 7 * 24 * 60 * 60
+
+# Upper bound for the serialised cache file; the least recently fetched feeds go first
+FEED_CACHE_MAX_BYTES = 2 * 1024 * 1024
+
+# Entry fields NewsScraper reads; everything else feedparser produces is dropped
+ENTRY_FIELDS = ("title", "summary", "description")
+
+
+class FeedCache:
+    """On-disk cache of feed ETag/Last-Modified validators and parsed entries."""
+
+    def __init__(
+        self,
+        path: Path,
+        ttl: float = FEED_CACHE_TTL,
+        retention: float = FEED_CACHE_RETENTION,
+        max_bytes: int = FEED_CACHE_MAX_BYTES,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Initialize an empty feed cache.
+
+        Args:
+            path: JSON file the cache is persisted to
+            ttl: Seconds cached entries may be served as a fallback
+            retention: Seconds a feed is kept for conditional requests
+            max_bytes: Size limit for the persisted file
+            clock: Source of the current UNIX time
+        """
+        self.path = path
+        self.ttl = ttl
+        self.retention = retention
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self.feeds: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: Path | None = None, **kwargs) -> "FeedCache":
+        """
+        Load the cache from disk, starting empty if the file is missing or unreadable.
+
+        Args:
+            path: Cache file (defaults to cache/feeds.json under the project root)
+            **kwargs: Forwarded to the constructor
+
+        Returns:
+            FeedCache instance
+        """
+        if path is None:
+            path = FileManager.get_project_root() / CACHE_DIRECTORY / FEED_CACHE_FILE
+        cache = cls(path, **kwargs)
+        try:
+            with open(path) as f:
+                cache.feeds = json.load(f)
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable feed cache '%s': %s", path, e)
+        return cache
+
+    def _age(self, record: dict) -> float:
+        return self.clock() - record.get("fetched_at", 0)
+
+    def get(self, url: str) -> list[dict] | None:
+        """
+        Cached entries for a feed, or None if absent or older than the TTL.
+
+        Args:
+            url: Feed URL
+
+        Returns:
+            Cached entries or None
+        """
+        with self._lock:
+            record = self.feeds.get(url)
+            if record is None or self._age(record) >= self.ttl:
+                return None
+            return record["entries"]
+
+    def conditional_headers(self, url: str) -> dict[str, str]:
+        """
+        Request headers that make the next fetch of a feed conditional.
+
+        Validators are sent whatever the record's age: a 304 answer means the
+        stored entries are still what the server would send.
+
+        Args:
+            url: Feed URL
+
+        Returns:
+            If-None-Match / If-Modified-Since headers for any stored validators
+        """
+        with self._lock:
+            record = self.feeds.get(url)
+            if record is None:
+                return {}
+            headers = {}
+            if record.get("etag"):
+                headers["If-None-Match"] = record["etag"]
+            if record.get("modified"):
+                headers["If-Modified-Since"] = record["modified"]
+            return headers
+
+    def store(self, url: str, entries: list, etag: str | None, modified: str | None) -> None:
+        """
+        Record a freshly downloaded feed.
+
+        Args:
+            url: Feed URL
+            entries: Parsed entries (only ENTRY_FIELDS are kept)
+            etag: ETag response header, if any
+            modified: Last-Modified response header, if any
+        """
+        slim_entries = [
+            {field: entry.get(field) for field in ENTRY_FIELDS if entry.get(field)}
+            for entry in entries
+        ]
+        with self._lock:
+            self.feeds[url] = {
+                "etag": etag,
+                "modified": modified,
+                "fetched_at": self.clock(),
+                "entries": slim_entries,
+            }
+
+    def revalidate(self, url: str) -> list[dict] | None:
+        """
+        Entries of a feed the server answered 304 Not Modified for, marked as fetched now.
+
+        Unlike get, this ignores the TTL: the server has just confirmed the entries.
+
+        Args:
+            url: Feed URL
+
+        Returns:
+            Stored entries, or None if the feed is not cached
+        """
+        with self._lock:
+            record = self.feeds.get(url)
+            if record is None:
+                return None
+            record["fetched_at"] = self.clock()
+            return record["entries"]
+
+    def evict(self) -> None:
+        """Drop feeds past the retention, then the least recently fetched until under max_bytes."""
+        with self._lock:
+            self.feeds = {
+                url: rec for url, rec in self.feeds.items() if self._age(rec) < self.retention
+            }
+
+            sizes = {url: len(json.dumps({url: rec})) for url, rec in self.feeds.items()}
+            total = sum(sizes.values())
+            for url in sorted(self.feeds, key=lambda u: self.feeds[u]["fetched_at"]):
+                if total <= self.max_bytes:
+                    break
+                total -= sizes[url]
+                del self.feeds[url]
+
+    def save(self) -> None:
+        """Evict old feeds and atomically write the cache to disk."""
+        self.evict()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            payload = json.dumps(self.feeds)
+        FileManager.atomic_write(self.path, payload)
@@ -2,9 +2,73 @@
 FileManager - Handles file operations for images, prompts, and README updates.
 """
 
+import contextlib
+import contextvars
 import datetime
+import hashlib
+import json
+import logging
 import os
+import re
+import shutil
+import stat
+import tempfile
+from collections.abc import Iterator
 from pathlib import Path
+from typing import BinaryIO
+
+from daily_panda_image.utils.telemetry import span
+from daily_panda_image.utils.text_processor import TextProcessor
+
+logger = logging.getLogger(__name__)
+
+# Image derivative kind -> (directory under the project root, file name pattern)
+DERIVATIVES = {
+    "webp": (os.path.join("images", "webp"), "panda_{date}.webp"),
+    "avif": (os.path.join("images", "avif"), "panda_{date}.avif"),
+    "thumb": (os.path.join("images", "thumbs"), "panda_{date}.webp"),
+}
+
+# Append-only JSONL index of everything saved, one partial record per line
+ARCHIVE_DIRECTORY = "archive"
+MANIFEST_FILE = "manifest.jsonl"
+
+# HTML comments delimiting the README regions the bot rewrites; text outside them is never touched
+README_CURRENT_SECTION = "panda-current"
+README_PROMPT_SECTION = "panda-prompt"
+README_GALLERY_SECTION = "panda-gallery"
+
+# Number of recent pandas shown in the README gallery
+README_GALLERY_SIZE = 7
+
+# Displayed width of gallery images, in pixels
+README_GALLERY_WIDTH = 128
+
+# Output root set by FileManager.output_root for the current thread or task
+_output_root: contextvars.ContextVar[Path | None] = contextvars.ContextVar(
+    "output_root", default=None
+)
+
+# Process umask, read once at import: os.umask can only be read by setting it, which
+# would briefly change the mode of files other threads create
+_UMASK = os.umask(0o022)
+os.umask(_UMASK)
+
+_GALLERY_ENTRY_DATE = re.compile(r'alt="(\d{4}-\d{2}-\d{2})"')
+
+
+class _HashingWriter:
+    """Forwards writes to a file while hashing and counting them."""
+
+    def __init__(self, file: BinaryIO):
+        self.file = file
+        self.sha256 = hashlib.sha256()
+        self.size = 0
+
+    def write(self, data: bytes) -> int:
+        self.sha256.update(data)
+        self.size += len(data)
+        return self.file.write(data)
 
 
 class FileManager:
@@ -13,14 +77,43 @@ class FileManager:
     @staticmethod
     def get_project_root() -> Path:
         """
-        Get the project root directory.
+        Get the project root directory, or the output root a channel has set.
 
         Returns:
             Path to project root directory
         """
+        override = _output_root.get()
+        if override is not None:
+            return override
         # Navigate up 4 levels from the current file location to get to the project root
         return Path(__file__).resolve().parent.parent.parent.parent
 
+    @staticmethod
+    @contextlib.contextmanager
+    def output_root(root: str | os.PathLike | None) -> Iterator[Path]:
+        """
+        Redirect every path under the project root to another directory within a block.
+
+        The redirection is held in a context variable, so concurrent asyncio tasks
+        and asyncio.to_thread workers each keep their own root. A relative root is
+        taken relative to the project root.
+
+        Args:
+            root: Output root of a channel (None keeps the current root)
+
+        Yields:
+            The root in effect inside the block
+        """
+        if root is None:
+            yield FileManager.get_project_root()
+            return
+        resolved = FileManager.get_project_root() / root
+        token = _output_root.set(resolved)
+        try:
+            yield resolved
+        finally:
+            _output_root.reset(token)
+
     @staticmethod
     def ensure_directory_exists(directory: str) -> None:
         """
@@ -31,16 +124,133 @@ class FileManager:
         """
         dir_path = os.path.join(FileManager.get_project_root(), directory)
         os.makedirs(dir_path, exist_ok=True)
-        print(f"Directory '{directory}' exists or created successfully.\n")
+        logger.debug("Directory '%s' exists or created successfully.", directory)
 
     @staticmethod
-    def save_image(image_bytes: bytes, current_date: datetime.date) -> None:
+    @contextlib.contextmanager
+    def atomic_writer(path: str | os.PathLike) -> Iterator[BinaryIO]:
         """
-        Save image with both timestamped and current filenames.
+        Open a file so readers see either the old or the new content, never a torn one.
+
+        Writes go to a temporary file in the same directory, which is fsynced and
+        renamed over the destination when the block exits; if the block raises,
+        the temporary file is removed and the destination is left untouched.
+
+        Args:
+            path: Destination file
+
+        Yields:
+            Binary file to write the new content to
+        """
+        directory, name = os.path.split(os.fspath(path))
+        with span("file.write", file=name) as write:
+            fd, tmp_path = tempfile.mkstemp(dir=directory or ".", prefix=f".{name}.", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    yield f
+                    f.flush()
+                    os.fsync(f.fileno())
+                    write.set(bytes=f.tell())
+                # mkstemp creates the file 0600; publish it with the usual permissions
+                os.chmod(tmp_path, FileManager._file_mode(path))
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+            FileManager._fsync_directory(directory or ".")
+
+    @staticmethod
+    def _file_mode(path: str | os.PathLike) -> int:
+        """Mode of the existing file, or what open() would give a new one under the umask."""
+        try:
+            return stat.S_IMODE(os.stat(path).st_mode)
+        except FileNotFoundError:
+            return 0o666 & ~_UMASK
+
+    @staticmethod
+    def atomic_write(path: str | os.PathLike, data: bytes | str) -> None:
+        """
+        Write a whole file atomically with atomic_writer.
+
+        Args:
+            path: Destination file
+            data: Content to write (str is encoded as UTF-8)
+        """
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        with FileManager.atomic_writer(path) as f:
+            f.write(data)
+
+    @staticmethod
+    def link_alias(source: str | os.PathLike, alias: str | os.PathLike) -> None:
+        """
+        Atomically point an alias (e.g. panda_current.png) at an existing file.
+
+        The alias becomes a hard link to the source, so no bytes are copied;
+        filesystems without hard links fall back to a copy. Either way the alias
+        is swapped in with a rename.
+
+        Args:
+            source: File the alias should share content with
+            alias: Alias path to create or replace
+        """
+        directory, name = os.path.split(os.fspath(alias))
+        tmp_path = os.path.join(directory, f".{name}.{os.getpid()}.link")
+        with span("file.link", file=name):
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(tmp_path)
+            try:
+                os.link(source, tmp_path)
+            except OSError:
+                shutil.copyfile(source, tmp_path)
+            os.replace(tmp_path, alias)
+            FileManager._fsync_directory(directory or ".")
+
+    @staticmethod
+    def _fsync_directory(directory: str) -> None:
+        """Persist a rename by fsyncing its directory (a no-op where unsupported)."""
+        if not hasattr(os, "O_DIRECTORY"):
+            return
+        fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    @staticmethod
+    def has_output(current_date: datetime.date) -> bool:
+        """
+        Check whether both the image and the prompt for a date have been saved.
+
+        Args:
+            current_date: Date to check
+
+        Returns:
+            True if panda_{date}.png and prompt_{date}.txt both exist
+        """
+        root = FileManager.get_project_root()
+        return (root / "images" / f"panda_{current_date}.png").is_file() and (
+            root / "prompts" / f"prompt_{current_date}.txt"
+        ).is_file()
+
+    @staticmethod
+    @contextlib.contextmanager
+    def image_writer(
+        current_date: datetime.date, update_current: bool = True
+    ) -> Iterator["_HashingWriter"]:
+        """
+        Stream an image to disk, then record it and refresh the current alias.
+
+        The image is hashed as it is written, so neither this method nor the
+        caller needs the whole image in memory. Nothing is recorded or linked
+        if the block raises.
 
         Args:
-            image_bytes: Image data to save
             current_date: Current date for timestamping
+            update_current: Also repoint panda_current.png (off for backfilled dates)
+
+        Yields:
+            Writer for the image bytes
         """
         FileManager.ensure_directory_exists("images")
 
@@ -48,24 +258,57 @@ class FileManager:
         timestamped_path = os.path.join(
             FileManager.get_project_root(), "images", f"panda_{current_date}.png"
         )
-        with open(timestamped_path, "wb") as f:
-            f.write(image_bytes)
-        print(f"Image '{timestamped_path}' saved successfully.\n")
+        with FileManager.atomic_writer(timestamped_path) as f:
+            writer = _HashingWriter(f)
+            yield writer
+        FileManager.record(
+            current_date, image={"sha256": writer.sha256.hexdigest(), "bytes": writer.size}
+        )
+        logger.info("Image '%s' saved successfully.", timestamped_path)
 
-        # Save current version
+        if not update_current:
+            return
+
+        # Point the current alias at the timestamped version
         current_path = os.path.join(FileManager.get_project_root(), "images", "panda_current.png")
-        with open(current_path, "wb") as f:
+        FileManager.link_alias(timestamped_path, current_path)
+        logger.info("Image '%s' saved successfully.", current_path)
+
+    @staticmethod
+    def save_image(
+        image_bytes: bytes, current_date: datetime.date, update_current: bool = True
+    ) -> None:
+        """
+        Save image with both timestamped and current filenames.
+
+        The image is written once, atomically; panda_current.png is a hard link to it.
+
+        Args:
+            image_bytes: Image data to save
+            current_date: Current date for timestamping
+            update_current: Also overwrite panda_current.png (off for backfilled dates)
+        """
+        with FileManager.image_writer(current_date, update_current) as f:
             f.write(image_bytes)
-        print(f"Image '{current_path}' saved successfully.\n")
 
     @staticmethod
-    def save_prompt(prompt: str, current_date: datetime.date) -> None:
+    def save_prompt(
+        prompt: str,
+        current_date: datetime.date,
+        update_current: bool = True,
+        source_headline: str | None = None,
+    ) -> None:
         """
         Save prompt with both timestamped and current filenames.
 
+        The prompt is written once, atomically; prompt_current.txt is a hard link to it.
+
         Args:
             prompt: Prompt text to save
             current_date: Current date for timestamping
+            update_current: Also overwrite prompt_current.txt (off for backfilled dates)
+            source_headline: Feed title the prompt was written from, recorded for the
+                headline history
         """
         FileManager.ensure_directory_exists("prompts")
 
@@ -73,42 +316,214 @@ class FileManager:
         timestamped_path = os.path.join(
             FileManager.get_project_root(), "prompts", f"prompt_{current_date}.txt"
         )
-        with open(timestamped_path, "w") as f:
-            f.write(prompt)
-        print(f"Prompt '{timestamped_path}' saved successfully.\n")
+        FileManager.atomic_write(timestamped_path, prompt)
+        fields = {"prompt": prompt, "headline": TextProcessor.extract_headline(prompt)}
+        if source_headline is not None:
+            fields["source_headline"] = source_headline
+        FileManager.record(current_date, **fields)
+        logger.info("Prompt '%s' saved successfully.", timestamped_path)
+
+        if not update_current:
+            return
 
-        # Save current version
+        # Point the current alias at the timestamped version
         current_path = os.path.join(FileManager.get_project_root(), "prompts", "prompt_current.txt")
-        with open(current_path, "w") as f:
-            f.write(prompt)
-        print(f"Prompt '{current_path}' saved successfully.\n")
+        FileManager.link_alias(timestamped_path, current_path)
+        logger.info("Prompt '%s' saved successfully.", current_path)
+
+    @staticmethod
+    def derivative_path(kind: str, current_date: datetime.date | str) -> str:
+        """
+        Location of an image derivative.
+
+        Args:
+            kind: Derivative kind, one of DERIVATIVES
+            current_date: Date of the image, or "current" for the alias
+
+        Returns:
+            Absolute path of the derivative file
+        """
+        directory, pattern = DERIVATIVES[kind]
+        return os.path.join(
+            FileManager.get_project_root(), directory, pattern.format(date=current_date)
+        )
 
     @staticmethod
-    def update_readme(prompt: str) -> None:
+    def save_derivatives(
+        derivatives: dict[str, bytes], current_date: datetime.date, update_current: bool = True
+    ) -> None:
         """
-        Update README file with the new prompt.
+        Save image derivatives (WebP, AVIF, thumbnail) next to the PNG archive.
+
+        Args:
+            derivatives: Encoded data per derivative kind
+            current_date: Current date for timestamping
+            update_current: Also point each kind's current alias at the new file
+        """
+        for kind, data in derivatives.items():
+            FileManager.ensure_directory_exists(DERIVATIVES[kind][0])
+            path = FileManager.derivative_path(kind, current_date)
+            FileManager.atomic_write(path, data)
+            if update_current:
+                FileManager.link_alias(path, FileManager.derivative_path(kind, "current"))
+            logger.info("Derivative '%s' saved successfully.", path)
+        FileManager.record(
+            current_date, derivatives={kind: len(data) for kind, data in derivatives.items()}
+        )
+
+    @staticmethod
+    def save_variants(variants: list[bytes], current_date: datetime.date) -> None:
+        """
+        Archive the variants that lost the best-of-N selection for a date.
+
+        Args:
+            variants: Image data of the losing variants
+            current_date: Current date for timestamping
+        """
+        directory = os.path.join("images", "variants")
+        FileManager.ensure_directory_exists(directory)
+        for index, data in enumerate(variants, 1):
+            path = os.path.join(
+                FileManager.get_project_root(), directory, f"panda_{current_date}_{index}.png"
+            )
+            FileManager.atomic_write(path, data)
+            logger.info("Variant '%s' saved successfully.", path)
+        FileManager.record(current_date, variants=[len(data) for data in variants])
+
+    @staticmethod
+    def manifest_path() -> Path:
+        """Location of the archive manifest."""
+        return FileManager.get_project_root() / ARCHIVE_DIRECTORY / MANIFEST_FILE
+
+    @staticmethod
+    def record(current_date: datetime.date, **fields) -> None:
+        """
+        Append a partial record for a date to the archive manifest.
+
+        Each save appends only the fields it knows about; readers merge the
+        lines for a date in order, so later values win.
+
+        Args:
+            current_date: Date the fields belong to
+            **fields: JSON-serialisable values to record
+        """
+        path = FileManager.manifest_path()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        line = json.dumps({"date": str(current_date), **fields}, separators=(",", ":"))
+        # A single O_APPEND write per line, so concurrent savers never interleave records
+        with span("manifest.append", bytes=len(line) + 1), open(path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+    @staticmethod
+    def section_span(text: str, name: str) -> tuple[int, int] | None:
+        """
+        Locate the body of a marker-delimited README section.
+
+        Args:
+            text: README content
+            name: Section name used in the <!-- name:start --> / <!-- name:end --> markers
+
+        Returns:
+            (start, end) offsets of the text between the markers, or None if either is missing
+        """
+        start_marker, end_marker = f"<!-- {name}:start -->", f"<!-- {name}:end -->"
+        start = text.find(start_marker)
+        if start == -1:
+            return None
+        start += len(start_marker)
+        end = text.find(end_marker, start)
+        if end == -1:
+            return None
+        return start, end
+
+    @staticmethod
+    def current_entry() -> str:
+        """
+        README line showing today's panda, as the WebP derivative when one was rendered.
+
+        Returns:
+            Markdown image of the current panda, linking to the full PNG when a WebP is shown
+        """
+        image = "images/panda_current.png"
+        webp = Path(FileManager.derivative_path("webp", "current"))
+        if not webp.exists():
+            return f"![screenshot]({image})"
+        preview = webp.relative_to(FileManager.get_project_root()).as_posix()
+        return f"[![screenshot]({preview})]({image})"
+
+    @staticmethod
+    def gallery_entry(current_date: datetime.date) -> str:
+        """
+        README gallery line for a date, showing the thumbnail when one was rendered.
+
+        Args:
+            current_date: Date of the image
+
+        Returns:
+            HTML link to the full image wrapping a fixed-width preview
+        """
+        image = f"images/panda_{current_date}.png"
+        preview = image
+        thumbnail = Path(FileManager.derivative_path("thumb", current_date))
+        if thumbnail.exists():
+            preview = thumbnail.relative_to(FileManager.get_project_root()).as_posix()
+        return (
+            f'<a href="{image}"><img src="{preview}" alt="{current_date}" '
+            f'width="{README_GALLERY_WIDTH}"></a>'
+        )
+
+    @staticmethod
+    def update_readme(prompt: str, current_date: datetime.date | None = None) -> None:
+        """
+        Rewrite the README prompt section and today's panda, and the recent pandas
+        gallery when a date is given.
+
+        Only the spans between the section markers are replaced, so the rest of the
+        README is carried over byte for byte however long it grows. The gallery is
+        rebuilt from its own previous entries rather than from the images directory.
 
         Args:
             prompt: Prompt text to add to README
+            current_date: Date of the new panda to add to the gallery
         """
+        readme_path = os.path.join(FileManager.get_project_root(), "README.md")
         try:
-            readme_path = os.path.join(FileManager.get_project_root(), "README.md")
-            with open(readme_path) as readme_file:
-                readme_content = readme_file.readlines()
+            with open(readme_path, encoding="utf-8") as readme_file:
+                content = readme_file.read()
+        except FileNotFoundError:
+            logger.warning("README.md not found, skipping README update.")
+            return
 
-            updated_readme_content = []
-            for line in readme_content:
-                if line.strip() == "![screenshot](images/panda_current.png)":
-                    updated_readme_content.append(line)
-                    updated_readme_content.append(f"\n**Prompt:** {prompt}\n")
-                    break
-                else:
-                    updated_readme_content.append(line)
+        prompt_span = FileManager.section_span(content, README_PROMPT_SECTION)
+        if prompt_span is None:
+            logger.warning("README.md has no %s markers, skipping update.", README_PROMPT_SECTION)
+            return
+        content = (
+            f"{content[: prompt_span[0]]}\n**Prompt:** {prompt}\n\n{content[prompt_span[1] :]}"
+        )
 
-            with open(readme_path, "w") as readme_file:
-                readme_file.writelines(updated_readme_content)
+        current_span = FileManager.section_span(content, README_CURRENT_SECTION)
+        if current_span is not None:
+            content = (
+                f"{content[: current_span[0]]}\n{FileManager.current_entry()}\n"
+                f"{content[current_span[1] :]}"
+            )
 
-            print("README updated successfully.\n")
+        gallery_span = FileManager.section_span(content, README_GALLERY_SECTION)
+        if current_date is not None and gallery_span is not None:
+            previous = [
+                line
+                for line in content[gallery_span[0] : gallery_span[1]].splitlines()
+                if (match := _GALLERY_ENTRY_DATE.search(line))
+                and match.group(1) != str(current_date)
+            ]
+            entries = [FileManager.gallery_entry(current_date), *previous]
+            entries = entries[:README_GALLERY_SIZE]
+            content = (
+                f"{content[: gallery_span[0]]}\n"
+                + "".join(f"{entry}\n" for entry in entries)
+                + content[gallery_span[1] :]
+            )
 
-        except FileNotFoundError:
-            print("Warning: README.md not found, skipping README update.")
+        FileManager.atomic_write(readme_path, content)
+        logger.info("README updated successfully.")
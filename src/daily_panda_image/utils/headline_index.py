@@ -0,0 +1,182 @@
+"""
+HeadlineIndex - MinHash similarity index over past headlines to spot stories that repeat.
+"""
+
+import datetime
+import re
+import zlib
+
+import numpy as np
+
+from daily_panda_image.utils.archive_manifest import ArchiveManifest
+
+# Hash functions per signature; the Jaccard estimate has a standard error of about 1/sqrt(64)
+NUM_PERMUTATIONS = 64
+
+# Characters per shingle; short enough to survive reworded headlines
+SHINGLE_SIZE = 4
+
+# Estimated Jaccard similarity above which two feeds are reporting the same story
+DUPLICATE_THRESHOLD = 0.4
+
+# Similarity to a recently chosen headline above which a story counts as a repeat
+REPEAT_THRESHOLD = 0.35
+
+# Days of history a story has to be absent from to count as fresh again
+REPEAT_WINDOW_DAYS = 14
+
+_PRIME = (1 << 31) - 1
+_rng = np.random.default_rng(20260610)
+_A = _rng.integers(1, _PRIME, NUM_PERMUTATIONS, dtype=np.uint64)
+_B = _rng.integers(0, _PRIME, NUM_PERMUTATIONS, dtype=np.uint64)
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+
+def shingles(text: str) -> set[str]:
+    """
+    Overlapping character n-grams of the normalised text.
+
+    Args:
+        text: Headline or summary
+
+    Returns:
+        Lowercase SHINGLE_SIZE-grams (the whole text if it is shorter)
+    """
+    normalised = _NON_WORD.sub(" ", text.lower()).strip()
+    if len(normalised) <= SHINGLE_SIZE:
+        return {normalised} if normalised else set()
+    return {normalised[i : i + SHINGLE_SIZE] for i in range(len(normalised) - SHINGLE_SIZE + 1)}
+
+
+def minhash(text: str) -> np.ndarray:
+    """
+    MinHash signature of a text.
+
+    Args:
+        text: Headline or summary
+
+    Returns:
+        uint32 array of NUM_PERMUTATIONS minimum hash values
+    """
+    grams = shingles(text)
+    if not grams:
+        return np.full(NUM_PERMUTATIONS, _PRIME, dtype=np.uint32)
+    hashes = np.fromiter((zlib.crc32(g.encode()) for g in grams), np.uint64, len(grams))
+    hashes %= _PRIME
+    return ((hashes[:, None] * _A + _B) % _PRIME).min(axis=0).astype(np.uint32)
+
+
+def similarity(signature: np.ndarray, signatures: np.ndarray) -> np.ndarray:
+    """
+    Estimated Jaccard similarity of one signature against a stack of signatures.
+
+    Args:
+        signature: Signature from minhash
+        signatures: (n, NUM_PERMUTATIONS) array of signatures
+
+    Returns:
+        n similarities between 0 and 1
+    """
+    return np.count_nonzero(signatures == signature, axis=1) / NUM_PERMUTATIONS
+
+
+def closest(text: str, candidates: list[str]) -> int | None:
+    """
+    Position of the candidate most similar to a text.
+
+    Args:
+        text: Text to match, e.g. a paraphrase of one of the candidates
+        candidates: Texts to choose from
+
+    Returns:
+        Index into candidates, or None if there are none
+    """
+    if not candidates:
+        return None
+    signatures = np.stack([minhash(candidate) for candidate in candidates])
+    return int(similarity(minhash(text), signatures).argmax())
+
+
+class HeadlineIndex:
+    """Signatures of past chosen headlines, stored as one contiguous array for vectorised lookup."""
+
+    def __init__(self, texts: list[str], dates: list[datetime.date]):
+        """
+        Build the index.
+
+        Args:
+            texts: Past headlines
+            dates: Date each headline was chosen on
+        """
+        self.texts = texts
+        self.dates = np.array(dates, dtype="datetime64[D]")
+        self.signatures = np.empty((len(texts), NUM_PERMUTATIONS), dtype=np.uint32)
+        for row, text in enumerate(texts):
+            self.signatures[row] = minhash(text)
+
+    @classmethod
+    def load(cls, before: datetime.date | None = None) -> "HeadlineIndex":
+        """
+        Index the headlines recorded in the archive manifest.
+
+        Each date is indexed under the feed title its prompt was written from,
+        falling back to the prompt's own headline summary for records saved
+        before source titles were recorded.
+
+        Args:
+            before: Only index dates earlier than this (defaults to all)
+
+        Returns:
+            HeadlineIndex instance
+        """
+        manifest = ArchiveManifest.load()
+        end = (before - datetime.timedelta(days=1)) if before else datetime.date.max
+        records = [r for r in manifest.range(datetime.date.min, end) if r.get("headline")]
+        return cls(
+            [r.get("source_headline") or r["headline"] for r in records],
+            [datetime.date.fromisoformat(r["date"]) for r in records],
+        )
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def max_similarity(self, text: str, since: datetime.date | None = None) -> float:
+        """
+        Highest similarity between a text and any indexed headline.
+
+        Args:
+            text: Candidate headline
+            since: Ignore headlines chosen before this date
+
+        Returns:
+            Similarity between 0 and 1 (0 for an empty index)
+        """
+        signatures = self.signatures
+        if since is not None:
+            signatures = signatures[self.dates >= np.datetime64(since, "D")]
+        if not len(signatures):
+            return 0.0
+        return float(similarity(minhash(text), signatures).max())
+
+    def is_repeat(
+        self,
+        text: str,
+        current_date: datetime.date | None = None,
+        threshold: float = REPEAT_THRESHOLD,
+        window_days: int = REPEAT_WINDOW_DAYS,
+    ) -> bool:
+        """
+        Check whether a story was already chosen within the repeat window.
+
+        Args:
+            text: Candidate headline
+            current_date: Date being generated (defaults to today)
+            threshold: Similarity at which the story counts as a repeat
+            window_days: Days of history to compare against
+
+        Returns:
+            True if a similar headline was chosen within window_days
+        """
+        current_date = current_date or datetime.date.today()
+        since = current_date - datetime.timedelta(days=window_days)
+        return self.max_similarity(text, since) >= threshold
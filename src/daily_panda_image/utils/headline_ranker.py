@@ -0,0 +1,189 @@
+"""
+HeadlineRanker - Scores headlines locally so only the best few reach the chat prompt.
+"""
+
+import datetime
+import re
+from dataclasses import dataclass
+
+from daily_panda_image.utils.headline_index import REPEAT_WINDOW_DAYS, HeadlineIndex
+from daily_panda_image.utils.news_scraper import NEWS_FEEDS, NewsScraper
+from daily_panda_image.utils.text_processor import TextProcessor
+
+# Headlines passed on to the model
+RANKED_HEADLINES = 4
+
+# Estimated tokens each summary is clipped to
+SUMMARY_TOKEN_BUDGET = 40
+
+# Weights of the three scores in the combined ranking
+VISUAL_WEIGHT = 0.5
+NOVELTY_WEIGHT = 0.3
+SOURCES_WEIGHT = 0.2
+
+# Words that promise a concrete scene; matched as prefixes ("flood" covers "flooding")
+VISUAL_TERMS = (
+    "festival", "parade", "carnival", "concert", "celebrat", "wedding", "coronation",
+    "launch", "rocket", "eclipse", "volcan", "erupt", "storm", "hurricane", "typhoon",
+    "flood", "wildfire", "blaze", "snow", "heatwave", "earthquake", "rescue", "protest",
+    "march", "race", "marathon", "match", "world cup", "olympic", "zoo", "animal",
+    "whale", "ship", "train", "bridge", "museum", "painting", "discover", "dinosaur",
+    "mountain", "beach", "ocean", "river", "forest", "garden", "bloom", "robot",
+)  # fmt: skip
+
+# Words for stories that are hard to picture
+ABSTRACT_TERMS = (
+    "inflation", "interest rate", "rates", "earnings", "profit", "shares", "stock",
+    "poll", "survey", "report", "ruling", "court", "lawsuit", "inquiry", "budget",
+    "policy", "bill", "tax", "deficit", "gdp", "economy", "talks",
+)  # fmt: skip
+
+_VISUAL = re.compile(r"\b(?:" + "|".join(VISUAL_TERMS) + r")", re.IGNORECASE)
+_ABSTRACT = re.compile(r"\b(?:" + "|".join(ABSTRACT_TERMS) + r")\b", re.IGNORECASE)
+_SENTENCE = re.compile(r"(?<=[.!?])\s+")
+
+
+@dataclass
+class RankingReport:
+    """Before/after sizes of the headline block sent to the model."""
+
+    headlines_before: int
+    headlines_after: int
+    tokens_before: int
+    tokens_after: int
+
+    @property
+    def tokens_saved(self) -> int:
+        """Estimated prompt tokens saved by ranking and clipping."""
+        return self.tokens_before - self.tokens_after
+
+    def summary(self) -> str:
+        """One-line human readable report."""
+        return (
+            f"Headlines ranked: kept {self.headlines_after} of {self.headlines_before}, "
+            f"~{self.tokens_before} -> ~{self.tokens_after} tokens ({self.tokens_saved} saved)"
+        )
+
+
+def visual_score(headline: dict) -> float:
+    """
+    How easy a story is to stage as a single scene, from its title and summary.
+
+    Args:
+        headline: Dict with "title" and optional "summary"
+
+    Returns:
+        Score between 0 and 1
+    """
+    text = f"{headline.get('title', '')} {headline.get('summary', '')}"
+    visual = len(_VISUAL.findall(text))
+    abstract = len(_ABSTRACT.findall(text))
+    return max(0.0, min(1.0, 0.5 + 0.25 * visual - 0.25 * abstract))
+
+
+def clip_summary(summary: str, budget: int = SUMMARY_TOKEN_BUDGET) -> str:
+    """
+    Cut a summary to whole sentences within a token budget.
+
+    The first sentence is cut at a word boundary if it alone exceeds the budget.
+
+    Args:
+        summary: Feed summary
+        budget: Estimated tokens allowed
+
+    Returns:
+        Clipped summary
+    """
+    if TextProcessor.estimate_tokens(summary) <= budget:
+        return summary
+    kept: list[str] = []
+    used = 0
+    for sentence in _SENTENCE.split(summary.strip()):
+        tokens = TextProcessor.estimate_tokens(sentence)
+        if used + tokens > budget:
+            break
+        kept.append(sentence)
+        used += tokens
+    if kept:
+        return " ".join(kept)
+
+    words: list[str] = []
+    used = TextProcessor.estimate_tokens("...")
+    for word in summary.split():
+        used += TextProcessor.estimate_tokens(word)
+        if used > budget:
+            break
+        words.append(word)
+    return " ".join(words) + "..."
+
+
+class HeadlineRanker:
+    """Keeps the top headlines by visual potential, novelty and source agreement."""
+
+    @staticmethod
+    def score(
+        headline: dict,
+        history: HeadlineIndex | None = None,
+        current_date: datetime.date | None = None,
+    ) -> float:
+        """
+        Combined score of a headline.
+
+        Args:
+            headline: Dict with "title", "summary" and optional "sources"
+            history: Index of past chosen headlines, for novelty
+            current_date: Date being generated (defaults to today)
+
+        Returns:
+            Weighted score between 0 and 1
+        """
+        novelty = 1.0
+        if history is not None and len(history):
+            since = (current_date or datetime.date.today()) - datetime.timedelta(
+                days=REPEAT_WINDOW_DAYS
+            )
+            novelty = 1.0 - history.max_similarity(headline["title"], since)
+        sources = min(1.0, headline.get("sources", 1) / len(NEWS_FEEDS))
+        return (
+            VISUAL_WEIGHT * visual_score(headline)
+            + NOVELTY_WEIGHT * novelty
+            + SOURCES_WEIGHT * sources
+        )
+
+    @staticmethod
+    def rank(
+        headlines: list[dict],
+        history: HeadlineIndex | None = None,
+        current_date: datetime.date | None = None,
+        limit: int = RANKED_HEADLINES,
+        summary_budget: int = SUMMARY_TOKEN_BUDGET,
+    ) -> tuple[list[dict], RankingReport]:
+        """
+        Keep the best headlines and clip their summaries.
+
+        Ties keep the feed priority order the headlines arrived in.
+
+        Args:
+            headlines: Merged headlines from NewsScraper.fetch_headlines
+            history: Index of past chosen headlines, for novelty
+            current_date: Date being generated (defaults to today)
+            limit: Number of headlines to keep
+            summary_budget: Estimated tokens each summary is clipped to
+
+        Returns:
+            The kept headlines, best first, and a report of the prompt size saved
+        """
+        scored = sorted(
+            headlines, key=lambda headline: -HeadlineRanker.score(headline, history, current_date)
+        )
+        ranked = [
+            {**headline, "summary": clip_summary(headline.get("summary", ""), summary_budget)}
+            for headline in scored[:limit]
+        ]
+        report = RankingReport(
+            headlines_before=len(headlines),
+            headlines_after=len(ranked),
+            tokens_before=TextProcessor.estimate_tokens(NewsScraper.format_for_prompt(headlines)),
+            tokens_after=TextProcessor.estimate_tokens(NewsScraper.format_for_prompt(ranked)),
+        )
+        return ranked, report
@@ -0,0 +1,317 @@
+"""
+ImageHash - Perceptual hashes of the archived images, to catch near-duplicate pandas.
+
+Each image gets two 64-bit hashes computed with NumPy: a difference hash (dHash)
+of the brightness gradients in a 9x8 thumbnail, and a DCT hash (pHash) of the
+lowest frequencies of a 32x32 thumbnail. Images that look alike differ in only a
+few bits, so a near-duplicate query is a vectorised Hamming-distance scan over
+one contiguous uint64 array per hash. The index is stored as a NumPy record
+array of 24 bytes per image in archive/image_hashes.npy.
+"""
+
+import datetime
+import io
+import logging
+import multiprocessing
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from daily_panda_image.utils.file_manager import FileManager
+from daily_panda_image.utils.telemetry import span
+
+logger = logging.getLogger(__name__)
+
+# Bits per side of each hash; 8 gives 64-bit hashes
+HASH_SIZE = 8
+
+# Thumbnail edge the pHash DCT runs on; only the lowest HASH_SIZE x HASH_SIZE frequencies are kept
+PHASH_SIZE = 32
+
+# Differing bits (of 64) at or below which two images count as near duplicates, on both hashes
+NEAR_DUPLICATE_DISTANCE = 10
+
+# Index file, next to the archive manifest
+IMAGE_HASH_FILE = "image_hashes.npy"
+
+# Images handed to a worker process at a time while building the index
+INDEX_CHUNK_SIZE = 8
+
+# One index record: the date of the image and its two hashes
+INDEX_DTYPE = np.dtype([("date", "datetime64[D]"), ("dhash", "<u8"), ("phash", "<u8")])
+
+_IMAGE_NAME = re.compile(r"panda_(\d{4}-\d{2}-\d{2})\.png")
+
+
+def _dct_matrix(size: int) -> np.ndarray:
+    """Orthonormal DCT-II basis, so a 2-D DCT is two matrix products."""
+    k = np.arange(size)[:, None]
+    n = np.arange(size)[None, :]
+    basis = np.cos(np.pi * (2 * n + 1) * k / (2 * size)) * np.sqrt(2 / size)
+    basis[0] /= np.sqrt(2)
+    return basis
+
+
+_DCT = _dct_matrix(PHASH_SIZE)
+
+
+def _pack(bits: np.ndarray) -> int:
+    return int.from_bytes(np.packbits(bits.ravel()).tobytes(), "big")
+
+
+@dataclass(frozen=True)
+class ImageHash:
+    """dHash and pHash of one image, each a 64-bit integer."""
+
+    dhash: int
+    phash: int
+
+    def distance(self, other: "ImageHash") -> int:
+        """
+        Hamming distance to another image, on the hash where they differ more.
+
+        Args:
+            other: Hashes of the other image
+
+        Returns:
+            Number of differing bits, 0-64
+        """
+        return max((self.dhash ^ other.dhash).bit_count(), (self.phash ^ other.phash).bit_count())
+
+
+def _hash_image(image: Image.Image) -> ImageHash:
+    grey = image.convert("L")
+    gradient = np.asarray(grey.resize((HASH_SIZE + 1, HASH_SIZE), Image.Resampling.BOX), np.int16)
+    dhash = _pack(gradient[:, 1:] > gradient[:, :-1])
+
+    pixels = np.asarray(grey.resize((PHASH_SIZE, PHASH_SIZE), Image.Resampling.BOX), np.float64)
+    frequencies = (_DCT @ pixels @ _DCT.T)[:HASH_SIZE, :HASH_SIZE]
+    # The DC term only carries overall brightness, so it is left out of the median
+    phash = _pack(frequencies > np.median(frequencies.ravel()[1:]))
+    return ImageHash(dhash, phash)
+
+
+def hash_image(image_bytes: bytes) -> ImageHash:
+    """
+    Perceptual hashes of an encoded image.
+
+    Args:
+        image_bytes: Encoded image (PNG, WebP, ...)
+
+    Returns:
+        ImageHash of the image
+    """
+    with Image.open(io.BytesIO(image_bytes)) as image:
+        return _hash_image(image)
+
+
+def hash_file(path: str | os.PathLike) -> ImageHash:
+    """
+    Perceptual hashes of an image file; runs inside the build's worker processes.
+
+    Args:
+        path: Image file
+
+    Returns:
+        ImageHash of the image
+    """
+    with Image.open(path) as image:
+        return _hash_image(image)
+
+
+def hash_files(paths: list[Path], workers: int | None = None) -> list[ImageHash]:
+    """
+    Hash many image files, spread over worker processes.
+
+    Args:
+        paths: Image files
+        workers: Worker processes (defaults to one per core; 1 hashes in this process)
+
+    Returns:
+        Hashes in the order of paths
+    """
+    workers = min(workers or os.cpu_count() or 1, len(paths))
+    if workers <= 1:
+        return [hash_file(path) for path in paths]
+    # spawn avoids forking a parent that already runs feed and API threads
+    with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        return list(pool.map(hash_file, paths, chunksize=INDEX_CHUNK_SIZE))
+
+
+def image_date(path: Path) -> datetime.date | None:
+    """Date of an archived panda_{date}.png, or None for any other file."""
+    match = _IMAGE_NAME.fullmatch(path.name)
+    return datetime.date.fromisoformat(match.group(1)) if match else None
+
+
+class ImageHashIndex:
+    """Hashes of every archived image, one record per date, for vectorised distance queries."""
+
+    def __init__(self, records: np.ndarray | None = None, path: Path | None = None):
+        """
+        Initialize the index.
+
+        Args:
+            records: Array of INDEX_DTYPE records (empty if omitted)
+            path: File the index is saved to (defaults to archive/image_hashes.npy)
+        """
+        self.records = np.empty(0, INDEX_DTYPE) if records is None else records
+        self.path = path or self.default_path()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def default_path() -> Path:
+        """Location of the index, next to the archive manifest."""
+        return FileManager.manifest_path().parent / IMAGE_HASH_FILE
+
+    @classmethod
+    def load(cls, path: Path | None = None, workers: int | None = None) -> "ImageHashIndex":
+        """
+        Load the saved index and hash any archived image it does not cover yet.
+
+        On the first run this hashes the whole archive, in parallel.
+
+        Args:
+            path: Index file (defaults to archive/image_hashes.npy)
+            workers: Worker processes for hashing missing images
+
+        Returns:
+            ImageHashIndex covering every images/panda_*.png
+        """
+        path = path or cls.default_path()
+        try:
+            records = np.load(path, allow_pickle=False)
+        except FileNotFoundError:
+            records = None
+        else:
+            if records.dtype != INDEX_DTYPE:
+                logger.warning("Ignoring image hash index with unexpected layout: %s", path)
+                records = None
+        index = cls(records, path)
+        if index.refresh(workers):
+            index.save()
+        return index
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def refresh(self, workers: int | None = None) -> int:
+        """
+        Hash the archived images that are missing from the index.
+
+        Args:
+            workers: Worker processes (defaults to one per core)
+
+        Returns:
+            Number of images added
+        """
+        known = set(self.records["date"].tolist())
+        pending = sorted(
+            (day, path)
+            for path in (FileManager.get_project_root() / "images").glob("panda_*.png")
+            if (day := image_date(path)) is not None and day not in known
+        )
+        if not pending:
+            return 0
+        with span("image.index", entries=len(pending)):
+            hashes = hash_files([path for _, path in pending], workers)
+        self._merge(
+            np.array(
+                [(day, h.dhash, h.phash) for (day, _), h in zip(pending, hashes, strict=True)],
+                INDEX_DTYPE,
+            )
+        )
+        logger.info("Indexed perceptual hashes of %d archived images.", len(pending))
+        return len(pending)
+
+    def add(self, current_date: datetime.date, image_hash: ImageHash) -> None:
+        """
+        Record the hashes of a date's image, replacing any earlier entry for the date.
+
+        Args:
+            current_date: Date of the image
+            image_hash: Hashes from hash_image
+        """
+        self._merge(np.array([(current_date, image_hash.dhash, image_hash.phash)], INDEX_DTYPE))
+
+    def _merge(self, records: np.ndarray) -> None:
+        with self._lock:
+            kept = self.records[~np.isin(self.records["date"], records["date"])]
+            self.records = np.sort(np.concatenate([kept, records]), order="date")
+
+    def save(self) -> None:
+        """Write the index atomically."""
+        with self._lock:
+            records = self.records
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with FileManager.atomic_writer(self.path) as f:
+            np.save(f, records, allow_pickle=False)
+
+    def distances(self, image_hash: ImageHash) -> np.ndarray:
+        """
+        Hamming distance from an image to every indexed image.
+
+        Args:
+            image_hash: Hashes of the query image
+
+        Returns:
+            Distance per record, on the hash where the images differ more
+        """
+        records = self.records
+        dhash = np.bitwise_count(records["dhash"] ^ np.uint64(image_hash.dhash))
+        phash = np.bitwise_count(records["phash"] ^ np.uint64(image_hash.phash))
+        return np.maximum(dhash, phash)
+
+    def near_duplicates(
+        self,
+        image_hash: ImageHash,
+        max_distance: int = NEAR_DUPLICATE_DISTANCE,
+        exclude: datetime.date | None = None,
+    ) -> list[tuple[datetime.date, int]]:
+        """
+        Indexed images that look almost the same as the query image.
+
+        Args:
+            image_hash: Hashes of the query image
+            max_distance: Largest distance that still counts as a near duplicate
+            exclude: Date to leave out, e.g. the one being regenerated
+
+        Returns:
+            (date, distance) pairs, closest first
+        """
+        records = self.records
+        distances = self.distances(image_hash)
+        close = distances <= max_distance
+        if exclude is not None:
+            close &= records["date"] != np.datetime64(exclude, "D")
+        order = np.flatnonzero(close)[np.argsort(distances[close], kind="stable")]
+        return [(records["date"][i].item(), int(distances[i])) for i in order]
+
+    def duplicate_pairs(
+        self, max_distance: int = NEAR_DUPLICATE_DISTANCE
+    ) -> list[tuple[datetime.date, datetime.date, int]]:
+        """
+        Every pair of indexed images that are near duplicates of each other.
+
+        Args:
+            max_distance: Largest distance that still counts as a near duplicate
+
+        Returns:
+            (earlier date, later date, distance) triples, closest first
+        """
+        records = self.records
+        dhash = np.bitwise_count(records["dhash"][:, None] ^ records["dhash"][None, :])
+        phash = np.bitwise_count(records["phash"][:, None] ^ records["phash"][None, :])
+        distances = np.maximum(dhash, phash)
+        first, second = np.nonzero(np.triu(distances <= max_distance, k=1))
+        pairs = [
+            (records["date"][i].item(), records["date"][j].item(), int(distances[i, j]))
+            for i, j in zip(first, second, strict=True)
+        ]
+        return sorted(pairs, key=lambda pair: pair[2])
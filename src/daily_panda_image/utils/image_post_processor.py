@@ -0,0 +1,169 @@
+"""
+ImagePostProcessor - Recompresses generated PNGs and renders WebP/AVIF/thumbnail derivatives.
+
+The work is CPU bound (zlib at level 9, WebP/AVIF encoders), so it runs in a
+process pool and the calling thread only waits on a future.
+"""
+
+import asyncio
+import io
+import logging
+import multiprocessing
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+from PIL import Image, features
+
+from daily_panda_image.utils.telemetry import span
+
+logger = logging.getLogger(__name__)
+
+# Processes used for post-processing; each image is handled by a single process
+POST_PROCESS_WORKERS = 2
+
+# Longest edge of the thumbnail derivative, in pixels
+THUMBNAIL_SIZE = 256
+
+WEBP_QUALITY = 85
+AVIF_QUALITY = 60
+
+
+@dataclass
+class ProcessedImage:
+    """Result of post-processing one image."""
+
+    png: bytes
+    original_bytes: int
+    derivatives: dict[str, bytes] = field(default_factory=dict)
+    seconds: float = 0.0
+
+    @property
+    def bytes_saved(self) -> int:
+        """Bytes saved on the PNG by lossless recompression."""
+        return self.original_bytes - len(self.png)
+
+    def summary(self) -> str:
+        """One-line human readable report."""
+        parts = [
+            f"PNG {self.original_bytes:,} -> {len(self.png):,} bytes "
+            f"({self.bytes_saved:,} saved)"
+        ]
+        parts += [f"{kind} {len(data):,} bytes" for kind, data in self.derivatives.items()]
+        return f"Post-processed in {self.seconds:.2f}s: " + ", ".join(parts)
+
+
+def _encode(image: Image.Image, image_format: str, **options) -> bytes:
+    buffer = io.BytesIO()
+    image.save(buffer, format=image_format, **options)
+    return buffer.getvalue()
+
+
+def process_image(image_bytes: bytes) -> ProcessedImage:
+    """
+    Losslessly recompress a PNG and render its derivatives.
+
+    Runs inside the worker processes, so it only takes and returns picklable data.
+
+    Args:
+        image_bytes: PNG data as returned by the image API
+
+    Returns:
+        The smaller of the original and recompressed PNG, plus "webp", "thumb"
+        and (when Pillow has AVIF support) "avif" derivatives
+    """
+    started = time.perf_counter()
+    with Image.open(io.BytesIO(image_bytes)) as source:
+        image = source.copy()
+
+    png = _encode(image, "PNG", optimize=True)
+    if len(png) >= len(image_bytes):
+        png = image_bytes
+
+    derivatives = {"webp": _encode(image, "WEBP", quality=WEBP_QUALITY, method=6)}
+    if features.check("avif"):
+        derivatives["avif"] = _encode(image, "AVIF", quality=AVIF_QUALITY)
+
+    thumbnail = image.copy()
+    thumbnail.thumbnail((THUMBNAIL_SIZE, THUMBNAIL_SIZE))
+    derivatives["thumb"] = _encode(thumbnail, "WEBP", quality=WEBP_QUALITY, method=6)
+
+    return ProcessedImage(
+        png=png,
+        original_bytes=len(image_bytes),
+        derivatives=derivatives,
+        seconds=time.perf_counter() - started,
+    )
+
+
+class ImagePostProcessor:
+    """Runs process_image on a process pool so callers are not blocked by the encoders."""
+
+    def __init__(self, max_workers: int = POST_PROCESS_WORKERS):
+        """
+        Initialize the post-processor; worker processes start on first use.
+
+        Args:
+            max_workers: Number of worker processes
+        """
+        self.max_workers = max_workers
+        self._executor: ProcessPoolExecutor | None = None
+
+    def submit(self, image_bytes: bytes) -> Future:
+        """
+        Queue an image for post-processing.
+
+        Args:
+            image_bytes: PNG data
+
+        Returns:
+            Future resolving to a ProcessedImage
+        """
+        if self._executor is None:
+            # spawn avoids forking a parent that already runs feed and API threads
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor.submit(process_image, image_bytes)
+
+    def process(self, image_bytes: bytes) -> ProcessedImage:
+        """
+        Post-process an image and wait for the result.
+
+        Args:
+            image_bytes: PNG data
+
+        Returns:
+            ProcessedImage with the recompressed PNG and derivatives
+        """
+        with span("image.optimize", bytes=len(image_bytes)):
+            processed = self.submit(image_bytes).result()
+        logger.info(processed.summary())
+        return processed
+
+    async def aprocess(self, image_bytes: bytes) -> ProcessedImage:
+        """
+        Async variant of process; awaits the worker process without blocking the loop.
+
+        Args:
+            image_bytes: PNG data
+
+        Returns:
+            ProcessedImage with the recompressed PNG and derivatives
+        """
+        with span("image.optimize", bytes=len(image_bytes)):
+            processed = await asyncio.wrap_future(self.submit(image_bytes))
+        logger.info(processed.summary())
+        return processed
+
+    def close(self) -> None:
+        """Shut down the worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self) -> "ImagePostProcessor":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,197 @@
+"""
+ImageSink - Decodes base64 image payloads in chunks into files or preallocated buffers.
+
+Decoding the API's b64_json with base64.b64decode holds a second full copy of
+the image in memory. decode_into instead decodes a slice at a time and writes
+each slice straight to the sink, so peak memory beyond the base64 text itself
+is one chunk. The PNG signature is checked before anything is written and the
+decoded size is known, and enforced, from the length of the text.
+"""
+
+import binascii
+import io
+from collections.abc import Iterator
+from typing import BinaryIO, Protocol
+
+# Magic bytes every PNG file starts with
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# Base64 characters decoded per step, a multiple of 4 so no slice splits a quantum;
+# 64 KiB of text decodes to 48 KiB of image
+DECODE_CHUNK_CHARS = 64 * 1024
+
+# Largest decoded image accepted; a 1536x1024 PNG from the API is 2-4 MB
+MAX_IMAGE_BYTES = 32 * 1024 * 1024
+
+# Base64 characters needed to decode the PNG signature (12 characters -> 9 bytes)
+_SIGNATURE_CHARS = 12
+
+
+class Writable(Protocol):
+    """Anything with a binary write method: files, BytesIO, mmap, hashing wrappers."""
+
+    def write(self, data: bytes, /) -> int | None: ...
+
+
+class BufferWriter:
+    """File-like writer filling a preallocated writable buffer, such as a bytearray."""
+
+    def __init__(self, buffer):
+        """
+        Initialize the writer at the start of the buffer.
+
+        Args:
+            buffer: Any object supporting the writable buffer protocol
+        """
+        self.view = memoryview(buffer).cast("B")
+        if self.view.readonly:
+            raise TypeError("Image sink buffer is read-only")
+        self.offset = 0
+
+    @property
+    def remaining(self) -> int:
+        """Bytes left before the buffer is full."""
+        return len(self.view) - self.offset
+
+    def write(self, data: bytes) -> int:
+        end = self.offset + len(data)
+        if end > len(self.view):
+            raise ValueError(f"Image does not fit the {len(self.view)}-byte buffer")
+        self.view[self.offset : end] = data
+        self.offset = end
+        return len(data)
+
+
+class TeeWriter:
+    """Writes every chunk to several writers, e.g. the output file and the response cache."""
+
+    def __init__(self, *writers: Writable):
+        self.writers = writers
+
+    def write(self, data: bytes) -> int:
+        for writer in self.writers:
+            writer.write(data)
+        return len(data)
+
+
+def as_writer(sink: Writable | memoryview | bytearray) -> Writable:
+    """
+    Adapt a sink to the write interface.
+
+    Args:
+        sink: Object with a write method, or a writable buffer (memoryview, bytearray)
+
+    Returns:
+        The sink itself, or a BufferWriter over it
+    """
+    return sink if hasattr(sink, "write") else BufferWriter(sink)
+
+
+def decoded_size(b64: str) -> int:
+    """
+    Number of bytes a base64 string decodes to, without decoding it.
+
+    Args:
+        b64: Padded base64 text without line breaks
+
+    Returns:
+        Decoded length in bytes
+
+    Raises:
+        ValueError: If the length is not a multiple of 4
+    """
+    if len(b64) % 4:
+        raise ValueError("Image data is not padded base64")
+    padding = len(b64[-2:]) - len(b64[-2:].rstrip("="))
+    return len(b64) // 4 * 3 - padding
+
+
+def iter_decoded(
+    b64: str,
+    chunk_chars: int = DECODE_CHUNK_CHARS,
+    signature: bytes | None = PNG_SIGNATURE,
+    max_bytes: int = MAX_IMAGE_BYTES,
+) -> Iterator[bytes]:
+    """
+    Decode base64 text one slice at a time, after validating its header and size.
+
+    Args:
+        b64: Padded base64 text without line breaks
+        chunk_chars: Characters decoded per slice (rounded down to a multiple of 4)
+        signature: Magic bytes the decoded data must start with (None to skip the check)
+        max_bytes: Largest decoded size accepted
+
+    Yields:
+        Consecutive decoded chunks
+
+    Raises:
+        ValueError: If the text is not valid base64, lacks the signature or is too large
+    """
+    size = decoded_size(b64)
+    if size > max_bytes:
+        raise ValueError(f"Image of {size} bytes exceeds the {max_bytes}-byte limit")
+    if signature is not None:
+        head = binascii.a2b_base64(b64[:_SIGNATURE_CHARS], strict_mode=True)
+        if not head.startswith(signature):
+            raise ValueError("Image data is not a PNG")
+
+    step = max(4, chunk_chars - chunk_chars % 4)
+    produced = 0
+    for start in range(0, len(b64), step):
+        try:
+            chunk = binascii.a2b_base64(b64[start : start + step], strict_mode=True)
+        except binascii.Error as e:
+            raise ValueError(f"Invalid base64 image data at offset {start}: {e}") from e
+        produced += len(chunk)
+        yield chunk
+    if produced != size:
+        raise ValueError(f"Decoded {produced} bytes, expected {size}")
+
+
+def decode_into(b64: str, sink: Writable | memoryview | bytearray, **options) -> int:
+    """
+    Decode base64 image data straight into a sink.
+
+    A buffer sink is checked for capacity before anything is written, and no
+    byte reaches any sink unless the PNG signature matched.
+
+    Args:
+        b64: Padded base64 text without line breaks
+        sink: Open binary file, mmap, BytesIO or writable buffer
+        **options: chunk_chars, signature and max_bytes, as for iter_decoded
+
+    Returns:
+        Number of bytes written
+
+    Raises:
+        ValueError: If the data is invalid or does not fit the buffer
+    """
+    writer = as_writer(sink)
+    if isinstance(writer, BufferWriter) and decoded_size(b64) > writer.remaining:
+        raise ValueError(
+            f"Image of {decoded_size(b64)} bytes does not fit the {writer.remaining}-byte buffer"
+        )
+    written = 0
+    for chunk in iter_decoded(b64, **options):
+        writer.write(chunk)
+        written += len(chunk)
+    return written
+
+
+def copy_into(source: BinaryIO, sink: Writable | memoryview | bytearray) -> int:
+    """
+    Copy an already decoded image, e.g. a cached file, into a sink in chunks.
+
+    Args:
+        source: Binary file positioned at the start of the image
+        sink: Open binary file, mmap, BytesIO or writable buffer
+
+    Returns:
+        Number of bytes written
+    """
+    writer = as_writer(sink)
+    written = 0
+    while chunk := source.read(io.DEFAULT_BUFFER_SIZE * 8):
+        writer.write(chunk)
+        written += len(chunk)
+    return written
@@ -3,10 +3,34 @@ NewsScraper - Fetches today's top headlines from public RSS news feeds.
 """
 
 import datetime
+import html
+import logging
+import re
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import BinaryIO
 
 import feedparser
+import numpy as np
 
-# RSS feeds from major news organisations
+from daily_panda_image.utils.feed_cache import FeedCache
+from daily_panda_image.utils.feed_parser import FeedFormatError, parse_feed, read_chunks
+from daily_panda_image.utils.headline_index import (
+    DUPLICATE_THRESHOLD,
+    NUM_PERMUTATIONS,
+    HeadlineIndex,
+    minhash,
+    similarity,
+)
+from daily_panda_image.utils.telemetry import span
+from daily_panda_image.utils.text_processor import TextProcessor
+
+logger = logging.getLogger(__name__)
+
+# RSS feeds from major news organisations, in priority order
 NEWS_FEEDS = [
     ("BBC News", "http://feeds.bbci.co.uk/news/rss.xml"),
     ("Reuters", "https://feeds.reuters.com/reuters/topNews"),
@@ -16,46 +40,367 @@ NEWS_FEEDS = [
 
 MAX_HEADLINES = 8
 
+# Seconds a single feed may take before it is dropped from the run
+FEED_TIMEOUT = 10.0
+
+# Seconds the whole fetch may take, however many feeds are still outstanding
+FETCH_DEADLINE = 20.0
+
+USER_AGENT = "daily-panda-image-bot (+https://github.com/hvalfangst/daily-panda-image-bot)"
+
+# Characters kept per summary once markup is stripped; the ranker clips further by tokens
+SUMMARY_MAX_CHARS = 600
+
+# Elements whose content is never shown to a reader, comments, and any other tag
+_MARKUP = re.compile(
+    r"<(script|style|noscript|template)\b.*?</\1\s*>|<!--.*?-->|<[!/?]?([a-zA-Z][\w:-]*)[^>]*>",
+    re.DOTALL | re.IGNORECASE,
+)
+
+# Tags that separate words even without surrounding whitespace
+_BREAK_TAGS = {"br", "p", "div", "li", "ul", "ol", "tr", "td", "h1", "h2", "h3", "h4", "img"}
+
 
 class NewsScraper:
     """Scrapes today's top news headlines from RSS feeds."""
 
     @staticmethod
-    def fetch_headlines(current_date: datetime.date | None = None) -> list[dict]:
+    def fetch_headlines(
+        current_date: datetime.date | None = None,
+        concurrent: bool = True,
+        feed_timeout: float = FEED_TIMEOUT,
+        deadline: float = FETCH_DEADLINE,
+        cache: FeedCache | None = None,
+        history: HeadlineIndex | None = None,
+        feeds: list[tuple[str, str]] | None = None,
+        fast_parse: bool = False,
+    ) -> list[dict]:
         """
         Fetch today's top headlines from multiple RSS feeds.
 
         Args:
             current_date: Date to filter headlines for (defaults to today).
+            concurrent: Download all feeds in parallel instead of one after another.
+            feed_timeout: Seconds a single feed may take before it is skipped.
+            deadline: Seconds the whole fetch may take.
+            cache: Feed cache for conditional requests and stale fallback; saved afterwards.
+            history: Index of past chosen headlines; stories it has seen recently go last.
+            feeds: (source name, URL) pairs to read instead of NEWS_FEEDS.
+            fast_parse: Read only the first items' titles and summaries with the
+                streaming parser instead of feedparser.
 
         Returns:
-            List of dicts with "title" and "summary" keys, deduplicated, up to MAX_HEADLINES.
+            List of dicts with "title", "summary" and "sources" keys, deduplicated,
+            up to MAX_HEADLINES.
         """
         if current_date is None:
             current_date = datetime.date.today()
 
-        items: list[dict] = []
-        seen_titles: set[str] = set()
+        feed_entries = NewsScraper.fetch_feeds(
+            NEWS_FEEDS if feeds is None else feeds,
+            concurrent,
+            feed_timeout,
+            deadline,
+            cache,
+            fast_parse,
+        )
+        if cache is not None:
+            try:
+                cache.save()
+            except OSError as e:
+                logger.warning("Could not save feed cache: %s", e)
+        return NewsScraper.merge_entries(feed_entries, history, current_date)
+
+    @staticmethod
+    def fetch_feed(
+        url: str,
+        timeout: float = FEED_TIMEOUT,
+        cache: FeedCache | None = None,
+        fast_parse: bool = False,
+    ) -> list:
+        """
+        Download and parse a single feed.
+
+        With a cache, the request carries the stored ETag/Last-Modified validators
+        and a 304 Not Modified answer reuses the cached entries without parsing.
+
+        Args:
+            url: Feed URL.
+            timeout: Socket timeout in seconds.
+            cache: Optional feed cache to revalidate against and update.
+            fast_parse: Stream the response through the streaming parser and stop
+                downloading after STREAM_MAX_ITEMS items (see read_feed).
+
+        Returns:
+            Parsed feed entries.
+        """
+        headers = {"User-Agent": USER_AGENT}
+        if cache is not None:
+            headers.update(cache.conditional_headers(url))
+        request = urllib.request.Request(url, headers=headers)
+        with span("feed.fetch", url=url) as fetch:
+            try:
+                # Leaving the block closes the connection, even if the body was not read to the end
+                with urllib.request.urlopen(request, timeout=timeout) as response:
+                    etag = response.headers.get("ETag")
+                    modified = response.headers.get("Last-Modified")
+                    entries, size = NewsScraper.read_feed(response, fast_parse)
+            except urllib.error.HTTPError as e:
+                cached = cache.revalidate(url) if cache is not None and e.code == 304 else None
+                if cached is None:
+                    raise
+                fetch.set(not_modified=True, entries=len(cached))
+                return cached
+
+            fetch.set(bytes=size, entries=len(entries))
+        if cache is not None:
+            cache.store(url, entries, etag, modified)
+        return entries
+
+    @staticmethod
+    def fetch_feeds(
+        feeds: list[tuple[str, str]],
+        concurrent: bool = True,
+        feed_timeout: float = FEED_TIMEOUT,
+        deadline: float = FETCH_DEADLINE,
+        cache: FeedCache | None = None,
+        fast_parse: bool = False,
+    ) -> list[list]:
+        """
+        Fetch several feeds, either in parallel or one after another.
+
+        A feed that fails, exceeds feed_timeout or is still outstanding when the
+        overall deadline passes contributes its cached entries if the cache still
+        holds them, or an empty list otherwise, so the result always lines up with
+        the feeds argument.
+
+        Args:
+            feeds: (source name, URL) pairs in priority order.
+            concurrent: Download all feeds in parallel.
+            feed_timeout: Seconds a single feed may take.
+            deadline: Seconds the whole fetch may take.
+            cache: Optional feed cache for conditional requests and stale fallback.
+            fast_parse: Parse with the streaming parser (see parse_feed).
+
+        Returns:
+            One list of entries per feed, in the same order as feeds.
+        """
+        started = time.monotonic()
+        results: list[list] = []
+
+        def fallback(source_name: str, url: str, reason: str) -> list:
+            stale = cache.get(url) if cache is not None else None
+            if stale is None:
+                logger.warning("%s, skipping %s.", reason.capitalize(), source_name)
+                return []
+            logger.warning(
+                "%s, using %d cached entries for %s.", reason.capitalize(), len(stale), source_name
+            )
+            return stale
+
+        if not concurrent:
+            for source_name, url in feeds:
+                if time.monotonic() - started >= deadline:
+                    results.append(fallback(source_name, url, "fetch deadline reached"))
+                    continue
+                try:
+                    entries = NewsScraper.fetch_feed(url, feed_timeout, cache, fast_parse)
+                    logger.info("Fetched %d entries from %s.", len(entries), source_name)
+                    results.append(entries)
+                except Exception as e:
+                    results.append(fallback(source_name, url, f"could not fetch ({e})"))
+            return results
+
+        executor = ThreadPoolExecutor(max_workers=max(len(feeds), 1))
+        try:
+            futures = [
+                executor.submit(NewsScraper.fetch_feed, url, feed_timeout, cache, fast_parse)
+                for _, url in feeds
+            ]
+            # Every feed starts at once, so each one's cut-off is measured from the same start
+            cutoff = started + min(feed_timeout, deadline)
+            for (source_name, url), future in zip(feeds, futures, strict=True):
+                try:
+                    entries = future.result(timeout=max(cutoff - time.monotonic(), 0))
+                    logger.info("Fetched %d entries from %s.", len(entries), source_name)
+                    results.append(entries)
+                except FutureTimeoutError:
+                    results.append(fallback(source_name, url, "no response in time"))
+                except Exception as e:
+                    results.append(fallback(source_name, url, f"could not fetch ({e})"))
+        finally:
+            # Do not wait for stragglers; their sockets time out on their own
+            executor.shutdown(wait=False, cancel_futures=True)
+        return results
+
+    @staticmethod
+    def read_feed(response: BinaryIO, fast: bool = False) -> tuple[list, int]:
+        """
+        Read and parse a feed from a response stream.
+
+        The fast path pulls the response chunk by chunk into the streaming
+        parser and stops reading as soon as STREAM_MAX_ITEMS items are parsed;
+        the caller then closes the connection, leaving the rest undownloaded.
+        If the streaming parser gives up, the bytes read so far plus the rest
+        of the response go to feedparser.
+
+        Args:
+            response: Open HTTP response (or any binary stream).
+            fast: Try the streaming parser first.
+
+        Returns:
+            Feed entries and the number of body bytes read.
+        """
+        if not fast:
+            body = response.read()
+            return feedparser.parse(body).entries, len(body)
+        consumed: list[bytes] = []
+
+        def chunks():
+            for chunk in read_chunks(response):
+                consumed.append(chunk)
+                yield chunk
+
+        try:
+            entries = parse_feed(chunks())
+        except FeedFormatError as e:
+            logger.debug("Streaming parser gave up (%s); falling back to feedparser.", e)
+            body = b"".join(consumed) + response.read()
+            return feedparser.parse(body).entries, len(body)
+        return entries, sum(len(chunk) for chunk in consumed)
+
+    @staticmethod
+    def parse_feed(body: bytes, fast: bool = False) -> list:
+        """
+        Parse a feed body into entries.
+
+        The fast path streams the body through the pull parser in feed_parser and
+        stops after STREAM_MAX_ITEMS items, keeping only titles and summaries. A
+        body it cannot read is handed to feedparser, which tolerates malformed XML.
 
-        for source_name, url in NEWS_FEEDS:
-            if len(items) >= MAX_HEADLINES:
-                break
+        Args:
+            body: Raw feed document.
+            fast: Try the streaming parser first.
+
+        Returns:
+            Feed entries supporting .get("title"), .get("summary") and .get("description").
+        """
+        if fast:
             try:
-                feed = feedparser.parse(url)
-                for entry in feed.entries:
-                    if len(items) >= MAX_HEADLINES:
-                        break
-                    title = (entry.get("title") or "").strip()
-                    if not title or title in seen_titles:
-                        continue
-                    summary = (entry.get("summary") or entry.get("description") or "").strip()
-                    seen_titles.add(title)
-                    items.append({"title": title, "summary": summary})
-                print(f"Fetched {len(feed.entries)} entries from {source_name}.\n")
-            except Exception as e:
-                print(f"Warning: could not fetch from {source_name}: {e}\n")
-
-        return items
+                return parse_feed(body)
+            except FeedFormatError as e:
+                logger.debug("Streaming parser gave up (%s); falling back to feedparser.", e)
+        return feedparser.parse(body).entries
+
+    @staticmethod
+    def merge_entries(
+        feed_entries: list[list],
+        history: HeadlineIndex | None = None,
+        current_date: datetime.date | None = None,
+    ) -> list[dict]:
+        """
+        Merge per-feed entries in priority order, folding together near-duplicate stories.
+
+        A headline whose MinHash similarity to an earlier one reaches
+        DUPLICATE_THRESHOLD is counted as another source for that story instead
+        of being listed again. With a history index, stories chosen on recent
+        days are moved behind fresh ones before the list is cut to MAX_HEADLINES.
+
+        Args:
+            feed_entries: One list of entries per feed, highest priority first.
+            history: Index of past chosen headlines.
+            current_date: Date being generated, for the history window (defaults to today).
+
+        Returns:
+            List of dicts with "title", "summary" and "sources" keys, up to MAX_HEADLINES.
+        """
+        items: list[dict] = []
+        seen_titles: dict[str, dict] = {}
+        signatures = np.empty((0, NUM_PERMUTATIONS), dtype=np.uint32)
+
+        for entries in feed_entries:
+            counted: set[int] = set()
+            for entry in entries:
+                title = (entry.get("title") or "").strip()
+                if not title:
+                    continue
+                summary = NewsScraper.sanitize_summary(
+                    entry.get("summary") or entry.get("description") or ""
+                )
+
+                match = seen_titles.get(title)
+                signature = None
+                if match is None:
+                    signature = minhash(title)
+                    if len(items):
+                        scores = similarity(signature, signatures)
+                        best = int(scores.argmax())
+                        if scores[best] >= DUPLICATE_THRESHOLD:
+                            match = items[best]
+                if match is not None:
+                    # One feed listing a story twice does not make it better corroborated
+                    if id(match) not in counted:
+                        match["sources"] += 1
+                        counted.add(id(match))
+                    if not match["summary"]:
+                        match["summary"] = summary
+                    continue
+
+                item = {"title": title, "summary": summary, "sources": 1}
+                seen_titles[title] = item
+                counted.add(id(item))
+                items.append(item)
+                signatures = np.vstack([signatures, signature])
+
+        if history is not None and len(history):
+            repeats = [history.is_repeat(item["title"], current_date) for item in items]
+            items = [item for item, repeat in zip(items, repeats, strict=True) if not repeat] + [
+                item for item, repeat in zip(items, repeats, strict=True) if repeat
+            ]
+        return items[:MAX_HEADLINES]
+
+    @staticmethod
+    def sanitize_summary(summary: str, max_chars: int = SUMMARY_MAX_CHARS) -> str:
+        """
+        Reduce an RSS summary to plain ASCII text of bounded length.
+
+        Tags, comments and the contents of script/style elements are dropped,
+        entities are decoded and whitespace is collapsed. Markup is scanned
+        left to right and scanning stops once max_chars of text have been
+        collected, so the cost does not grow with the length of the article body.
+
+        Args:
+            summary: Raw summary or description field
+            max_chars: Characters to keep; longer text is cut at a word and ends in "..."
+
+        Returns:
+            Sanitised summary
+        """
+        if "<" in summary:
+            parts: list[str] = []
+            size = position = 0
+            for match in _MARKUP.finditer(summary):
+                text = summary[position : match.start()]
+                parts.append(text)
+                size += len(text)
+                position = match.end()
+                # Raw text shrinks once whitespace collapses and entities decode
+                if size > 2 * max_chars:
+                    break
+                tag = (match.group(2) or "").lower()
+                if tag in _BREAK_TAGS or match.group(1):
+                    parts.append(" ")
+            else:
+                parts.append(summary[position:])
+            summary = "".join(parts)
+        if "&" in summary:
+            summary = html.unescape(summary)
+
+        text = TextProcessor.enforce_ascii(" ".join(summary.split()))
+        if len(text) <= max_chars:
+            return text
+        cut = text.rfind(" ", 0, max_chars - 2)
+        return text[: cut if cut > 0 else max_chars - 3].rstrip(" ,;:") + "..."
 
     @staticmethod
     def format_for_prompt(headlines: list[dict]) -> str:
@@ -0,0 +1,156 @@
+"""
+ResponseCache - Content-addressed on-disk cache for chat and image API results.
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+from collections.abc import Iterator
+from pathlib import Path
+from typing import BinaryIO
+
+from daily_panda_image.utils.file_manager import FileManager
+
+RESPONSE_CACHE_DIRECTORY = os.path.join("cache", "responses")
+
+# Total size kept on disk; a generated PNG is 1-2 MB, so this holds a few weeks of reruns
+RESPONSE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+
+def cache_key(kind: str, *parts: str) -> str:
+    """
+    Content address for an API call.
+
+    Args:
+        kind: Namespace of the result, e.g. "chat" or "image"
+        *parts: Every input that determines the result
+
+    Returns:
+        Hex SHA-256 digest of the kind and parts
+    """
+    return hashlib.sha256(json.dumps([kind, *parts]).encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Stores API results by content hash, evicting the least recently used beyond max_bytes."""
+
+    def __init__(self, root: Path, max_bytes: int = RESPONSE_CACHE_MAX_BYTES):
+        """
+        Initialize the cache.
+
+        Args:
+            root: Directory holding the cached results
+            max_bytes: Total size limit across all entries
+        """
+        self.root = root
+        self.max_bytes = max_bytes
+
+    @classmethod
+    def load(cls, max_bytes: int = RESPONSE_CACHE_MAX_BYTES) -> "ResponseCache":
+        """
+        Cache under cache/responses in the project root.
+
+        Args:
+            max_bytes: Total size limit across all entries
+
+        Returns:
+            ResponseCache instance
+        """
+        return cls(FileManager.get_project_root() / RESPONSE_CACHE_DIRECTORY, max_bytes)
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / key
+
+    def get(self, key: str) -> bytes | None:
+        """
+        Look up a cached result and mark it as recently used.
+
+        Args:
+            key: Content address from cache_key
+
+        Returns:
+            Cached bytes or None on a miss
+        """
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return data
+
+    def path_for(self, key: str) -> Path | None:
+        """
+        Locate a cached result without reading it, and mark it as recently used.
+
+        Args:
+            key: Content address from cache_key
+
+        Returns:
+            Path of the cached file or None on a miss
+        """
+        path = self._path(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def put(self, key: str, data: bytes) -> None:
+        """
+        Store a result atomically, then evict old entries if over the size limit.
+
+        Args:
+            key: Content address from cache_key
+            data: Result bytes
+        """
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        FileManager.atomic_write(path, data)
+        self.evict()
+
+    @contextlib.contextmanager
+    def writer(self, key: str) -> Iterator[BinaryIO]:
+        """
+        Stream a result into the cache; it is stored only if the block completes.
+
+        Args:
+            key: Content address from cache_key
+
+        Yields:
+            Binary file to write the result to
+        """
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with FileManager.atomic_writer(path) as f:
+            yield f
+        self.evict()
+
+    def get_text(self, key: str) -> str | None:
+        """Text variant of get."""
+        data = self.get(key)
+        return data.decode("utf-8") if data is not None else None
+
+    def put_text(self, key: str, text: str) -> None:
+        """Text variant of put."""
+        self.put(key, text.encode("utf-8"))
+
+    def evict(self) -> None:
+        """Delete least recently used entries until the cache fits in max_bytes."""
+        entries = []
+        for path in self.root.glob("*/*"):
+            if path.name.startswith("."):
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
@@ -0,0 +1,111 @@
+"""
+Schedule - Five-field cron expressions, evaluated in UTC like GitHub Actions schedules.
+"""
+
+import datetime
+
+# (name, lowest value, highest value) of each cron field, in order
+CRON_FIELDS = (
+    ("minute", 0, 59),
+    ("hour", 0, 23),
+    ("day of month", 1, 31),
+    ("month", 1, 12),
+    ("day of week", 0, 6),
+)
+
+# Days searched for the next match; every valid expression matches within four years
+SEARCH_DAYS = 4 * 366
+
+
+def _parse_field(text: str, name: str, low: int, high: int) -> frozenset[int]:
+    values = set()
+    for part in text.split(","):
+        base, _, step_text = part.partition("/")
+        step = int(step_text) if step_text else 1
+        if base == "*":
+            start, end = low, high
+        elif "-" in base:
+            start, end = (int(value) for value in base.split("-", 1))
+        else:
+            start = int(base)
+            end = high if step_text else start
+        if name == "day of week" and end == 7:
+            # cron allows 7 for Sunday as well as 0
+            values.add(0)
+            if start == 7:
+                continue
+            end = 6
+        if step < 1 or not low <= start <= end <= high:
+            raise ValueError(f"Invalid {name} field in cron expression: {text!r}")
+        values.update(range(start, end + 1, step))
+    return frozenset(values)
+
+
+class CronSchedule:
+    """A cron expression such as "0 4 * * *" (minute hour day-of-month month day-of-week)."""
+
+    def __init__(self, expression: str):
+        """
+        Parse the expression.
+
+        Supports "*", numbers, ranges ("1-5"), lists ("0,30") and steps ("*/15").
+
+        Args:
+            expression: Five whitespace-separated fields
+
+        Raises:
+            ValueError: If the expression is malformed
+        """
+        fields = expression.split()
+        if len(fields) != len(CRON_FIELDS):
+            raise ValueError(f"Cron expression needs 5 fields: {expression!r}")
+        self.expression = expression
+        self.minutes, self.hours, self.days, self.months, self.weekdays = (
+            _parse_field(text, *spec) for text, spec in zip(fields, CRON_FIELDS, strict=True)
+        )
+        # As in cron, a restricted day of month and day of week match when either does
+        self._any_day = fields[2] == "*"
+        self._any_weekday = fields[4] == "*"
+
+    def __repr__(self) -> str:
+        return f"CronSchedule({self.expression!r})"
+
+    def matches_day(self, day: datetime.date) -> bool:
+        """Whether the schedule fires at some time on a date."""
+        if day.month not in self.months:
+            return False
+        in_month = day.day in self.days
+        in_week = (day.isoweekday() % 7) in self.weekdays
+        if self._any_day or self._any_weekday:
+            return in_month and in_week
+        return in_month or in_week
+
+    def next_after(self, moment: datetime.datetime) -> datetime.datetime:
+        """
+        First scheduled time strictly after a moment.
+
+        Args:
+            moment: Aware datetime (naive values are taken as UTC)
+
+        Returns:
+            Aware UTC datetime of the next run
+
+        Raises:
+            ValueError: If the expression never matches (e.g. February 30th)
+        """
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=datetime.UTC)
+        start = moment.astimezone(datetime.UTC).replace(second=0, microsecond=0)
+        start += datetime.timedelta(minutes=1)
+        for offset in range(SEARCH_DAYS):
+            day = start.date() + datetime.timedelta(days=offset)
+            if not self.matches_day(day):
+                continue
+            for hour in sorted(self.hours):
+                for minute in sorted(self.minutes):
+                    candidate = datetime.datetime.combine(
+                        day, datetime.time(hour, minute), datetime.UTC
+                    )
+                    if candidate >= start:
+                        return candidate
+        raise ValueError(f"Cron expression never matches: {self.expression!r}")
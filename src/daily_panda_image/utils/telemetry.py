@@ -0,0 +1,240 @@
+"""
+Telemetry - Timed spans, structured JSON logs and a Prometheus textfile export.
+
+Code under measurement wraps each step in a span:
+
+    with span("image.generate", model="gpt-image-1-mini") as s:
+        response = client.images.generate(...)
+        s.set(bytes=len(image_bytes))
+
+Each finished span is logged at DEBUG level with its duration, parent and
+attributes, and folded into the process-wide REGISTRY, which renders per-span
+totals in the Prometheus text exposition format for node_exporter's textfile
+collector.
+"""
+
+import contextvars
+import datetime
+import json
+import logging
+import sys
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any
+
+# Logger every module in the package logs under
+LOGGER_NAME = "daily_panda_image"
+
+# Prefix of every exported metric name
+METRIC_PREFIX = "daily_panda"
+
+# Numeric span attributes summed into counters (e.g. daily_panda_span_bytes_total)
+COUNTED_ATTRIBUTES = (
+    "bytes",
+    "entries",
+    "prompt_tokens",
+    "completion_tokens",
+    "input_tokens",
+    "output_tokens",
+)
+
+# Token counters read from an API response's usage object, when present
+USAGE_FIELDS = ("prompt_tokens", "completion_tokens", "input_tokens", "output_tokens")
+
+logger = logging.getLogger(__name__)
+
+_current_span: contextvars.ContextVar["Span | None"] = contextvars.ContextVar(
+    "current_span", default=None
+)
+
+
+@dataclass
+class Span:
+    """One timed step and the attributes recorded while it ran."""
+
+    name: str
+    attributes: dict[str, Any] = field(default_factory=dict)
+    parent: str | None = None
+    seconds: float = 0.0
+    error: str | None = None
+
+    def set(self, **attributes: Any) -> None:
+        """Record attributes, e.g. byte counts, on the span."""
+        self.attributes.update(attributes)
+
+    def record_usage(self, response: Any) -> None:
+        """
+        Copy token usage from an API response onto the span.
+
+        Args:
+            response: Chat or image response with an optional usage object
+        """
+        usage = getattr(response, "usage", None)
+        for name in USAGE_FIELDS:
+            value = getattr(usage, name, None)
+            if isinstance(value, int):
+                self.attributes[name] = value
+
+    def as_fields(self) -> dict[str, Any]:
+        """Flat fields for a structured log record."""
+        fields = {"span": self.name, "duration_ms": round(self.seconds * 1000, 1)}
+        if self.parent:
+            fields["parent"] = self.parent
+        if self.error:
+            fields["error"] = self.error
+        return {**fields, **self.attributes}
+
+
+@dataclass
+class SpanStats:
+    """Running totals of every finished span with the same name."""
+
+    count: int = 0
+    errors: int = 0
+    seconds: float = 0.0
+    max_seconds: float = 0.0
+    totals: dict[str, float] = field(default_factory=dict)
+
+
+class SpanRegistry:
+    """Aggregates finished spans by name; shared by every thread of the process."""
+
+    def __init__(self):
+        self.stats: dict[str, SpanStats] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, finished: Span) -> None:
+        """
+        Fold a finished span into the totals.
+
+        Args:
+            finished: Span whose duration has been measured
+        """
+        with self._lock:
+            stats = self.stats.setdefault(finished.name, SpanStats())
+            stats.count += 1
+            stats.errors += finished.error is not None
+            stats.seconds += finished.seconds
+            stats.max_seconds = max(stats.max_seconds, finished.seconds)
+            for name in COUNTED_ATTRIBUTES:
+                value = finished.attributes.get(name)
+                if isinstance(value, int | float):
+                    stats.totals[name] = stats.totals.get(name, 0) + value
+
+    def reset(self) -> None:
+        """Forget every recorded span."""
+        with self._lock:
+            self.stats.clear()
+
+    def render_prometheus(self) -> str:
+        """
+        Render the totals in the Prometheus text exposition format.
+
+        Returns:
+            Metric families with one sample per span name
+        """
+        with self._lock:
+            stats = dict(sorted(self.stats.items()))
+        seconds = f"{METRIC_PREFIX}_span_seconds"
+        lines = [
+            f"# HELP {seconds} Seconds spent in each span.",
+            f"# TYPE {seconds} summary",
+        ]
+        for name, entry in stats.items():
+            lines.append(f'{seconds}_sum{{span="{name}"}} {entry.seconds:g}')
+            lines.append(f'{seconds}_count{{span="{name}"}} {entry.count:g}')
+        families = [
+            ("span_errors_total", "counter", "Spans that raised.", "errors"),
+            ("span_seconds_max", "gauge", "Longest single span, in seconds.", "max_seconds"),
+        ]
+        for suffix, kind, help_text, attribute in families:
+            lines.append(f"# HELP {METRIC_PREFIX}_{suffix} {help_text}")
+            lines.append(f"# TYPE {METRIC_PREFIX}_{suffix} {kind}")
+            for name, entry in stats.items():
+                value = getattr(entry, attribute)
+                lines.append(f'{METRIC_PREFIX}_{suffix}{{span="{name}"}} {value:g}')
+        for counted in COUNTED_ATTRIBUTES:
+            samples = [
+                (name, entry.totals[counted])
+                for name, entry in stats.items()
+                if counted in entry.totals
+            ]
+            if not samples:
+                continue
+            metric = f"{METRIC_PREFIX}_span_{counted}_total"
+            lines.append(f"# HELP {metric} Sum of the {counted} attribute over finished spans.")
+            lines.append(f"# TYPE {metric} counter")
+            lines.extend(f'{metric}{{span="{name}"}} {value:g}' for name, value in samples)
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide registry every span reports to
+REGISTRY = SpanRegistry()
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Span]:
+    """
+    Time a block of code as a named span.
+
+    Spans opened inside the block, in the same thread or task, record this
+    span as their parent. An exception is recorded on the span and re-raised.
+
+    Args:
+        name: Dotted span name, e.g. "feed.fetch"
+        **attributes: Initial attributes, e.g. the model or source name
+
+    Yields:
+        The span, for recording attributes known only after the work is done
+    """
+    parent = _current_span.get()
+    current = Span(name, dict(attributes), parent.name if parent else None)
+    token = _current_span.set(current)
+    started = time.perf_counter()
+    try:
+        yield current
+    except BaseException as e:
+        current.error = type(e).__name__
+        raise
+    finally:
+        current.seconds = time.perf_counter() - started
+        _current_span.reset(token)
+        REGISTRY.observe(current)
+        logger.debug(
+            "%s finished in %.3fs", name, current.seconds, extra={"fields": current.as_fields()}
+        )
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats each record as one JSON object per line, including span fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.datetime.fromtimestamp(record.created, datetime.UTC).isoformat(),
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "message": record.getMessage(),
+            **getattr(record, "fields", {}),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+def configure_logging(level: str = "INFO", json_logs: bool = False) -> None:
+    """
+    Send the package's log records to stdout.
+
+    Args:
+        level: Minimum level name; DEBUG adds span timings and intermediate prompts
+        json_logs: Emit one JSON object per line instead of plain messages
+    """
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(JsonFormatter() if json_logs else logging.Formatter("%(message)s"))
+    package_logger = logging.getLogger(LOGGER_NAME)
+    package_logger.handlers[:] = [handler]
+    package_logger.setLevel(level.upper())
+    package_logger.propagate = False
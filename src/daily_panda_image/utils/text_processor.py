@@ -1,4 +1,37 @@
+import codecs
 import re
+import unicodedata
+from functools import lru_cache
+
+# Rough BPE token: a word or a single punctuation mark
+_TOKEN = re.compile(r"\w+|[^\w\s]")
+
+# Codec error handler that lets str.encode("ascii") transliterate instead of failing
+ASCII_ERROR_HANDLER = "daily_panda_ascii"
+
+
+def _transliterate(char: str) -> str:
+    """Best-effort ASCII form of a character: its NFKD decomposition minus non-ASCII marks."""
+    decomposed = unicodedata.normalize("NFKD", char).translate(TextProcessor.ASCII_TABLE)
+    return decomposed.encode("ascii", "ignore").decode("ascii")
+
+
+@lru_cache(maxsize=4096)
+def _ascii_run(run: str) -> str:
+    """ASCII form of a run of consecutive non-ASCII characters."""
+    translated = run.translate(TextProcessor.ASCII_TABLE)
+    if translated.isascii():
+        return translated
+    return "".join(_transliterate(char) for char in translated)
+
+
+def _ascii_error_handler(error: UnicodeError) -> tuple[str, int]:
+    if not isinstance(error, UnicodeEncodeError):
+        raise error
+    return _ascii_run(error.object[error.start : error.end]), error.end
+
+
+codecs.register_error(ASCII_ERROR_HANDLER, _ascii_error_handler)
 
 
 class TextProcessor:
@@ -62,6 +95,15 @@ class TextProcessor:
         "ý": "y",
         "ÿ": "y",
         "ß": "ss",
+        # Letters without a Unicode decomposition
+        "ł": "l",
+        "Ł": "L",
+        "đ": "d",
+        "Đ": "D",
+        "ı": "i",
+        "Ø": "O",
+        "Æ": "AE",
+        "Œ": "OE",
         # Currency and math symbols
         "€": "EUR",
         "£": "GBP",
@@ -76,6 +118,7 @@ class TextProcessor:
         "±": "+/-",
         "×": "x",
         "÷": "/",
+        "⁄": "/",
         # Bullets and miscellaneous
         "•": "*",
         "●": "*",
@@ -88,24 +131,33 @@ class TextProcessor:
         "↓": "v",
     }
 
+    # Translation table compiled from ASCII_REPLACEMENTS
+    ASCII_TABLE = str.maketrans(ASCII_REPLACEMENTS)
+
+    # ASCII characters that are still rewritten (the encoder never flags them)
+    ASCII_SOURCE_REPLACEMENTS = tuple((k, v) for k, v in ASCII_REPLACEMENTS.items() if k.isascii())
+
     @classmethod
     def enforce_ascii(cls, text: str) -> str:
         """
         Clean text to ensure ASCII compatibility.
 
+        The text is scanned once by the C ASCII encoder; each run of non-ASCII
+        characters it hits goes through ASCII_TABLE and, for characters the
+        table does not cover, NFKD transliteration (so "É" becomes "E" and "ﬁ"
+        becomes "fi"). Characters without an ASCII decomposition are removed.
+        Converted runs are memoised, as headlines repeat the same few symbols.
+
         Args:
             text: Input text that may contain non-ASCII characters
 
         Returns:
             ASCII-compatible version of the input text
         """
-        # Replace common problematic characters
-        for old, new in cls.ASCII_REPLACEMENTS.items():
+        if not text.isascii():
+            text = text.encode("ascii", ASCII_ERROR_HANDLER).decode("ascii")
+        for old, new in cls.ASCII_SOURCE_REPLACEMENTS:
             text = text.replace(old, new)
-
-        # Remove any remaining non-ASCII characters
-        text = re.sub(r"[^\x00-\x7F]+", "", text)
-
         return text
 
     @staticmethod
@@ -130,3 +182,35 @@ class TextProcessor:
             else:
                 return ""
         return text
+
+    @staticmethod
+    def extract_headline(prompt: str) -> str | None:
+        """
+        Headline summary from the "[Headline summary, Location]" line a prompt starts with.
+
+        Args:
+            prompt: Final image prompt
+
+        Returns:
+            Text between the leading brackets, or None if the prompt has no such line
+        """
+        first_line = prompt.lstrip().split("\n", 1)[0].strip()
+        if first_line.startswith("[") and first_line.endswith("]"):
+            return first_line[1:-1].strip() or None
+        return None
+
+    @staticmethod
+    def estimate_tokens(text: str) -> int:
+        """
+        Estimate the number of model tokens in a text without a tokenizer.
+
+        Counts words and punctuation marks, which tracks BPE token counts for
+        English news text closely enough to compare prompt sizes.
+
+        Args:
+            text: Text to measure
+
+        Returns:
+            Estimated token count
+        """
+        return len(_TOKEN.findall(text))
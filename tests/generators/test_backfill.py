@@ -0,0 +1,217 @@
+import datetime
+import os
+import sys
+import threading
+import time
+import unittest
+from unittest.mock import ANY, MagicMock, call, patch
+
+import httpx
+from openai import RateLimitError
+
+# Add the src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from daily_panda_image.generators.backfill import BackfillRunner, date_range
+from daily_panda_image.generators.resilience import Resilience
+
+HEADLINES = [{"title": "Panda cub born", "summary": "Keepers cheer."}]
+
+
+def rate_limit_error(retry_after="7"):
+    request = httpx.Request("POST", "https://api.openai.com/v1/images/generations")
+    response = httpx.Response(429, headers={"retry-after": retry_after}, request=request)
+    return RateLimitError("Too many requests", response=response, body=None)
+
+
+@patch("daily_panda_image.generators.backfill.FeedCache", MagicMock())
+@patch("daily_panda_image.generators.backfill.HeadlineIndex", MagicMock())
+@patch("daily_panda_image.generators.backfill.NewsScraper")
+@patch("daily_panda_image.generators.backfill.ArchiveManifest")
+class TestBackfillRunner(unittest.TestCase):
+    def setUp(self):
+        self.generator = MagicMock()
+        self.generator.post_processor = None
+        self.generator.image_index = None
+        self.generator.variants = 1
+        self.generator.prompt_generator.generate_prompt.side_effect = (
+            lambda day, headlines: f"prompt {day}"
+        )
+        self.generator.image_generator.generate_image.side_effect = lambda prompt: b"png"
+        self.generator.resilience = Resilience()
+        file_manager = patch("daily_panda_image.generators.backfill.FileManager")
+        self.file_manager = file_manager.start()
+        self.file_manager.has_output.return_value = False
+        self.addCleanup(file_manager.stop)
+
+    def test_date_range_is_inclusive(self, mock_manifest, mock_scraper):
+        days = date_range(datetime.date(2026, 5, 30), datetime.date(2026, 6, 2))
+        self.assertEqual(len(days), 4)
+        self.assertEqual(days[-1], datetime.date(2026, 6, 2))
+
+    def test_skips_dates_already_generated(self, mock_manifest, mock_scraper):
+        done = {datetime.date(2026, 6, 9), datetime.date(2026, 6, 11)}
+        mock_manifest.load.return_value.has_output.side_effect = lambda day: day in done
+        mock_scraper.fetch_headlines.return_value = HEADLINES
+
+        runner = BackfillRunner(self.generator, max_workers=2)
+        report = runner.run(datetime.date(2026, 6, 9), datetime.date(2026, 6, 11))
+
+        day = datetime.date(2026, 6, 10)
+        self.generator.prompt_generator.generate_prompt.assert_called_once_with(day, HEADLINES)
+        self.generator.save_outputs.assert_called_once_with(
+            day,
+            "prompt 2026-06-10",
+            b"png",
+            update_current=False,
+            derivatives=None,
+            variants=None,
+            timings=ANY,
+            source_headline=None,
+        )
+        timings = self.generator.save_outputs.call_args.kwargs["timings"]
+        self.assertEqual(set(timings), {"prompt", "image"})
+        self.assertEqual(report.generated, [day])
+        self.assertEqual(sorted(report.skipped), sorted(done))
+        mock_scraper.fetch_headlines.assert_called_once()
+
+    def test_skips_dates_whose_files_exist_without_a_record(self, mock_manifest, mock_scraper):
+        done = {datetime.date(2026, 6, 9), datetime.date(2026, 6, 11)}
+        mock_manifest.load.return_value.has_output.return_value = False
+        self.file_manager.has_output.side_effect = lambda day: day in done
+        mock_scraper.fetch_headlines.return_value = HEADLINES
+
+        runner = BackfillRunner(self.generator, max_workers=2)
+        report = runner.run(datetime.date(2026, 6, 9), datetime.date(2026, 6, 11))
+
+        self.assertEqual(report.generated, [datetime.date(2026, 6, 10)])
+        self.assertEqual(sorted(report.skipped), sorted(done))
+
+    def test_variants_keep_the_best_and_archive_the_rest(self, mock_manifest, mock_scraper):
+        mock_manifest.load.return_value.has_output.return_value = False
+        self.generator.variants = 3
+        self.generator.image_generator.generate_best.side_effect = lambda prompt, n: (
+            b"best",
+            [b"loser"] * (n - 1),
+        )
+
+        day = datetime.date(2026, 6, 10)
+        BackfillRunner(self.generator).run(day, day)
+
+        self.generator.image_generator.generate_image.assert_not_called()
+        args = self.generator.save_outputs.call_args
+        self.assertEqual(args.args[2], b"best")
+        self.assertEqual(args.kwargs["variants"], [b"loser", b"loser"])
+
+    def test_nothing_pending_skips_fetch(self, mock_manifest, mock_scraper):
+        mock_manifest.load.return_value.has_output.return_value = True
+        report = BackfillRunner(self.generator).run(
+            datetime.date(2026, 6, 1), datetime.date(2026, 6, 2)
+        )
+        mock_scraper.fetch_headlines.assert_not_called()
+        self.assertEqual(len(report.skipped), 2)
+
+    def test_image_concurrency_is_bounded(self, mock_manifest, mock_scraper):
+        mock_manifest.load.return_value.has_output.return_value = False
+        active, peak, lock = [0], [0], threading.Lock()
+
+        def generate_image(prompt):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.05)
+            with lock:
+                active[0] -= 1
+            return b"png"
+
+        self.generator.image_generator.generate_image.side_effect = generate_image
+        runner = BackfillRunner(self.generator, max_workers=3, prompt_workers=2)
+        report = runner.run(datetime.date(2026, 6, 1), datetime.date(2026, 6, 10))
+
+        self.assertEqual(len(report.generated), 10)
+        self.assertEqual(peak[0], 3)
+        self.assertEqual(report.metrics["image"].items, 10)
+        self.assertEqual(report.metrics["save"].items, 10)
+
+    def test_image_generation_overlaps_next_prompt(self, mock_manifest, mock_scraper):
+        mock_manifest.load.return_value.has_output.return_value = False
+
+        def slow(result):
+            def func(*args):
+                time.sleep(0.1)
+                return result
+
+            return func
+
+        self.generator.prompt_generator.generate_prompt.side_effect = slow("prompt")
+        self.generator.image_generator.generate_image.side_effect = slow(b"png")
+
+        started = time.monotonic()
+        report = BackfillRunner(self.generator, max_workers=1).run(
+            datetime.date(2026, 6, 1), datetime.date(2026, 6, 4)
+        )
+        elapsed = time.monotonic() - started
+
+        self.assertEqual(len(report.generated), 4)
+        self.assertLess(elapsed, 0.7)  # strictly sequential would take 0.8s
+
+    def test_rate_limits_apply_only_during_the_run(self, mock_manifest, mock_scraper):
+        mock_manifest.load.return_value.has_output.return_value = False
+        resilience = self.generator.resilience
+        resilience.limit("chat", 60)
+        daily_limit = resilience.buckets["chat"]
+        during = {}
+
+        def generate_image(prompt):
+            during.update(resilience.buckets)
+            return b"png"
+
+        self.generator.image_generator.generate_image.side_effect = generate_image
+        BackfillRunner(self.generator, max_workers=2, images_per_minute=3).run(
+            datetime.date(2026, 6, 1), datetime.date(2026, 6, 1)
+        )
+
+        self.assertEqual(during["image"].rate, 3 / 60)
+        self.assertIsNot(during["chat"], daily_limit)
+        self.assertEqual(resilience.buckets, {"chat": daily_limit})
+
+    def test_rate_limit_errors_are_left_to_the_resilience_layer(self, mock_manifest, mock_scraper):
+        mock_manifest.load.return_value.has_output.return_value = False
+        self.generator.image_generator.generate_image.side_effect = rate_limit_error()
+
+        report = BackfillRunner(self.generator, max_workers=1).run(
+            datetime.date(2026, 6, 1), datetime.date(2026, 6, 1)
+        )
+        self.assertEqual(self.generator.image_generator.generate_image.call_count, 1)
+        self.assertIn(datetime.date(2026, 6, 1), report.failed)
+        self.generator.save_outputs.assert_not_called()
+
+    def test_other_errors_fail_without_retry(self, mock_manifest, mock_scraper):
+        mock_manifest.load.return_value.has_output.return_value = False
+        self.generator.image_generator.generate_image.side_effect = [
+            ValueError("No image data"),
+            b"png",
+        ]
+
+        report = BackfillRunner(self.generator, max_workers=1).run(
+            datetime.date(2026, 6, 1), datetime.date(2026, 6, 2)
+        )
+        self.assertEqual(report.failed, {datetime.date(2026, 6, 1): "No image data"})
+        self.assertEqual(report.generated, [datetime.date(2026, 6, 2)])
+        self.assertEqual(
+            self.generator.save_outputs.call_args,
+            call(
+                datetime.date(2026, 6, 2),
+                "prompt 2026-06-02",
+                b"png",
+                update_current=False,
+                derivatives=None,
+                variants=None,
+                timings=ANY,
+                source_headline=None,
+            ),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
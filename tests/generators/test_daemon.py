@@ -0,0 +1,143 @@
+import datetime
+import json
+import os
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+# Add the src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from daily_panda_image.generators.daemon import (
+    HEARTBEAT_SECONDS,
+    RETRY_DELAY,
+    PandaDaemon,
+    read_status,
+)
+from daily_panda_image.utils.file_manager import FileManager
+from daily_panda_image.utils.schedule import CronSchedule
+
+HEADLINES = [{"title": "Panda cub born", "summary": "Keepers cheer at the zoo."}]
+PUBLISH_AT = datetime.datetime(2026, 6, 1, 4, 0, tzinfo=datetime.UTC)
+
+
+class FakeClock:
+    """Aware UTC clock that only moves when the daemon sleeps."""
+
+    def __init__(self, start: datetime.datetime):
+        self.current = start
+        self.sleeps: list[float] = []
+
+    def now(self) -> datetime.datetime:
+        return self.current
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.current += datetime.timedelta(seconds=seconds)
+
+
+@pytest.fixture
+def project_root(tmp_path):
+    with patch.object(FileManager, "get_project_root", return_value=tmp_path):
+        yield tmp_path
+
+
+def make_daemon(clock: FakeClock, prefetch=None) -> tuple[PandaDaemon, MagicMock]:
+    generator = MagicMock()
+    daemon = PandaDaemon(
+        generator,
+        CronSchedule("0 4 * * *"),
+        now=clock.now,
+        sleep=clock.sleep,
+        prefetch=prefetch or MagicMock(return_value=HEADLINES),
+    )
+    return daemon, generator
+
+
+def test_prefetches_warms_up_and_publishes_on_time(project_root):
+    clock = FakeClock(datetime.datetime(2026, 6, 1, 1, 0, tzinfo=datetime.UTC))
+    events = []
+    prefetch = MagicMock(
+        side_effect=lambda day: events.append(("prefetch", clock.now())) or HEADLINES
+    )
+    daemon, generator = make_daemon(clock, prefetch)
+    generator.client.models.list.side_effect = lambda: events.append(("warmup", clock.now()))
+    generator.generate_daily_panda.side_effect = lambda *args: events.append(
+        ("publish", clock.now())
+    )
+
+    daemon.run(max_runs=1)
+
+    assert events == [
+        ("prefetch", datetime.datetime(2026, 6, 1, 3, 50, tzinfo=datetime.UTC)),
+        ("warmup", datetime.datetime(2026, 6, 1, 3, 59, 30, tzinfo=datetime.UTC)),
+        ("publish", PUBLISH_AT),
+    ]
+    generator.generate_daily_panda.assert_called_once_with(PUBLISH_AT.date(), HEADLINES)
+    assert max(clock.sleeps) <= HEARTBEAT_SECONDS
+
+    status = json.loads((project_root / "cache" / "daemon_status.json").read_text())
+    assert status["state"] == "stopped"
+    assert status["publishes"] == 1
+    assert status["prefetched_headlines"] == 1
+    assert status["last_publish"]["date"] == "2026-06-01"
+
+
+def test_failed_prefetch_fetches_at_publish_time(project_root):
+    clock = FakeClock(datetime.datetime(2026, 6, 1, 3, 55, tzinfo=datetime.UTC))
+    daemon, generator = make_daemon(clock, MagicMock(side_effect=OSError("feeds down")))
+    generator.client.models.list.side_effect = RuntimeError("no network")
+
+    daemon.run(max_runs=1)
+
+    generator.generate_daily_panda.assert_called_once_with(PUBLISH_AT.date(), None)
+
+
+def test_failed_publish_is_retried(project_root):
+    clock = FakeClock(datetime.datetime(2026, 6, 1, 3, 59, tzinfo=datetime.UTC))
+    daemon, generator = make_daemon(clock)
+    calls = []
+
+    def generate(*args):
+        calls.append(clock.now())
+        if len(calls) == 1:
+            raise RuntimeError("API down")
+
+    generator.generate_daily_panda.side_effect = generate
+
+    daemon.run(max_runs=1)
+
+    assert calls == [PUBLISH_AT, PUBLISH_AT + RETRY_DELAY]
+    assert (daemon.status["publishes"], daemon.status["failures"]) == (1, 1)
+
+
+def test_existing_output_is_not_regenerated(project_root):
+    clock = FakeClock(datetime.datetime(2026, 6, 1, 3, 0, tzinfo=datetime.UTC))
+    daemon, generator = make_daemon(clock)
+    with patch.object(FileManager, "has_output", return_value=True):
+        daemon.run(max_runs=1)
+    generator.generate_daily_panda.assert_not_called()
+    assert clock.now() == PUBLISH_AT
+
+
+def test_stop_interrupts_the_wait(project_root):
+    clock = FakeClock(datetime.datetime(2026, 6, 1, 1, 0, tzinfo=datetime.UTC))
+    daemon, generator = make_daemon(clock)
+    daemon.sleep = lambda seconds: daemon.stop()
+
+    daemon.run()
+
+    generator.generate_daily_panda.assert_not_called()
+    assert read_status(daemon.status_file, clock.now())["healthy"] is False
+
+
+def test_status_goes_stale_without_heartbeat(project_root):
+    clock = FakeClock(datetime.datetime(2026, 6, 1, 1, 0, tzinfo=datetime.UTC))
+    daemon, _ = make_daemon(clock)
+    daemon._write_status("waiting")
+
+    assert read_status(daemon.status_file, clock.now())["healthy"] is True
+    later = clock.now() + datetime.timedelta(minutes=10)
+    assert read_status(daemon.status_file, later)["healthy"] is False
+    assert read_status(project_root / "missing.json") == {"healthy": False}
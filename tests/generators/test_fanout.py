@@ -0,0 +1,106 @@
+import datetime
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from daily_panda_image.channels import Channel
+from daily_panda_image.generators.fanout import ChannelFanout
+from daily_panda_image.generators.openai_clients import create_async_client, create_client
+from daily_panda_image.utils.file_manager import FileManager
+from tests.generators.test_openai_clients import chat_completion, image_generation
+from tests.stub_server import StubResponse, StubServer
+from tests.utils.test_news_scraper import rss
+
+DAY = datetime.date(2026, 6, 1)
+
+
+@pytest.fixture
+def server(tmp_path):
+    with FileManager.output_root(tmp_path), StubServer() as stub:
+        stub.add("/v1/chat/completions", chat_completion("[Cub born, Chengdu]\nA bear at a zoo."))
+        stub.add("/v1/images/generations", image_generation())
+        stub.add("/shared", StubResponse(rss("Zoo opens")))
+        stub.add("/world", StubResponse(rss("Bamboo shortage")))
+        stub.add("/science", StubResponse(rss("Panda cub born")))
+        yield stub
+
+
+def make_fanout(server, channels):
+    return ChannelFanout(
+        channels,
+        create_client("test-key", server.url("/v1")),
+        create_async_client("test-key", server.url("/v1")),
+    )
+
+
+def channels(server) -> list[Channel]:
+    return [
+        Channel(
+            name="panda",
+            feeds=(("Shared", server.url("/shared")), ("World", server.url("/world"))),
+            output_root=Path("panda"),
+        ),
+        Channel(
+            name="red-panda",
+            feeds=(("Shared", server.url("/shared")), ("Science", server.url("/science"))),
+            subject="red panda",
+            system_prompt="You write watercolour red panda scenes.",
+            image_model="gpt-image-1",
+            image_size="1536x1024",
+            output_root=Path("red-panda"),
+        ),
+    ]
+
+
+def requests_to(server, path: str) -> list[dict]:
+    return [json.loads(r.body) for r in server.requests if r.path == path]
+
+
+def test_each_feed_is_fetched_once_and_merged_per_channel(server):
+    headlines = make_fanout(server, channels(server)).fetch_headlines(DAY)
+
+    assert sorted(r.path for r in server.requests) == ["/science", "/shared", "/world"]
+    assert {h["title"] for h in headlines["panda"]} == {"Zoo opens", "Bamboo shortage"}
+    assert {h["title"] for h in headlines["red-panda"]} == {"Zoo opens", "Panda cub born"}
+
+
+def test_channels_generate_into_their_own_roots(server, tmp_path):
+    outcomes = make_fanout(server, channels(server)).run(DAY)
+
+    assert outcomes == {"panda": None, "red-panda": None}
+    for root in ("panda", "red-panda"):
+        assert (tmp_path / root / "images" / "panda_2026-06-01.png").exists()
+        assert (tmp_path / root / "prompts" / "prompt_2026-06-01.txt").exists()
+    assert not (tmp_path / "images").exists()
+    manifest = (tmp_path / "red-panda" / "archive" / "manifest.jsonl").read_text()
+    records = [json.loads(line) for line in manifest.splitlines()]
+    assert [r["source_headline"] for r in records if "source_headline" in r] == ["Panda cub born"]
+
+    chats = {r["messages"][0]["content"]: r for r in requests_to(server, "/v1/chat/completions")}
+    red_panda = chats["You write watercolour red panda scenes."]
+    assert "featuring a red panda" in red_panda["messages"][1]["content"]
+    images = sorted(requests_to(server, "/v1/images/generations"), key=lambda r: r["size"])
+    assert [(r["model"], r["size"]) for r in images] == [
+        ("gpt-image-1-mini", "1024x1024"),
+        ("gpt-image-1", "1536x1024"),
+    ]
+
+
+def test_a_failing_channel_does_not_stop_the_others(server):
+    server.add("/v1/images/generations", [StubResponse(b"{}", 400), image_generation()])
+
+    outcomes = make_fanout(server, channels(server)).run(DAY)
+
+    assert sum(error is not None for error in outcomes.values()) == 1
+
+
+def test_rejects_channels_sharing_an_output_root(server):
+    twins = [Channel(name="a", output_root=Path("x")), Channel(name="b", output_root=Path("x"))]
+    with pytest.raises(ValueError):
+        make_fanout(server, twins)
@@ -1,14 +1,21 @@
+import asyncio
 import base64
 import datetime
+import io
 import os
 import sys
+import tempfile
 import unittest
-from unittest.mock import MagicMock, patch
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
 
 # Add the src directory to Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
 
 from daily_panda_image.generators.image_generator import ImageGenerator, PandaImageGenerator
+from daily_panda_image.utils.image_post_processor import ProcessedImage
+from daily_panda_image.utils.response_cache import ResponseCache
+from daily_panda_image.utils.telemetry import REGISTRY
 
 
 class TestImageGenerator(unittest.TestCase):
@@ -37,6 +44,79 @@ class TestImageGenerator(unittest.TestCase):
         with self.assertRaises(ValueError):
             self.generator.generate_image("prompt")
 
+    def test_generate_image_reuses_cached_result(self):
+        mock_cache = MagicMock()
+        mock_cache.get.side_effect = [None, b"testimage"]
+        mock_response = MagicMock()
+        mock_response.data = [MagicMock(b64_json=base64.b64encode(b"testimage").decode())]
+        self.mock_client.images.generate.return_value = mock_response
+        generator = ImageGenerator(self.mock_client, cache=mock_cache)
+
+        self.assertEqual(generator.generate_image("A panda"), b"testimage")
+        self.assertEqual(generator.generate_image("A panda"), b"testimage")
+
+        self.mock_client.images.generate.assert_called_once()
+        key = mock_cache.put.call_args.args[0]
+        self.assertEqual(mock_cache.get.call_args.args[0], key)
+        self.assertNotEqual(ImageGenerator.request_key(ImageGenerator.build_request("B")), key)
+
+    @patch("daily_panda_image.generators.image_generator.pick_best")
+    def test_generate_best_requests_variants_in_one_call(self, mock_pick_best):
+        mock_pick_best.return_value = (1, [MagicMock(), MagicMock(), MagicMock()])
+        mock_response = MagicMock()
+        mock_response.data = [
+            MagicMock(b64_json=base64.b64encode(data).decode()) for data in (b"a", b"b", b"c")
+        ]
+        self.mock_client.images.generate.return_value = mock_response
+        mock_cache = MagicMock()
+        mock_cache.get.return_value = None
+        generator = ImageGenerator(self.mock_client, cache=mock_cache)
+
+        winner, losers = generator.generate_best("A panda", 3)
+
+        self.assertEqual((winner, losers), (b"b", [b"a", b"c"]))
+        self.mock_client.images.generate.assert_called_once()
+        self.assertEqual(self.mock_client.images.generate.call_args.kwargs["n"], 3)
+        key = ImageGenerator.request_key(ImageGenerator.build_request("A panda"))
+        mock_cache.put.assert_called_once_with(key, b"b")
+
+    def test_generate_image_into_streams_and_caches(self):
+        png = b"\x89PNG\r\n\x1a\n" + bytes(100)
+        mock_response = MagicMock()
+        mock_response.data = [MagicMock(b64_json=base64.b64encode(png).decode())]
+        self.mock_client.images.generate.return_value = mock_response
+        with tempfile.TemporaryDirectory() as directory:
+            cache = ResponseCache(Path(directory))
+            generator = ImageGenerator(self.mock_client, cache=cache)
+
+            buffer = bytearray(len(png))
+            self.assertEqual(generator.generate_image_into("A panda", memoryview(buffer)), 108)
+            self.assertEqual(buffer, png)
+            sink = io.BytesIO()
+            generator.generate_image_into("A panda", sink)
+
+            self.assertEqual(sink.getvalue(), png)
+            self.mock_client.images.generate.assert_called_once()
+            key = ImageGenerator.request_key(ImageGenerator.build_request("A panda"))
+            self.assertEqual(cache.get(key), png)
+
+    def test_generate_image_into_leaves_cache_empty_on_bad_data(self):
+        mock_response = MagicMock()
+        mock_response.data = [MagicMock(b64_json=base64.b64encode(b"not a png").decode())]
+        self.mock_client.images.generate.return_value = mock_response
+        with tempfile.TemporaryDirectory() as directory:
+            generator = ImageGenerator(self.mock_client, cache=ResponseCache(Path(directory)))
+            with self.assertRaises(ValueError):
+                generator.generate_image_into("A panda", io.BytesIO())
+            self.assertEqual([p.name for p in Path(directory).rglob("*") if p.is_file()], [])
+
+    def test_generate_best_reuses_cached_winner(self):
+        mock_cache = MagicMock()
+        mock_cache.get.return_value = b"cached"
+        generator = ImageGenerator(self.mock_client, cache=mock_cache)
+        self.assertEqual(generator.generate_best("A panda", 3), (b"cached", []))
+        self.mock_client.images.generate.assert_not_called()
+
 
 class TestPandaImageGenerator(unittest.TestCase):
     @patch("daily_panda_image.generators.image_generator.PromptGenerator")
@@ -46,19 +126,69 @@ class TestPandaImageGenerator(unittest.TestCase):
         mock_client = MagicMock()
         panda_gen = PandaImageGenerator(openai_client=mock_client)
         panda_gen.prompt_generator.generate_prompt.return_value = "A panda at a festival"
-        panda_gen.image_generator.generate_image.return_value = b"imagebytes"
 
         with patch("datetime.date") as mock_date:
             mock_date.today.return_value = datetime.date(2024, 6, 1)
             panda_gen.generate_daily_panda()
 
         panda_gen.prompt_generator.generate_prompt.assert_called_once()
-        panda_gen.image_generator.generate_image.assert_called_once()
-        mock_file_manager.save_image.assert_called_once()
+        payload = panda_gen.image_generator.fetch_image.return_value
+        sink = mock_file_manager.image_writer.return_value.__enter__.return_value
+        payload.write_to.assert_called_once_with(sink)
+        mock_file_manager.save_image.assert_not_called()
         mock_file_manager.save_prompt.assert_called_once()
         mock_file_manager.update_readme.assert_called_once()
         mock_file_manager.save_event.assert_not_called()
 
+    @patch("daily_panda_image.generators.image_generator.PromptGenerator")
+    @patch("daily_panda_image.generators.image_generator.ImageGenerator")
+    @patch("daily_panda_image.generators.image_generator.FileManager")
+    def test_generate_daily_panda_saves_post_processed_image(
+        self, mock_file_manager, mock_image_gen, mock_prompt_gen
+    ):
+        post_processor = MagicMock()
+        post_processor.process.return_value = ProcessedImage(
+            png=b"small", original_bytes=10, derivatives={"webp": b"webp"}
+        )
+        panda_gen = PandaImageGenerator(openai_client=MagicMock(), post_processor=post_processor)
+        panda_gen.prompt_generator.generate_prompt.return_value = "A panda at a festival"
+        panda_gen.image_generator.generate_image.return_value = b"imagebytes"
+
+        day = datetime.date(2024, 6, 1)
+        panda_gen.generate_daily_panda(day)
+
+        post_processor.process.assert_called_once_with(b"imagebytes")
+        mock_file_manager.save_image.assert_called_once_with(b"small", day, True)
+        mock_file_manager.save_derivatives.assert_called_once_with({"webp": b"webp"}, day, True)
+        timings = mock_file_manager.record.call_args.kwargs["timings"]
+        self.assertEqual(set(timings), {"prompt", "image", "post_process"})
+
+    @patch("daily_panda_image.generators.image_generator.hash_image")
+    @patch("daily_panda_image.generators.image_generator.PromptGenerator")
+    @patch("daily_panda_image.generators.image_generator.ImageGenerator")
+    @patch("daily_panda_image.generators.image_generator.FileManager")
+    def test_generate_daily_panda_regenerates_near_duplicate(
+        self, mock_file_manager, mock_image_gen, mock_prompt_gen, mock_hash_image
+    ):
+        image_index = MagicMock()
+        image_index.near_duplicates.side_effect = [[(datetime.date(2024, 5, 1), 3)], []]
+        mock_hash_image.side_effect = lambda image_bytes: f"hash of {image_bytes!r}"
+        panda_gen = PandaImageGenerator(
+            openai_client=MagicMock(), image_index=image_index, duplicate_retries=2
+        )
+        panda_gen.prompt_generator.generate_prompt.return_value = "A panda at a festival"
+        panda_gen.image_generator.generate_image.side_effect = [b"duplicate", b"fresh"]
+
+        day = datetime.date(2024, 6, 1)
+        panda_gen.generate_daily_panda(day)
+
+        panda_gen.image_generator.generate_image.assert_called_with(
+            "A panda at a festival", refresh=True
+        )
+        mock_file_manager.save_image.assert_called_once_with(b"fresh", day, True)
+        image_index.add.assert_called_once_with(day, "hash of b'fresh'")
+        image_index.save.assert_called_once()
+
     @patch("daily_panda_image.generators.image_generator.PromptGenerator")
     @patch("daily_panda_image.generators.image_generator.ImageGenerator")
     @patch("daily_panda_image.generators.image_generator.FileManager")
@@ -72,6 +202,53 @@ class TestPandaImageGenerator(unittest.TestCase):
         with self.assertRaises(Exception):
             panda_gen.generate_daily_panda()
 
+    @patch("daily_panda_image.generators.image_generator.create_async_client")
+    @patch("daily_panda_image.generators.image_generator.create_client")
+    def test_async_client_is_built_on_first_async_use(self, mock_create, mock_create_async):
+        panda_gen = PandaImageGenerator()
+        mock_create_async.assert_not_called()
+
+        client = panda_gen.open_async_client()
+
+        self.assertIs(panda_gen.open_async_client(), client)
+        self.assertIs(panda_gen.image_generator.async_client, client)
+        self.assertIs(panda_gen.prompt_generator.async_client, client)
+        mock_create_async.assert_called_once()
+
+    @patch("daily_panda_image.generators.image_generator.FileManager")
+    def test_sync_and_async_paths_take_the_same_steps(self, mock_file_manager):
+        post_processor = MagicMock()
+        processed = ProcessedImage(png=b"small", original_bytes=10, derivatives={})
+        post_processor.process.return_value = processed
+        post_processor.aprocess = AsyncMock(return_value=processed)
+        panda_gen = PandaImageGenerator(
+            openai_client=MagicMock(), async_client=MagicMock(), post_processor=post_processor
+        )
+        prompts, images = panda_gen.prompt_generator, panda_gen.image_generator
+        prompts.fetch_headlines = MagicMock(return_value=[{"title": "Panda cub born"}])
+        prompts.generate_prompt = MagicMock(return_value="A panda")
+        prompts.agenerate_prompt = AsyncMock(return_value="A panda")
+        images.generate_image = MagicMock(return_value=b"image")
+        images.agenerate_image = AsyncMock(return_value=b"image")
+        day = datetime.date(2024, 6, 1)
+
+        steps = []
+        for run in (
+            lambda: panda_gen.generate_daily_panda(day),
+            lambda: asyncio.run(panda_gen.agenerate_daily_panda(day)),
+        ):
+            REGISTRY.reset()
+            with self.assertLogs("daily_panda_image.generators.image_generator") as logs:
+                run()
+            steps.append((sorted(REGISTRY.stats), [r.getMessage() for r in logs.records]))
+
+        self.assertEqual(steps[0], steps[1])
+        self.assertEqual(prompts.fetch_headlines.call_count, 2)
+        post_processor.process.assert_called_once_with(b"image")
+        post_processor.aprocess.assert_awaited_once_with(b"image")
+        self.assertIn("Generated prompt: A panda", steps[0][1])
+        self.assertEqual(mock_file_manager.save_image.call_count, 2)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,158 @@
+import asyncio
+import base64
+import datetime
+import json
+import os
+import sys
+import time
+from unittest.mock import patch
+
+import pytest
+
+# Add the src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from daily_panda_image.generators.image_generator import PandaImageGenerator
+from daily_panda_image.generators.openai_clients import (
+    POOL_MAX_CONNECTIONS,
+    create_async_client,
+    create_client,
+    pool_limits,
+)
+from tests.stub_server import StubResponse, StubServer
+
+HEADLINES = [{"title": "Panda cub born", "summary": "Keepers cheer at the zoo."}]
+PNG = b"\x89PNG\r\n\x1a\nfake"
+
+
+def chat_completion(content: str) -> StubResponse:
+    body = {
+        "id": "chatcmpl-1",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "gpt-4o",
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }
+        ],
+    }
+    return StubResponse(json.dumps(body), headers={"Content-Type": "application/json"})
+
+
+def image_generation(delay: float = 0.0) -> StubResponse:
+    body = {"created": 0, "data": [{"b64_json": base64.b64encode(PNG).decode()}]}
+    return StubResponse(json.dumps(body), headers={"Content-Type": "application/json"}, delay=delay)
+
+
+@pytest.fixture
+def api():
+    with StubServer() as server:
+        server.add(
+            "/v1/chat/completions",
+            chat_completion("[Cub born, Chengdu]\nA photorealistic image of a panda. Cut off"),
+        )
+        server.add("/v1/images/generations", image_generation(delay=0.3))
+        yield server
+
+
+def make_generator(api):
+    return PandaImageGenerator(
+        create_client("test-key", api.url("/v1")), create_async_client("test-key", api.url("/v1"))
+    )
+
+
+def test_pool_limits():
+    assert pool_limits().max_connections == POOL_MAX_CONNECTIONS
+
+
+def test_sync_path_against_stub(api):
+    generator = make_generator(api)
+    prompt = generator.prompt_generator.generate_prompt(datetime.date(2026, 6, 1), HEADLINES)
+    assert prompt == "[Cub born, Chengdu]\nA photorealistic image of a panda."
+    assert generator.image_generator.generate_image(prompt) == PNG
+
+    chat_request = json.loads(api.requests[0].body)
+    assert chat_request["model"] == "gpt-4o"
+    assert chat_request["max_completion_tokens"] == 150
+    assert api.requests[0].headers["Authorization"] == "Bearer test-key"
+
+
+def test_async_path_matches_sync_path(api):
+    generator = make_generator(api)
+
+    async def run():
+        try:
+            prompt = await generator.prompt_generator.agenerate_prompt(
+                datetime.date(2026, 6, 1), HEADLINES
+            )
+            return prompt, await generator.image_generator.agenerate_image(prompt)
+        finally:
+            await generator.aclose()
+
+    prompt, image = asyncio.run(run())
+    assert prompt == "[Cub born, Chengdu]\nA photorealistic image of a panda."
+    assert image == PNG
+
+
+@patch("daily_panda_image.generators.image_generator.FileManager")
+def test_many_images_in_flight_from_one_process(mock_file_manager, api):
+    generator = make_generator(api)
+    dates = [datetime.date(2026, 6, day) for day in range(1, 7)]
+
+    async def run():
+        try:
+            return await generator.agenerate_many(dates, HEADLINES, max_concurrency=6)
+        finally:
+            await generator.aclose()
+
+    started = time.monotonic()
+    outcomes = asyncio.run(run())
+    elapsed = time.monotonic() - started
+
+    assert outcomes == dict.fromkeys(dates)
+    assert elapsed < 1.2  # six sequential 0.3s image calls would take 1.8s
+    assert mock_file_manager.image_writer.call_count == 6  # streamed, never held as bytes
+    mock_file_manager.save_image.assert_not_called()
+    mock_file_manager.update_readme.assert_not_called()
+
+
+@patch("daily_panda_image.generators.image_generator.FileManager")
+def test_connections_are_reused(mock_file_manager, api):
+    generator = make_generator(api)
+
+    async def run():
+        try:
+            for day in range(1, 4):
+                await generator.agenerate_daily_panda(
+                    datetime.date(2026, 6, day), HEADLINES, update_current=False
+                )
+        finally:
+            await generator.aclose()
+
+    asyncio.run(run())
+    assert len(api.requests) == 6
+    assert len({request.client_port for request in api.requests}) == 1
+
+
+def test_failures_are_reported_per_date(api):
+    api.add("/v1/images/generations", StubResponse(json.dumps({"created": 0, "data": []})))
+    generator = make_generator(api)
+    day = datetime.date(2026, 6, 1)
+
+    async def run():
+        try:
+            return await generator.agenerate_many([day], HEADLINES)
+        finally:
+            await generator.aclose()
+
+    outcome = asyncio.run(run())[day]
+    assert isinstance(outcome, ValueError)
+
+
+def test_async_path_requires_async_client():
+    generator = PandaImageGenerator(openai_client=create_client("test-key", "http://127.0.0.1:9"))
+    with pytest.raises(ValueError, match="no async client"):
+        asyncio.run(generator.image_generator.agenerate_image("prompt"))
@@ -0,0 +1,78 @@
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+# Add the src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from daily_panda_image.generators.pipeline import Pipeline, Stage
+
+
+class TestPipeline:
+    def test_chains_stage_outputs(self):
+        pipeline = Pipeline([Stage("double", lambda x: x * 2), Stage("label", lambda x: f"<{x}>")])
+        result = pipeline.run([1, 2, 3])
+        assert result.outputs == {1: "<2>", 2: "<4>", 3: "<6>"}
+        assert result.metrics["double"].items == 3
+        assert result.metrics["label"].items == 3
+
+    def test_failed_items_are_dropped_and_recorded(self):
+        def check(x):
+            if x == 2:
+                raise ValueError("bad item")
+            return x
+
+        after = []
+        result = Pipeline([Stage("check", check), Stage("collect", after.append)]).run([1, 2, 3])
+        assert sorted(after) == [1, 3]
+        stage, error = result.errors[2]
+        assert stage == "check" and str(error) == "bad item"
+        assert result.metrics["check"].errors == 1
+
+    def test_stages_overlap(self):
+        def slow(x):
+            time.sleep(0.1)
+            return x
+
+        result = Pipeline([Stage("a", slow), Stage("b", slow)]).run(range(4))
+        assert len(result.outputs) == 4
+        assert result.wall_seconds < 0.7  # fully sequential would be 0.8s
+
+    def test_stage_concurrency_limit(self):
+        active, peak, lock = [0], [0], threading.Lock()
+
+        def tracked(x):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.02)
+            with lock:
+                active[0] -= 1
+            return x
+
+        Pipeline([Stage("feed", lambda x: x, workers=4), Stage("t", tracked, workers=2)]).run(
+            range(12)
+        )
+        assert peak[0] == 2
+
+    def test_bounded_queue_applies_backpressure(self):
+        produced = []
+
+        def produce(x):
+            produced.append(x)
+            return x
+
+        def consume(x):
+            time.sleep(0.05)
+            return x
+
+        result = Pipeline([Stage("produce", produce), Stage("consume", consume)]).run(range(5))
+        assert len(result.outputs) == 5
+        assert result.metrics["produce"].blocked_seconds > 0.05
+
+    def test_requires_a_stage(self):
+        with pytest.raises(ValueError):
+            Pipeline([])
@@ -1,8 +1,9 @@
 # --- TESTS BELOW ---
+import asyncio
 import datetime
 import os
 import sys
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
@@ -10,6 +11,9 @@ import pytest
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
 
 import daily_panda_image.generators.prompt_generator as prompt_gen
+from daily_panda_image.generators.sync_bridge import iterate, run_blocking
+from daily_panda_image.utils.response_cache import ResponseCache
+from daily_panda_image.utils.text_processor import TextProcessor
 
 
 class DummyTextProcessor:
@@ -23,10 +27,12 @@ class DummyTextProcessor:
             return text[: text.rfind(".") + 1]
         return text
 
+    extract_headline = staticmethod(TextProcessor.extract_headline)
+
 
 class DummyNewsScraper:
     @staticmethod
-    def fetch_headlines(current_date=None):
+    def fetch_headlines(current_date=None, **kwargs):
         return [
             {
                 "title": "World leaders meet at climate summit in Geneva",
@@ -59,6 +65,7 @@ class DummyNewsScraper:
 def patch_utils(monkeypatch):
     monkeypatch.setattr(prompt_gen, "NewsScraper", DummyNewsScraper)
     monkeypatch.setattr(prompt_gen, "TextProcessor", DummyTextProcessor)
+    monkeypatch.setattr(prompt_gen, "HeadlineIndex", MagicMock())
 
 
 def test_get_system_prompt():
@@ -79,6 +86,17 @@ def test_get_text_prompt_contains_headlines(monkeypatch):
     assert "Palais des Nations" in prompt
 
 
+def test_source_headline_finds_the_feed_title_behind_the_summary():
+    headlines = [
+        {"title": "Heatwave grips southern Europe", "summary": "Temperatures top 40C."},
+        {"title": "Panda cub born", "summary": "Edinburgh zoo keepers welcome a newborn."},
+    ]
+    prompt = "[Edinburgh zoo keepers welcome newborn panda, Edinburgh]\nA photorealistic image."
+
+    assert prompt_gen.PromptGenerator.source_headline(prompt, headlines) == "Panda cub born"
+    assert prompt_gen.PromptGenerator.source_headline("No summary line.", headlines) is None
+
+
 def test_prompt_generator_generate_prompt():
     class DummyChoices:
         class DummyMessage:
@@ -121,3 +139,126 @@ def test_prompt_generator_empty_response_raises():
     gen = prompt_gen.PromptGenerator(dummy_client)
     with pytest.raises(ValueError, match="empty response"):
         gen.generate_prompt(datetime.date(2026, 4, 19))
+
+
+def test_prompt_generator_uses_response_cache(tmp_path):
+    class DummyResponse:
+        choices = [MagicMock(message=MagicMock(content="A panda signs the treaty."))]
+
+    dummy_client = MagicMock()
+    dummy_client.chat.completions.create.return_value = DummyResponse()
+    cache = ResponseCache(tmp_path)
+
+    first = prompt_gen.PromptGenerator(dummy_client, cache=cache)
+    second = prompt_gen.PromptGenerator(dummy_client, cache=cache)
+    date = datetime.date(2026, 4, 19)
+
+    assert (
+        first.generate_prompt(date) == second.generate_prompt(date) == "A panda signs the treaty."
+    )
+    assert dummy_client.chat.completions.create.call_count == 1
+
+    # A different date changes the user prompt and therefore the key
+    second.generate_prompt(datetime.date(2026, 4, 20))
+    assert dummy_client.chat.completions.create.call_count == 2
+
+
+class FakeStream:
+    """Stands in for an OpenAI Stream: iterable chunks plus close()."""
+
+    def __init__(self, deltas):
+        self.deltas = deltas
+        self.consumed = 0
+        self.closed = False
+
+    def __iter__(self):
+        for delta in self.deltas:
+            self.consumed += 1
+            yield MagicMock(choices=[MagicMock(delta=MagicMock(content=delta))])
+
+    def close(self):
+        self.closed = True
+
+
+class FakeAsyncStream(FakeStream):
+    """Stands in for an OpenAI AsyncStream."""
+
+    def __aiter__(self):
+        return iterate(self)
+
+    async def close(self):
+        self.closed = True
+
+
+def collect(items) -> list:
+    async def gather():
+        return [item async for item in items]
+
+    return run_blocking(gather())
+
+
+def test_iter_sentences_yields_as_soon_as_complete():
+    deltas = ["[Summit, Geneva]\nA panda", " signs.", " It", " smiles!", " Then"]
+    assert collect(prompt_gen.iter_sentences(iterate(deltas))) == [
+        ("[Summit, Geneva]\nA panda signs.", 3),
+        ("It smiles!", 5),
+    ]
+
+
+def test_iter_sentences_keeps_final_complete_sentence():
+    assert collect(prompt_gen.iter_sentences(iterate(["Done", "."]))) == [("Done.", 2)]
+
+
+def test_iter_sentences_ignores_decimal_points():
+    deltas = iterate(["It is 3", ".5 metres", " tall."])
+    assert collect(prompt_gen.iter_sentences(deltas)) == [("It is 3.5 metres tall.", 3)]
+
+
+def test_iter_ascii_applies_per_delta():
+    assert collect(prompt_gen.iter_ascii(iterate(["café", " ok"]))) == ["caf", " ok"]
+
+
+def test_take_prompt_stops_when_budget_is_nearly_spent():
+    sentences = iter([("One.", 40), ("Two.", 130), ("Three.", 150)])
+    taken = prompt_gen.take_prompt(iterate(sentences), max_tokens=150, reserve_tokens=25)
+    assert run_blocking(taken) == "One. Two."
+    assert next(sentences) == ("Three.", 150)  # left unconsumed
+
+
+def test_stream_prompt_closes_stream_early():
+    deltas = ["A panda signs."] + [" More"] * 128 + [" words."] + [" Tail"] * 30
+    stream = FakeStream(deltas)
+    dummy_client = MagicMock()
+    dummy_client.chat.completions.create.return_value = stream
+
+    gen = prompt_gen.PromptGenerator(dummy_client, stream=True)
+    prompt = gen.generate_prompt(datetime.date(2026, 4, 19))
+
+    assert prompt == "A panda signs. " + "More " * 128 + "words."
+    assert stream.closed
+    assert stream.consumed == 131  # stopped right after the boundary at token 130
+    assert dummy_client.chat.completions.create.call_args.kwargs["stream"] is True
+
+
+def test_stream_prompt_without_complete_sentence_raises():
+    dummy_client = MagicMock()
+    dummy_client.chat.completions.create.return_value = FakeStream(["Serenity", " now"])
+
+    gen = prompt_gen.PromptGenerator(dummy_client, stream=True)
+    with pytest.raises(ValueError, match="no complete sentence"):
+        gen.generate_prompt(datetime.date(2026, 4, 19))
+
+
+def test_async_path_streams_the_same_way():
+    deltas = ["A panda signs."] + [" More"] * 128 + [" words."] + [" Tail"] * 30
+    stream = FakeAsyncStream(deltas)
+    async_client = MagicMock()
+    async_client.chat.completions.create = AsyncMock(return_value=stream)
+
+    gen = prompt_gen.PromptGenerator(MagicMock(), async_client, stream=True)
+    prompt = asyncio.run(gen.agenerate_prompt(datetime.date(2026, 4, 19)))
+
+    assert prompt == "A panda signs. " + "More " * 128 + "words."
+    assert stream.closed
+    assert stream.consumed == 131
+    assert async_client.chat.completions.create.call_args.kwargs["stream"] is True
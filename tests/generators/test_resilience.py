@@ -0,0 +1,268 @@
+import asyncio
+import datetime
+import json
+import os
+import random
+import sys
+
+import httpx
+import pytest
+from openai import BadRequestError, RateLimitError
+
+# Add the src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from daily_panda_image.generators.image_generator import PandaImageGenerator
+from daily_panda_image.generators.openai_clients import create_async_client, create_client
+from daily_panda_image.generators.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    Resilience,
+    RetryPolicy,
+    TokenBucket,
+    retry_after,
+)
+from daily_panda_image.utils.response_cache import ResponseCache
+from tests.generators.test_openai_clients import PNG, chat_completion, image_generation
+from tests.stub_server import StubResponse, StubServer, faults
+
+HEADLINES = [{"title": "Panda cub born", "summary": "Keepers cheer at the zoo."}]
+PROMPT = "[Cub born, Chengdu]\nA photorealistic image of a panda."
+
+
+class FakeTime:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def clock(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def rate_limit_error(headers: dict[str, str]) -> RateLimitError:
+    request = httpx.Request("POST", "https://api.openai.com/v1/images/generations")
+    response = httpx.Response(429, headers=headers, request=request)
+    return RateLimitError("Too many requests", response=response, body=None)
+
+
+def make_generator(api, fake: FakeTime, **options) -> PandaImageGenerator:
+    resilience = Resilience(clock=fake.clock, sleep=fake.sleep, rng=random.Random(1), **options)
+    return PandaImageGenerator(
+        create_client("test-key", api.url("/v1")),
+        create_async_client("test-key", api.url("/v1")),
+        resilience=resilience,
+    )
+
+
+class TestRetryAfter:
+    def test_reads_milliseconds_first(self):
+        error = rate_limit_error({"retry-after-ms": "250", "retry-after": "3"})
+        assert retry_after(error) == 0.25
+
+    def test_reads_seconds(self):
+        assert retry_after(rate_limit_error({"retry-after": "7"})) == 7.0
+
+    def test_reads_http_date(self):
+        error = rate_limit_error({"retry-after": "Wed, 21 Oct 2015 07:28:00 GMT"})
+        assert retry_after(error) == 0.0
+
+    def test_missing_header(self):
+        assert retry_after(rate_limit_error({})) is None
+        assert retry_after(ValueError("no response")) is None
+
+
+class TestRetryPolicy:
+    def test_backoff_is_jittered_below_exponential_cap(self):
+        policy = RetryPolicy(base_delay=1.0, max_delay=5.0)
+        rng = random.Random(0)
+        error = rate_limit_error({})
+        for attempt, cap in [(1, 1.0), (2, 2.0), (3, 4.0), (4, 5.0), (8, 5.0)]:
+            delays = [policy.delay(attempt, error, rng) for _ in range(50)]
+            assert all(0 <= delay <= cap for delay in delays)
+            assert max(delays) > cap / 2
+
+    def test_server_delay_wins(self):
+        policy = RetryPolicy(max_delay=5.0)
+        assert policy.delay(1, rate_limit_error({"retry-after": "12"}), random.Random()) == 12.0
+
+
+class TestTokenBucket:
+    def test_allows_burst_then_spaces_out(self):
+        fake = FakeTime()
+        bucket = TokenBucket(rate=0.5, capacity=2, clock=fake.clock)
+        assert bucket.reserve() == 0.0
+        assert bucket.reserve() == 0.0
+        assert bucket.reserve() == pytest.approx(2.0)
+        assert bucket.reserve() == pytest.approx(4.0)
+
+    def test_refills_over_time(self):
+        fake = FakeTime()
+        bucket = TokenBucket(rate=1.0, capacity=1, clock=fake.clock)
+        bucket.reserve()
+        fake.now += 1.0
+        assert bucket.reserve() == 0.0
+
+    def test_back_off_holds_every_caller(self):
+        fake = FakeTime()
+        bucket = TokenBucket(rate=10.0, capacity=5, clock=fake.clock)
+        bucket.back_off(30)
+        assert bucket.reserve() == pytest.approx(30.0)
+
+
+class TestCircuitBreaker:
+    def test_opens_after_threshold_and_probes_after_timeout(self):
+        fake = FakeTime()
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=fake.clock)
+        breaker.record_failure()
+        assert breaker.allow()
+        breaker.record_failure()
+        assert breaker.state == "open"
+        assert not breaker.allow()
+
+        fake.now += 10
+        assert breaker.state == "half-open"
+        assert breaker.allow()
+        assert not breaker.allow()  # only one trial request at a time
+        breaker.record_success()
+        assert breaker.state == "closed"
+
+    def test_failed_probe_reopens(self):
+        fake = FakeTime()
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=fake.clock)
+        breaker.record_failure()
+        fake.now += 10
+        assert breaker.allow()
+        breaker.record_failure()
+        assert breaker.state == "open"
+
+
+class TestProbeRelease:
+    def half_open(self) -> Resilience:
+        fake = FakeTime()
+        resilience = Resilience(failure_threshold=1, fallbacks={}, clock=fake.clock)
+        resilience.breaker("image").record_failure()
+        fake.now += 1000
+        return resilience
+
+    def test_client_error_during_probe_lets_the_next_request_probe(self):
+        resilience = self.half_open()
+        request = httpx.Request("POST", "https://api.openai.com/v1/images/generations")
+        error = BadRequestError(
+            "Rejected", response=httpx.Response(400, request=request), body=None
+        )
+
+        def send(**request):
+            raise error
+
+        with pytest.raises(BadRequestError):
+            resilience.call("image", send, {})
+        assert resilience.breaker("image").state == "half-open"
+        assert resilience.call("image", lambda **request: "ok", {}) == ("ok", {})
+        assert resilience.breaker("image").state == "closed"
+
+    def test_cancelled_probe_lets_the_next_request_probe(self):
+        resilience = self.half_open()
+
+        async def cancelled(**request):
+            raise asyncio.CancelledError
+
+        async def ok(**request):
+            return "ok"
+
+        with pytest.raises(asyncio.CancelledError):
+            asyncio.run(resilience.acall("image", cancelled, {}))
+        assert asyncio.run(resilience.acall("image", ok, {})) == ("ok", {})
+
+
+class TestAgainstFaultyServer:
+    @pytest.fixture
+    def api(self):
+        with StubServer() as server:
+            server.add("/v1/chat/completions", chat_completion(PROMPT))
+            server.add("/v1/images/generations", image_generation())
+            yield server
+
+    def test_transient_failures_are_retried(self, api):
+        api.add("/v1/chat/completions", faults(503, 0, then=chat_completion(PROMPT)))
+        api.add("/v1/images/generations", faults(429, retry_after="4", then=image_generation()))
+        fake = FakeTime()
+        generator = make_generator(api, fake)
+
+        prompt = generator.prompt_generator.generate_prompt(datetime.date(2026, 6, 1), HEADLINES)
+        assert prompt == PROMPT
+        assert generator.image_generator.generate_image(prompt) == PNG
+
+        assert len(api.requests) == 5
+        assert fake.sleeps[-1] == 4.0  # Retry-After is honoured exactly
+        assert all(0 <= delay <= 2.0 for delay in fake.sleeps[:2])
+
+    def test_gives_up_after_max_attempts(self, api):
+        api.add("/v1/images/generations", StubResponse(b"{}", 500))
+        fake = FakeTime()
+        generator = make_generator(
+            api, fake, policy=RetryPolicy(max_attempts=2), failure_threshold=5
+        )
+        with pytest.raises(Exception, match="500"):
+            generator.image_generator.generate_image(PROMPT)
+        assert len(api.requests) == 2
+
+    def test_client_errors_are_not_retried(self, api):
+        api.add("/v1/images/generations", StubResponse(b"{}", 400))
+        generator = make_generator(api, FakeTime())
+        with pytest.raises(BadRequestError):
+            generator.image_generator.generate_image(PROMPT)
+        assert len(api.requests) == 1
+
+    def test_open_breaker_falls_back_to_cheaper_model(self, api, tmp_path):
+        api.add("/v1/chat/completions", faults(503, 503, then=chat_completion(PROMPT)))
+        fake = FakeTime()
+        generator = make_generator(api, fake, failure_threshold=2)
+        generator.prompt_generator.cache = ResponseCache(tmp_path)
+
+        prompt = generator.prompt_generator.generate_prompt(datetime.date(2026, 6, 1), HEADLINES)
+
+        assert prompt == PROMPT
+        models = [json.loads(request.body)["model"] for request in api.requests]
+        assert models == ["gpt-4o", "gpt-4o", "gpt-4o-mini"]
+        assert generator.resilience.breaker("chat").state == "open"
+        assert not list(tmp_path.iterdir())  # fallback output is not cached
+
+        # While the breaker stays open, later requests go straight to the fallback
+        generator.prompt_generator.generate_prompt(datetime.date(2026, 6, 2), HEADLINES)
+        assert json.loads(api.requests[-1].body)["model"] == "gpt-4o-mini"
+
+    def test_image_fallback_lowers_quality(self, api):
+        api.add("/v1/images/generations", faults(502, then=image_generation()))
+        generator = make_generator(api, FakeTime(), failure_threshold=1)
+        assert generator.image_generator.generate_image(PROMPT) == PNG
+        assert "quality" not in json.loads(api.requests[0].body)
+        assert json.loads(api.requests[1].body)["quality"] == "low"
+
+    def test_open_breaker_without_fallback_raises(self, api):
+        api.add("/v1/images/generations", StubResponse(b"{}", 503))
+        generator = make_generator(api, FakeTime(), failure_threshold=1, fallbacks={})
+        with pytest.raises(CircuitOpenError):
+            generator.image_generator.generate_image(PROMPT)
+        with pytest.raises(CircuitOpenError):
+            generator.image_generator.generate_image(PROMPT)
+        assert len(api.requests) == 1
+
+    def test_async_path_retries(self, api):
+        api.add(
+            "/v1/images/generations",
+            faults(429, 503, retry_after="0.01", then=image_generation()),
+        )
+        generator = make_generator(api, FakeTime())
+
+        async def run():
+            try:
+                return await generator.image_generator.agenerate_image(PROMPT)
+            finally:
+                await generator.aclose()
+
+        assert asyncio.run(run()) == PNG
+        assert len(api.requests) == 3
@@ -0,0 +1,139 @@
+"""
+StubServer - Local HTTP stand-in for tests that need real sockets (feeds, OpenAI endpoints).
+"""
+
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+@dataclass
+class StubResponse:
+    """Canned response served by StubServer."""
+
+    body: bytes | str = b""
+    status: int = 200
+    headers: dict[str, str] = field(default_factory=dict)
+    delay: float = 0.0
+    # Close the connection without answering, to inject a network fault
+    drop: bool = False
+
+
+@dataclass
+class StubRequest:
+    """Request recorded by StubServer."""
+
+    method: str
+    path: str
+    headers: dict[str, str]
+    body: bytes
+    client_port: int = 0
+
+
+# A route is a fixed response, a sequence consumed in order (the last one repeats),
+# or a callable that builds a response from the incoming request.
+Route = StubResponse | list[StubResponse] | Callable[[StubRequest], StubResponse]
+
+
+def faults(
+    *statuses: int, then: StubResponse, retry_after: str | None = None
+) -> list[StubResponse]:
+    """
+    Route that fails with the given statuses before serving a healthy response.
+
+    A status of 0 drops the connection instead of answering.
+    """
+    headers = {"Retry-After": retry_after} if retry_after is not None else {}
+    failures = [
+        StubResponse(drop=True)
+        if status == 0
+        else StubResponse(b'{"error": {"message": "injected"}}', status, dict(headers))
+        for status in statuses
+    ]
+    return [*failures, then]
+
+
+class StubServer:
+    """Serves canned responses on 127.0.0.1 from a background thread."""
+
+    def __init__(self):
+        self.routes: dict[str, Route] = {}
+        self.requests: list[StubRequest] = []
+        self._lock = threading.Lock()
+        self._server: ThreadingHTTPServer | None = None
+        self._thread: threading.Thread | None = None
+
+    def add(self, path: str, route: Route) -> None:
+        """Register a route for an exact request path (query string excluded)."""
+        self.routes[path] = list(route) if isinstance(route, list) else route
+
+    def url(self, path: str = "") -> str:
+        """Absolute URL for a path on the running server."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}{path}"
+
+    def _resolve(self, request: StubRequest) -> StubResponse:
+        with self._lock:
+            self.requests.append(request)
+            route = self.routes.get(request.path.split("?", 1)[0])
+            if route is None:
+                return StubResponse(body=b"not found", status=404)
+            if isinstance(route, list):
+                return route.pop(0) if len(route) > 1 else route[0]
+        if callable(route):
+            return route(request)
+        return route
+
+    def __enter__(self) -> "StubServer":
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _handle(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                request = StubRequest(
+                    method=self.command,
+                    path=self.path,
+                    headers=dict(self.headers.items()),
+                    body=self.rfile.read(length) if length else b"",
+                    client_port=self.client_address[1],
+                )
+                response = stub._resolve(request)
+                if response.delay:
+                    time.sleep(response.delay)
+                if response.drop:
+                    self.close_connection = True
+                    return
+                body = response.body.encode() if isinstance(response.body, str) else response.body
+                try:
+                    self.send_response(response.status)
+                    for name, value in response.headers.items():
+                        self.send_header(name, value)
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    # The client gave up (e.g. a timeout under test) before the delay elapsed.
+                    pass
+
+            do_GET = _handle
+            do_POST = _handle
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
@@ -0,0 +1,51 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from daily_panda_image.channels import Channel, load_channels
+
+
+def write(tmp_path, text: str) -> Path:
+    path = tmp_path / "channels.toml"
+    path.write_text(text)
+    return path
+
+
+def test_loads_channels_in_file_order(tmp_path):
+    path = write(
+        tmp_path,
+        """
+[channels.panda]
+
+[channels.red-panda]
+subject = "red panda"
+output_root = "channels/red-panda"
+image_size = "1536x1024"
+feeds = [{ name = "BBC News", url = "https://feeds.bbci.co.uk/news/rss.xml" }]
+""",
+    )
+
+    panda, red_panda = load_channels(path)
+
+    assert panda == Channel(name="panda")
+    assert red_panda.subject == "red panda"
+    assert red_panda.output_root == Path("channels/red-panda")
+    assert red_panda.feeds == (("BBC News", "https://feeds.bbci.co.uk/news/rss.xml"),)
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "",
+        '[channels.panda]\ncolour = "red"\n',
+        '[channels.panda]\nfeeds = [{ name = "BBC" }]\n',
+    ],
+)
+def test_rejects_malformed_files(tmp_path, text):
+    with pytest.raises(ValueError):
+        load_channels(write(tmp_path, text))
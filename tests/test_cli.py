@@ -0,0 +1,142 @@
+import datetime
+import logging
+import os
+import subprocess
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+# Add the src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from daily_panda_image import cli
+
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+# Cumulative import time allowed for daily_panda_image.cli, in microseconds. A cold
+# import takes about 10 ms; importing openai alone costs well over 200 ms.
+CLI_IMPORT_BUDGET_US = 100_000
+
+# Third-party packages that must only load inside the subcommands that use them
+HEAVY_MODULES = {"openai", "httpx", "feedparser", "pydantic", "pydantic_settings", "numpy", "PIL"}
+
+
+def import_times(*args: str) -> dict[str, int]:
+    """Cumulative import time per module reported by -X importtime, in microseconds."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONPATH": SRC},
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line.removeprefix("import time:").split("|")
+        times[module.strip()] = int(cumulative)
+    return times
+
+
+class TestStartup:
+    def test_import_stays_within_budget(self):
+        times = import_times("-c", "import daily_panda_image.cli")
+        assert times["daily_panda_image.cli"] < CLI_IMPORT_BUDGET_US
+        assert not HEAVY_MODULES & set(times)
+
+    def test_help_loads_no_heavy_dependency(self):
+        times = import_times("-m", "daily_panda_image.cli", "--help")
+        assert not HEAVY_MODULES & set(times)
+
+    def test_main_module_stays_light(self):
+        times = import_times("-c", "import daily_panda_image.main")
+        assert not HEAVY_MODULES & set(times)
+
+
+class TestParseArgs:
+    def test_defaults_to_run(self):
+        assert cli.parse_args([]).command == "run"
+        args = cli.parse_args(["--variants", "3", "--no-optimize"])
+        assert (args.command, args.variants, args.no_optimize) == ("run", 3, True)
+
+    def test_backfill_range_and_optional_tuning(self):
+        args = cli.parse_args(["backfill", "2026-06-01", "2026-06-03", "--workers", "4"])
+        assert (args.start, args.end) == (datetime.date(2026, 6, 1), datetime.date(2026, 6, 3))
+        assert args.workers == 4
+        assert args.images_per_minute is None
+
+    def test_bench_passes_remaining_arguments(self):
+        args = cli.parse_args(["bench", "pipeline", "--repeat", "2"])
+        assert (args.name, args.bench_args) == ("pipeline", ["--repeat", "2"])
+
+
+class TestMain:
+    @pytest.fixture(autouse=True)
+    def restore_logger(self):
+        package_logger = logging.getLogger("daily_panda_image")
+        saved = package_logger.handlers[:], package_logger.level, package_logger.propagate
+        yield
+        package_logger.handlers[:], package_logger.level, package_logger.propagate = saved
+
+    @patch("daily_panda_image.utils.image_post_processor.ImagePostProcessor")
+    @patch("daily_panda_image.utils.response_cache.ResponseCache")
+    @patch("daily_panda_image.generators.image_generator.PandaImageGenerator")
+    @patch("daily_panda_image.config.get_settings")
+    def test_run_generates_today(self, _settings, mock_generator, _cache, mock_processor):
+        cli.main(["run", "--variants", "2"])
+        assert mock_generator.call_args.kwargs["variants"] == 2
+        mock_generator.return_value.generate_daily_panda.assert_called_once_with()
+        mock_processor.return_value.close.assert_called_once()
+
+    @patch("daily_panda_image.generators.backfill.BackfillRunner")
+    @patch("daily_panda_image.generators.image_generator.PandaImageGenerator")
+    @patch("daily_panda_image.config.get_settings")
+    def test_failed_backfill_exits_non_zero(self, _settings, mock_generator, mock_runner):
+        mock_runner.return_value.run.return_value = MagicMock(failed={"day": "boom"})
+        with pytest.raises(SystemExit) as exit_info:
+            cli.main(["backfill", "2026-06-01", "2026-06-02", "--no-optimize", "--no-cache"])
+        assert exit_info.value.code == 1
+        assert mock_runner.call_args.kwargs == {}  # unset tuning keeps the runner defaults
+
+    @patch("daily_panda_image.utils.archive_manifest.ArchiveManifest")
+    def test_rebuild_index(self, mock_manifest):
+        cli.main(["rebuild-index"])
+        mock_manifest.return_value.rebuild.assert_called_once()
+
+    @patch("daily_panda_image.utils.headline_ranker.HeadlineRanker")
+    @patch("daily_panda_image.utils.news_scraper.NewsScraper")
+    @patch("daily_panda_image.utils.headline_index.HeadlineIndex")
+    def test_fetch_headlines_skips_the_api(self, _index, mock_scraper, mock_ranker, capsys):
+        mock_ranker.rank.return_value = ([], MagicMock(summary=lambda: "ranked"))
+        mock_scraper.format_for_prompt.return_value = "1. Panda cub born"
+        cli.main(["fetch-headlines", "--date", "2026-06-01", "--no-cache"])
+        assert mock_scraper.fetch_headlines.call_args.kwargs["cache"] is None
+        assert capsys.readouterr().out.endswith("ranked\n1. Panda cub born\n")
+
+    def test_unknown_benchmark_exits(self):
+        with pytest.raises(SystemExit) as exit_info:
+            cli.main(["bench", "no_such_benchmark"])
+        assert "Unknown benchmark" in str(exit_info.value.code)
+
+    @patch("daily_panda_image.utils.image_hash.ImageHashIndex")
+    def test_index_images_lists_near_duplicates(self, mock_index, capsys):
+        mock_index.load.return_value.__len__.return_value = 3
+        mock_index.load.return_value.duplicate_pairs.return_value = [
+            (datetime.date(2026, 6, 1), datetime.date(2026, 6, 2), 4)
+        ]
+        cli.main(["index-images", "--workers", "2"])
+        mock_index.load.assert_called_once_with(workers=2)
+        assert capsys.readouterr().out.splitlines() == [
+            "3 images indexed, 1 near-duplicate pairs.",
+            "  2026-06-01  2026-06-02  4 bits differ",
+        ]
+
+    @patch("daily_panda_image.generators.daemon.read_status")
+    def test_status_exits_non_zero_when_unhealthy(self, mock_read_status, capsys):
+        mock_read_status.return_value = {"healthy": False}
+        with pytest.raises(SystemExit) as exit_info:
+            cli.main(["status"])
+        assert exit_info.value.code == 1
+        assert '"healthy": false' in capsys.readouterr().out
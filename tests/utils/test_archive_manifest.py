@@ -0,0 +1,98 @@
+import datetime
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+# Add the src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from daily_panda_image.utils.archive_manifest import ArchiveManifest
+from daily_panda_image.utils.file_manager import FileManager
+
+PROMPT = "[Heatwave grips Europe, Rome, Italy]\n\nA photorealistic image of a panda with a fan."
+
+
+class TestArchiveManifest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        patcher = patch.object(FileManager, "get_project_root", return_value=self.root)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self._tmp.cleanup)
+        self.date = datetime.date(2026, 6, 10)
+
+    def save_day(self, day: datetime.date, image: bytes = b"png") -> None:
+        FileManager.save_image(image, day, update_current=False)
+        FileManager.save_prompt(PROMPT, day, update_current=False)
+
+    def test_saves_are_recorded_and_merged(self):
+        self.save_day(self.date)
+        FileManager.save_derivatives({"thumb": b"thumb"}, self.date, update_current=False)
+        FileManager.record(self.date, timings={"image": 12.5})
+
+        record = ArchiveManifest.load().get(self.date)
+        self.assertEqual(record["image"]["bytes"], 3)
+        self.assertEqual(len(record["image"]["sha256"]), 64)
+        self.assertEqual(record["headline"], "Heatwave grips Europe, Rome, Italy")
+        self.assertEqual(record["prompt"], PROMPT)
+        self.assertEqual(record["derivatives"], {"thumb": 5})
+        self.assertEqual(record["timings"], {"image": 12.5})
+
+    def test_later_lines_win(self):
+        self.save_day(self.date, b"first")
+        FileManager.save_image(b"second!", self.date, update_current=False)
+        self.assertEqual(ArchiveManifest.load().get(self.date)["image"]["bytes"], 7)
+
+    def test_has_output_requires_image_and_prompt(self):
+        FileManager.save_image(b"png", self.date)
+        self.assertFalse(ArchiveManifest.load().has_output(self.date))
+        FileManager.save_prompt(PROMPT, self.date)
+        self.assertTrue(ArchiveManifest.load().has_output(self.date))
+        self.assertFalse(ArchiveManifest.load().has_output(self.date + datetime.timedelta(days=1)))
+
+    def test_range_and_latest(self):
+        for offset in (4, 0, 2, 1):
+            self.save_day(self.date + datetime.timedelta(days=offset))
+        manifest = ArchiveManifest.load()
+
+        dates = [r["date"] for r in manifest.range(self.date, datetime.date(2026, 6, 12))]
+        self.assertEqual(dates, ["2026-06-10", "2026-06-11", "2026-06-12"])
+        self.assertEqual([r["date"] for r in manifest.latest(2)], ["2026-06-14", "2026-06-12"])
+
+    def test_torn_last_line_is_skipped(self):
+        self.save_day(self.date)
+        with open(FileManager.manifest_path(), "a") as f:
+            f.write('{"date": "2026-06-11", "ima')
+        manifest = ArchiveManifest.load()
+        self.assertTrue(manifest.has_output(self.date))
+        self.assertIsNone(manifest.get(datetime.date(2026, 6, 11)))
+
+    def test_missing_manifest_is_rebuilt_from_folders(self):
+        self.save_day(self.date)
+        FileManager.record(self.date, timings={"image": 3.0})
+        FileManager.manifest_path().unlink()
+
+        manifest = ArchiveManifest.load()
+        self.assertTrue(manifest.has_output(self.date))
+        self.assertEqual(manifest.get(self.date)["headline"], "Heatwave grips Europe, Rome, Italy")
+        self.assertTrue(FileManager.manifest_path().exists())
+
+    def test_rebuild_compacts_and_keeps_timings(self):
+        self.save_day(self.date)
+        FileManager.record(self.date, timings={"image": 3.0})
+        manifest = ArchiveManifest.load()
+        manifest.rebuild()
+
+        lines = FileManager.manifest_path().read_text().splitlines()
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(json.loads(lines[0])["timings"], {"image": 3.0})
+        self.assertNotIn("panda_current", FileManager.manifest_path().read_text())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+import json
+import os
+import sys
+
+import pytest
+
+# Add the src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+import daily_panda_image.utils.news_scraper as news_scraper
+from daily_panda_image.utils.feed_cache import FeedCache
+from daily_panda_image.utils.news_scraper import NewsScraper
+from tests.stub_server import StubResponse, StubServer
+
+RSS = (
+    '<?xml version="1.0"?><rss version="2.0"><channel><title>t</title>'
+    "<item><title>Panda cub born</title><description>Keepers cheer.</description></item>"
+    "</channel></rss>"
+)
+
+
+class FakeClock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    return FeedCache(tmp_path / "cache" / "feeds.json", ttl=3600, clock=clock)
+
+
+class TestFeedCache:
+    def test_store_keeps_only_needed_fields(self, cache):
+        cache.store("u", [{"title": "A", "summary": "S", "links": ["x"]}], '"v1"', None)
+        assert cache.get("u") == [{"title": "A", "summary": "S"}]
+        assert cache.conditional_headers("u") == {"If-None-Match": '"v1"'}
+
+    def test_expired_entries_are_not_served_but_still_revalidated(self, cache, clock):
+        cache.store("u", [{"title": "A"}], '"v1"', "Mon, 01 Jun 2026 04:00:00 GMT")
+        clock.now += 3601
+        assert cache.get("u") is None
+        assert cache.conditional_headers("u") == {
+            "If-None-Match": '"v1"',
+            "If-Modified-Since": "Mon, 01 Jun 2026 04:00:00 GMT",
+        }
+
+    def test_revalidate_serves_expired_entries_and_extends_lifetime(self, cache, clock):
+        cache.store("u", [{"title": "A"}], None, None)
+        clock.now += 24 * 3600
+        assert cache.revalidate("u") == [{"title": "A"}]
+        clock.now += 3000
+        assert cache.get("u") == [{"title": "A"}]
+
+    def test_save_and_load_round_trip(self, cache, clock):
+        cache.store("u", [{"title": "A"}], '"v1"', None)
+        cache.save()
+        loaded = FeedCache.load(cache.path, clock=clock)
+        assert loaded.get("u") == [{"title": "A"}]
+
+    def test_save_evicts_feeds_past_retention(self, cache, clock):
+        cache.retention = 4000
+        cache.store("old", [{"title": "A"}], None, None)
+        clock.now += 3000
+        cache.store("new", [{"title": "B"}], None, None)
+        clock.now += 1000
+        cache.save()
+        assert set(json.loads(cache.path.read_text())) == {"new"}
+
+    def test_size_limit_evicts_least_recently_fetched(self, cache, clock):
+        for i in range(5):
+            cache.store(f"u{i}", [{"title": "x" * 200}], None, None)
+            clock.now += 1
+        cache.max_bytes = 600
+        cache.evict()
+        assert sorted(cache.feeds) == ["u3", "u4"]
+
+    def test_load_ignores_corrupt_file(self, tmp_path):
+        path = tmp_path / "feeds.json"
+        path.write_text("{not json")
+        assert FeedCache.load(path).feeds == {}
+
+
+class TestConditionalFetch:
+    def test_not_modified_reuses_cached_entries(self, monkeypatch, cache):
+        def feed(request):
+            if request.headers.get("If-None-Match") == '"v1"':
+                return StubResponse(status=304)
+            return StubResponse(RSS, headers={"ETag": '"v1"'})
+
+        with StubServer() as server:
+            server.add("/npr", feed)
+            monkeypatch.setattr(news_scraper, "NEWS_FEEDS", [("NPR", server.url("/npr"))])
+
+            first = NewsScraper.fetch_headlines(cache=cache)
+            second = NewsScraper.fetch_headlines(cache=cache)
+
+        assert (
+            first
+            == second
+            == [{"title": "Panda cub born", "summary": "Keepers cheer.", "sources": 1}]
+        )
+        assert [r.headers.get("If-None-Match") for r in server.requests] == [None, '"v1"']
+        assert cache.path.exists()
+
+    def test_next_day_run_still_sends_validators(self, monkeypatch, cache, clock):
+        def feed(request):
+            if request.headers.get("If-None-Match") == '"v1"':
+                return StubResponse(status=304)
+            return StubResponse(RSS, headers={"ETag": '"v1"'})
+
+        with StubServer() as server:
+            server.add("/npr", feed)
+            monkeypatch.setattr(news_scraper, "NEWS_FEEDS", [("NPR", server.url("/npr"))])
+
+            NewsScraper.fetch_headlines(cache=cache)
+            clock.now += 24 * 3600
+            reloaded = FeedCache.load(cache.path, ttl=3600, clock=clock)
+            headlines = NewsScraper.fetch_headlines(cache=reloaded)
+
+        assert [r.headers.get("If-None-Match") for r in server.requests] == [None, '"v1"']
+        assert [h["title"] for h in headlines] == ["Panda cub born"]
+
+    def test_failing_feed_falls_back_to_cached_entries(self, monkeypatch, cache):
+        with StubServer() as server:
+            server.add("/npr", [StubResponse(RSS), StubResponse("down", status=503)])
+            monkeypatch.setattr(news_scraper, "NEWS_FEEDS", [("NPR", server.url("/npr"))])
+
+            NewsScraper.fetch_headlines(cache=cache)
+            headlines = NewsScraper.fetch_headlines(cache=cache)
+
+        assert [h["title"] for h in headlines] == ["Panda cub born"]
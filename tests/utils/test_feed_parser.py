@@ -0,0 +1,76 @@
+import os
+import sys
+from pathlib import Path
+
+import feedparser
+import pytest
+
+# Add the src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from daily_panda_image.utils import feed_parser
+from daily_panda_image.utils.feed_parser import FeedFormatError, parse_feed
+from daily_panda_image.utils.news_scraper import NewsScraper
+
+FIXTURES = Path(__file__).resolve().parent.parent / "fixtures" / "feeds"
+
+ATOM = b"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+<title>Zoo news</title>
+<entry><title type="html">Cub &amp;amp; mother</title><content type="html">&lt;p&gt;Both well&lt;/p&gt;</content></entry>
+<entry><title>Keepers</title>
+<summary type="xhtml"><div xmlns="http://www.w3.org/1999/xhtml"><p>Hi <b>there</b></p></div></summary>
+<content>Ignored when there is a summary</content></entry>
+</feed>"""
+
+
+def rss_items(count: int) -> bytes:
+    items = "".join(
+        f"<item><title>Story {i}</title><description>About {i}</description></item>"
+        for i in range(count)
+    )
+    return f'<rss version="2.0"><channel><title>t</title>{items}</channel></rss>'.encode()
+
+
+@pytest.mark.parametrize("path", sorted(FIXTURES.glob("*.xml")), ids=lambda p: p.name)
+def test_matches_feedparser_on_samples(path):
+    body = path.read_bytes()
+    expected = feedparser.parse(body).entries
+
+    entries = parse_feed(body, max_items=None)
+
+    assert [e["title"] for e in entries] == [e.get("title") for e in expected]
+    assert [NewsScraper.sanitize_summary(e["summary"]) for e in entries] == [
+        NewsScraper.sanitize_summary(e.get("summary")) for e in expected
+    ]
+
+
+def test_reads_atom_summary_or_content():
+    assert parse_feed(ATOM) == [
+        {"title": "Cub &amp; mother", "summary": "<p>Both well</p>"},
+        {"title": "Keepers", "summary": "Hi there"},
+    ]
+
+
+def test_stops_reading_after_max_items(monkeypatch):
+    monkeypatch.setattr(feed_parser, "PARSE_CHUNK_BYTES", 64)
+    # Everything after the third item is malformed, so reading on would raise
+    body = rss_items(3)[: -len("</channel></rss>")] + b"<item><title>&nbsp;"
+
+    entries = parse_feed(body, max_items=3)
+
+    assert [e["title"] for e in entries] == ["Story 0", "Story 1", "Story 2"]
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        b"",
+        b"<html><body>Not a feed</body></html>",
+        b'<rss version="2.0"><channel><item><title>Cut off',
+        b'<rss version="2.0"><channel><item><title>A&nbsp;B</title></item></channel></rss>',
+    ],
+)
+def test_rejects_what_feedparser_must_handle(body):
+    with pytest.raises(FeedFormatError):
+        parse_feed(body)
@@ -1,10 +1,203 @@
+import datetime
+import hashlib
+import json
 import os
+import stat
 import sys
+import tempfile
 import unittest
+from pathlib import Path
+from unittest.mock import patch
 
 # Add the src directory to Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
 
+from daily_panda_image.utils.file_manager import (
+    README_GALLERY_SECTION,
+    README_GALLERY_SIZE,
+    FileManager,
+)
+
+
+class TestFileManager(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        patcher = patch.object(FileManager, "get_project_root", return_value=self.root)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self._tmp.cleanup)
+        self.date = datetime.date(2026, 6, 10)
+
+    def test_save_image_writes_dated_and_current(self):
+        FileManager.save_image(b"png", self.date)
+        self.assertEqual((self.root / "images" / "panda_2026-06-10.png").read_bytes(), b"png")
+        self.assertEqual((self.root / "images" / "panda_current.png").read_bytes(), b"png")
+
+    def test_backfilled_date_leaves_current_alone(self):
+        FileManager.save_image(b"png", self.date, update_current=False)
+        FileManager.save_prompt("prompt", self.date, update_current=False)
+        self.assertFalse((self.root / "images" / "panda_current.png").exists())
+        self.assertFalse((self.root / "prompts" / "prompt_current.txt").exists())
+
+    def test_current_aliases_are_hard_links(self):
+        FileManager.save_image(b"png", self.date)
+        FileManager.save_prompt("prompt", self.date)
+        images, prompts = self.root / "images", self.root / "prompts"
+        self.assertTrue((images / "panda_current.png").samefile(images / "panda_2026-06-10.png"))
+        self.assertTrue(
+            (prompts / "prompt_current.txt").samefile(prompts / "prompt_2026-06-10.txt")
+        )
+
+    def test_new_day_repoints_current_and_keeps_history(self):
+        FileManager.save_image(b"day one", self.date)
+        FileManager.save_image(b"day two", self.date + datetime.timedelta(days=1))
+        images = self.root / "images"
+        self.assertEqual((images / "panda_current.png").read_bytes(), b"day two")
+        self.assertEqual((images / "panda_2026-06-10.png").read_bytes(), b"day one")
+
+    def test_no_temporary_files_left_behind(self):
+        FileManager.save_image(b"png", self.date)
+        FileManager.save_prompt("prompt", self.date)
+        leftovers = [p.name for p in self.root.rglob(".*")]
+        self.assertEqual(leftovers, [])
+
+    def test_failed_write_keeps_previous_file(self):
+        FileManager.save_image(b"old", self.date)
+        with patch("os.replace", side_effect=OSError("disk full")), self.assertRaises(OSError):
+            FileManager.save_image(b"new", self.date)
+        self.assertEqual((self.root / "images" / "panda_2026-06-10.png").read_bytes(), b"old")
+        self.assertEqual([p.name for p in (self.root / "images").glob(".*")], [])
+
+    def test_atomic_write_uses_umask_or_existing_mode(self):
+        path = self.root / "README.md"
+        with patch("daily_panda_image.utils.file_manager._UMASK", 0o022):
+            FileManager.atomic_write(path, "new")
+        self.assertEqual(stat.S_IMODE(path.stat().st_mode), 0o644)
+
+        path.chmod(0o664)
+        FileManager.atomic_write(path, "updated")
+        self.assertEqual(stat.S_IMODE(path.stat().st_mode), 0o664)
+
+    def test_image_writer_streams_and_records_hash(self):
+        with FileManager.image_writer(self.date) as sink:
+            sink.write(b"chunk one, ")
+            sink.write(b"chunk two")
+        images = self.root / "images"
+        self.assertEqual((images / "panda_current.png").read_bytes(), b"chunk one, chunk two")
+        entry = json.loads(FileManager.manifest_path().read_text())
+        expected = hashlib.sha256(b"chunk one, chunk two").hexdigest()
+        self.assertEqual(entry["image"], {"sha256": expected, "bytes": 20})
+
+    def test_image_writer_aborts_cleanly(self):
+        FileManager.save_image(b"old", self.date)
+        with self.assertRaises(ValueError), FileManager.image_writer(self.date) as sink:
+            sink.write(b"partial")
+            raise ValueError("not a PNG")
+        self.assertEqual((self.root / "images" / "panda_current.png").read_bytes(), b"old")
+        self.assertEqual([p.name for p in (self.root / "images").glob(".*")], [])
+
+    def test_link_alias_falls_back_to_copy(self):
+        source = self.root / "source.txt"
+        source.write_text("content")
+        with patch("os.link", side_effect=OSError("not supported")):
+            FileManager.link_alias(source, self.root / "alias.txt")
+        self.assertEqual((self.root / "alias.txt").read_text(), "content")
+        self.assertFalse((self.root / "alias.txt").samefile(source))
+
+    def test_has_output_requires_image_and_prompt(self):
+        self.assertFalse(FileManager.has_output(self.date))
+        FileManager.save_image(b"png", self.date)
+        self.assertFalse(FileManager.has_output(self.date))
+        FileManager.save_prompt("prompt", self.date)
+        self.assertTrue(FileManager.has_output(self.date))
+
+    def test_save_derivatives_writes_each_kind_and_current(self):
+        FileManager.save_derivatives({"webp": b"webp", "thumb": b"thumb"}, self.date)
+        webp = self.root / "images" / "webp"
+        self.assertEqual((webp / "panda_2026-06-10.webp").read_bytes(), b"webp")
+        self.assertTrue((webp / "panda_current.webp").samefile(webp / "panda_2026-06-10.webp"))
+        self.assertEqual(
+            (self.root / "images" / "thumbs" / "panda_2026-06-10.webp").read_bytes(), b"thumb"
+        )
+        self.assertFalse((self.root / "images" / "avif").exists())
+
+    def test_save_variants_archives_losers(self):
+        FileManager.save_variants([b"one", b"two"], self.date)
+        variants = self.root / "images" / "variants"
+        self.assertEqual((variants / "panda_2026-06-10_1.png").read_bytes(), b"one")
+        self.assertEqual((variants / "panda_2026-06-10_2.png").read_bytes(), b"two")
+        self.assertFalse(FileManager.has_output(self.date))
+
+    def write_readme(self, gallery: str = "") -> Path:
+        readme = self.root / "README.md"
+        readme.write_text(
+            "# Title\n![screenshot](images/panda_current.png)\n"
+            "<!-- panda-prompt:start -->\n**Prompt:** old\n<!-- panda-prompt:end -->\n"
+            f"## Recent\n<!-- panda-gallery:start -->\n{gallery}<!-- panda-gallery:end -->\n"
+            "## Footer\nkept\n"
+        )
+        return readme
+
+    def test_update_readme_replaces_only_prompt_section(self):
+        readme = self.write_readme()
+        FileManager.update_readme("new prompt")
+        content = readme.read_text()
+        self.assertIn("**Prompt:** new prompt", content)
+        self.assertNotIn("old", content)
+        self.assertTrue(content.startswith("# Title\n![screenshot](images/panda_current.png)\n"))
+        self.assertTrue(content.endswith("## Footer\nkept\n"))
+
+    def test_update_readme_without_markers_leaves_file_alone(self):
+        readme = self.root / "README.md"
+        readme.write_text("![screenshot](images/panda_current.png)\nrest\n")
+        FileManager.update_readme("new prompt")
+        self.assertEqual(readme.read_text(), "![screenshot](images/panda_current.png)\nrest\n")
+
+    def test_update_readme_keeps_long_readme_intact(self):
+        readme = self.write_readme()
+        tail = "".join(f"line {i}\n" for i in range(5000))
+        readme.write_text(readme.read_text() + tail)
+        FileManager.update_readme("new prompt", self.date)
+        self.assertTrue(readme.read_text().endswith(tail))
+
+    def test_update_readme_shows_current_webp_when_rendered(self):
+        readme = self.root / "README.md"
+        readme.write_text(
+            "<!-- panda-current:start -->\n![screenshot](images/panda_current.png)\n"
+            "<!-- panda-current:end -->\n<!-- panda-prompt:start -->\n<!-- panda-prompt:end -->\n"
+        )
+        FileManager.update_readme("first")
+        self.assertIn("\n![screenshot](images/panda_current.png)\n", readme.read_text())
+
+        FileManager.save_derivatives({"webp": b"webp"}, self.date)
+        FileManager.update_readme("second")
+        FileManager.update_readme("third")
+        self.assertEqual(
+            readme.read_text().count(
+                "[![screenshot](images/webp/panda_current.webp)](images/panda_current.png)"
+            ),
+            1,
+        )
+        self.assertNotIn("\n![screenshot]", readme.read_text())
+
+    def test_gallery_rolls_newest_first(self):
+        old_entries = "".join(
+            FileManager.gallery_entry(self.date - datetime.timedelta(days=i)) + "\n"
+            for i in range(1, README_GALLERY_SIZE + 1)
+        )
+        readme = self.write_readme(old_entries)
+        FileManager.save_derivatives({"thumb": b"thumb"}, self.date)
+        FileManager.update_readme("new prompt", self.date)
+        FileManager.update_readme("rerun", self.date)
+
+        start, end = FileManager.section_span(readme.read_text(), README_GALLERY_SECTION)
+        entries = readme.read_text()[start:end].strip().splitlines()
+        self.assertEqual(len(entries), README_GALLERY_SIZE)
+        self.assertIn('src="images/thumbs/panda_2026-06-10.webp"', entries[0])
+        self.assertIn('alt="2026-06-09"', entries[1])
+        self.assertNotIn("2026-06-03", "".join(entries))
+
 
 if __name__ == "__main__":
     unittest.main()
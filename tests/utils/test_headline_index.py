@@ -0,0 +1,101 @@
+import datetime
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+# Add the src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from daily_panda_image.utils.headline_index import (
+    NUM_PERMUTATIONS,
+    HeadlineIndex,
+    closest,
+    minhash,
+    shingles,
+    similarity,
+)
+
+DAY = datetime.date(2026, 6, 10)
+
+
+class TestMinHash(unittest.TestCase):
+    def test_shingles_ignore_case_and_punctuation(self):
+        self.assertEqual(shingles("Zoo, OPENS!"), shingles("zoo opens"))
+        self.assertEqual(shingles("EU"), {"eu"})
+        self.assertEqual(shingles("!!"), set())
+
+    def test_signature_is_compact_and_deterministic(self):
+        signature = minhash("Panda cub born")
+        self.assertEqual(signature.dtype, np.uint32)
+        self.assertEqual(signature.shape, (NUM_PERMUTATIONS,))
+        np.testing.assert_array_equal(signature, minhash("Panda cub born"))
+
+    def test_similarity_tracks_overlap(self):
+        base = minhash("Trump announces tariffs on EU goods")
+        stack = np.vstack(
+            [
+                minhash("Trump announces tariffs on EU goods"),
+                minhash("Trump announces new tariffs on European Union goods"),
+                minhash("Heatwave grips southern Europe"),
+            ]
+        )
+        same, reworded, unrelated = similarity(base, stack)
+        self.assertEqual(same, 1.0)
+        self.assertGreater(reworded, 0.4)
+        self.assertLess(unrelated, 0.2)
+
+
+class TestHeadlineIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = HeadlineIndex(
+            ["Wildfires spread across California", "Trump announces tariffs on EU goods"],
+            [DAY - datetime.timedelta(days=40), DAY - datetime.timedelta(days=2)],
+        )
+
+    def test_repeat_within_window(self):
+        self.assertTrue(self.index.is_repeat("Trump announces new tariffs on EU goods", DAY))
+        self.assertFalse(self.index.is_repeat("Panda cub born at Edinburgh zoo", DAY))
+
+    def test_old_stories_fall_out_of_window(self):
+        self.assertFalse(self.index.is_repeat("Wildfires spread across California", DAY))
+        self.assertEqual(self.index.max_similarity("Wildfires spread across California"), 1.0)
+
+    def test_empty_index(self):
+        self.assertEqual(HeadlineIndex([], []).max_similarity("Anything"), 0.0)
+
+    @patch("daily_panda_image.utils.headline_index.ArchiveManifest")
+    def test_load_indexes_manifest_headlines_before_date(self, mock_manifest):
+        mock_manifest.load.return_value.range.return_value = [
+            {"date": "2026-06-08", "headline": "Zoo opens"},
+            {"date": "2026-06-09"},
+        ]
+        index = HeadlineIndex.load(before=DAY)
+        self.assertEqual(index.texts, ["Zoo opens"])
+        start, end = mock_manifest.load.return_value.range.call_args.args
+        self.assertEqual(end, DAY - datetime.timedelta(days=1))
+
+    @patch("daily_panda_image.utils.headline_index.ArchiveManifest")
+    def test_load_prefers_source_feed_titles(self, mock_manifest):
+        mock_manifest.load.return_value.range.return_value = [
+            {
+                "date": "2026-06-07",
+                "headline": "Keepers celebrate newborn cub, Edinburgh Zoo",
+                "source_headline": "Panda cub born at Edinburgh zoo",
+            },
+            {"date": "2026-06-08", "headline": "Zoo opens"},
+        ]
+        index = HeadlineIndex.load(before=DAY)
+        self.assertEqual(index.texts, ["Panda cub born at Edinburgh zoo", "Zoo opens"])
+        self.assertTrue(index.is_repeat("Panda cub born at Edinburgh Zoo", DAY))
+
+    def test_closest_matches_a_paraphrase(self):
+        titles = ["Heatwave grips southern Europe", "Panda cub born at Edinburgh zoo"]
+        self.assertEqual(closest("Edinburgh zoo welcomes a newborn panda cub", titles), 1)
+        self.assertIsNone(closest("Anything", []))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import datetime
+import os
+import sys
+import unittest
+
+# Add the src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from daily_panda_image.utils.headline_index import HeadlineIndex
+from daily_panda_image.utils.headline_ranker import (
+    HeadlineRanker,
+    clip_summary,
+    visual_score,
+)
+from daily_panda_image.utils.text_processor import TextProcessor
+
+DAY = datetime.date(2026, 6, 10)
+
+
+def headline(title: str, summary: str = "", sources: int = 1) -> dict:
+    return {"title": title, "summary": summary, "sources": sources}
+
+
+class TestVisualScore(unittest.TestCase):
+    def test_scenes_beat_abstract_stories(self):
+        festival = visual_score(headline("Lantern festival lights up the river"))
+        rates = visual_score(headline("Central bank holds interest rate as inflation cools"))
+        neutral = visual_score(headline("Minister resigns"))
+        self.assertGreater(festival, neutral)
+        self.assertGreater(neutral, rates)
+
+
+class TestClipSummary(unittest.TestCase):
+    def test_short_summary_is_unchanged(self):
+        self.assertEqual(clip_summary("Crowds gather.", budget=10), "Crowds gather.")
+
+    def test_keeps_whole_sentences_within_budget(self):
+        summary = "Crowds gather at dawn. Lanterns float away. Police close the bridge to traffic."
+        self.assertEqual(
+            clip_summary(summary, budget=10), "Crowds gather at dawn. Lanterns float away."
+        )
+
+    def test_long_first_sentence_is_cut_at_a_word(self):
+        clipped = clip_summary("one two three four five six seven eight nine ten", budget=7)
+        self.assertEqual(clipped, "one two three four...")
+        self.assertLessEqual(TextProcessor.estimate_tokens(clipped), 7)
+
+
+class TestHeadlineRanker(unittest.TestCase):
+    def test_keeps_top_k_in_score_order(self):
+        headlines = [
+            headline("Central bank holds interest rate"),
+            headline("Minister resigns"),
+            headline("Lantern festival lights up the river"),
+        ]
+        ranked, report = HeadlineRanker.rank(headlines, limit=2)
+        self.assertEqual(
+            [h["title"] for h in ranked],
+            ["Lantern festival lights up the river", "Minister resigns"],
+        )
+        self.assertEqual((report.headlines_before, report.headlines_after), (3, 2))
+
+    def test_source_agreement_breaks_ties(self):
+        ranked, _ = HeadlineRanker.rank(
+            [headline("Minister resigns"), headline("Mayor resigns", sources=3)], limit=1
+        )
+        self.assertEqual(ranked[0]["title"], "Mayor resigns")
+
+    def test_recent_story_loses_novelty(self):
+        history = HeadlineIndex(["Minister resigns over expenses"], [DAY - datetime.timedelta(1)])
+        ranked, _ = HeadlineRanker.rank(
+            [headline("Minister resigns over expenses"), headline("Mayor resigns")],
+            history,
+            DAY,
+            limit=1,
+        )
+        self.assertEqual(ranked[0]["title"], "Mayor resigns")
+
+    def test_report_measures_token_savings(self):
+        long_summary = " ".join(f"Sentence number {i} adds detail." for i in range(20))
+        headlines = [headline(f"Story {i}", long_summary) for i in range(8)]
+        ranked, report = HeadlineRanker.rank(headlines, limit=4, summary_budget=20)
+        self.assertEqual(len(ranked), 4)
+        self.assertGreater(report.tokens_before, 4 * report.tokens_after / 2)
+        self.assertEqual(report.tokens_saved, report.tokens_before - report.tokens_after)
+        self.assertIn("saved", report.summary())
+        self.assertEqual(headlines[0]["summary"], long_summary)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+import datetime
+import io
+import os
+import sys
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+from PIL import Image
+
+# Add the src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from daily_panda_image.utils.file_manager import FileManager
+from daily_panda_image.utils.image_hash import (
+    NEAR_DUPLICATE_DISTANCE,
+    ImageHash,
+    ImageHashIndex,
+    hash_files,
+    hash_image,
+)
+
+DAY = datetime.date(2026, 6, 1)
+
+
+def encode(pixels: np.ndarray, image_format: str = "PNG", size: int | None = None) -> bytes:
+    image = Image.fromarray(pixels)
+    if size:
+        image = image.resize((size, size))
+    buffer = io.BytesIO()
+    image.save(buffer, format=image_format)
+    return buffer.getvalue()
+
+
+def scene(seed: int, size: int = 128) -> np.ndarray:
+    """Blobs of colour at random places, so different seeds give different layouts."""
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0:size, 0:size] / size
+    pixels = np.zeros((size, size, 3))
+    for cx, cy, radius, colour in zip(
+        rng.random(4),
+        rng.random(4),
+        rng.uniform(0.1, 0.3, 4),
+        rng.uniform(0, 255, (4, 3)),
+        strict=True,
+    ):
+        pixels[(x - cx) ** 2 + (y - cy) ** 2 < radius**2] = colour
+    return np.clip(pixels + rng.normal(0, 4, pixels.shape), 0, 255).astype(np.uint8)
+
+
+@pytest.fixture
+def project_root(tmp_path):
+    with patch.object(FileManager, "get_project_root", return_value=tmp_path):
+        (tmp_path / "images").mkdir()
+        yield tmp_path
+
+
+class TestHashes:
+    def test_re_encoded_image_is_a_near_duplicate(self):
+        original = hash_image(encode(scene(1)))
+        brighter = np.clip(scene(1).astype(int) + 12, 0, 255).astype(np.uint8)
+        assert original.distance(hash_image(encode(scene(1), "WEBP"))) <= NEAR_DUPLICATE_DISTANCE
+        assert original.distance(hash_image(encode(brighter, size=96))) <= NEAR_DUPLICATE_DISTANCE
+
+    def test_different_scenes_are_far_apart(self):
+        distances = [
+            hash_image(encode(scene(1))).distance(hash_image(encode(scene(s)))) for s in (2, 3, 4)
+        ]
+        assert min(distances) > NEAR_DUPLICATE_DISTANCE
+
+    def test_parallel_build_matches_serial(self, tmp_path):
+        paths = []
+        for seed in range(4):
+            path = tmp_path / f"panda_2026-06-0{seed + 1}.png"
+            path.write_bytes(encode(scene(seed)))
+            paths.append(path)
+        assert hash_files(paths, workers=2) == hash_files(paths, workers=1)
+
+
+class TestImageHashIndex:
+    def test_near_duplicates_closest_first(self, project_root):
+        index = ImageHashIndex()
+        index.add(DAY + datetime.timedelta(days=1), ImageHash(0b0111, 0b1111))
+        index.add(DAY, ImageHash(0b1111, 0b0111))
+        index.add(DAY + datetime.timedelta(days=2), ImageHash(2**64 - 1, 2**64 - 1))
+
+        matches = index.near_duplicates(ImageHash(0b0111, 0b0111))
+
+        assert matches == [(DAY, 1), (DAY + datetime.timedelta(days=1), 1)]
+        assert index.near_duplicates(ImageHash(0b1111, 0b1111), exclude=DAY) == [
+            (DAY + datetime.timedelta(days=1), 1)
+        ]
+
+    def test_add_replaces_the_date(self, project_root):
+        index = ImageHashIndex()
+        index.add(DAY, ImageHash(1, 1))
+        index.add(DAY, ImageHash(2, 2))
+        assert len(index) == 1
+        assert int(index.records["dhash"][0]) == 2
+
+    def test_load_indexes_new_archive_images_and_persists(self, project_root):
+        (project_root / "images" / "panda_2026-06-01.png").write_bytes(encode(scene(1)))
+        (project_root / "images" / "panda_current.png").write_bytes(encode(scene(1)))
+
+        index = ImageHashIndex.load(workers=1)
+        assert index.records["date"].tolist() == [DAY]
+
+        (project_root / "images" / "panda_2026-06-02.png").write_bytes(encode(scene(1), "PNG", 100))
+        with patch("daily_panda_image.utils.image_hash.hash_files", wraps=hash_files) as hashed:
+            reloaded = ImageHashIndex.load(workers=1)
+        assert [path.name for path in hashed.call_args.args[0]] == ["panda_2026-06-02.png"]
+        assert len(reloaded) == 2
+        [(earlier, later, distance)] = reloaded.duplicate_pairs()
+        assert (earlier, later) == (DAY, DAY + datetime.timedelta(days=1))
+        assert distance <= NEAR_DUPLICATE_DISTANCE
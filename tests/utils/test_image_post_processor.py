@@ -0,0 +1,79 @@
+import asyncio
+import io
+import os
+import sys
+import unittest
+
+from PIL import Image, features
+
+# Add the src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from daily_panda_image.utils.image_post_processor import (
+    THUMBNAIL_SIZE,
+    ImagePostProcessor,
+    process_image,
+)
+
+
+def make_png(size: tuple[int, int] = (512, 512)) -> bytes:
+    """Gradient PNG saved without compression, like a worst-case API response."""
+    image = Image.new("RGB", size)
+    image.putdata(
+        [(x % 256, y % 256, (x + y) % 256) for y in range(size[1]) for x in range(size[0])]
+    )
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG", compress_level=0)
+    return buffer.getvalue()
+
+
+class TestProcessImage(unittest.TestCase):
+    def test_recompresses_png_losslessly(self):
+        original = make_png()
+        processed = process_image(original)
+        self.assertLess(len(processed.png), len(original))
+        self.assertEqual(processed.bytes_saved, len(original) - len(processed.png))
+        with (
+            Image.open(io.BytesIO(original)) as before,
+            Image.open(io.BytesIO(processed.png)) as after,
+        ):
+            self.assertEqual(before.tobytes(), after.tobytes())
+
+    def test_keeps_original_when_recompression_does_not_help(self):
+        buffer = io.BytesIO()
+        Image.new("RGB", (64, 64), "white").save(buffer, format="PNG", optimize=True)
+        original = buffer.getvalue()
+        self.assertIs(process_image(original).png, original)
+
+    def test_renders_derivatives(self):
+        processed = process_image(make_png())
+        expected = {"webp", "thumb"} | ({"avif"} if features.check("avif") else set())
+        self.assertEqual(set(processed.derivatives), expected)
+        with Image.open(io.BytesIO(processed.derivatives["thumb"])) as thumb:
+            self.assertEqual(thumb.format, "WEBP")
+            self.assertEqual(max(thumb.size), THUMBNAIL_SIZE)
+
+    def test_summary_lists_every_output(self):
+        summary = process_image(make_png()).summary()
+        self.assertIn("saved", summary)
+        self.assertIn("thumb", summary)
+
+
+class TestImagePostProcessor(unittest.TestCase):
+    def test_process_runs_in_worker_process(self):
+        original = make_png((128, 128))
+        with ImagePostProcessor(max_workers=1) as post_processor:
+            processed = post_processor.process(original)
+            self.assertIsNotNone(post_processor._executor)
+        self.assertIsNone(post_processor._executor)
+        self.assertEqual(processed.png, process_image(original).png)
+
+    def test_aprocess_matches_process(self):
+        original = make_png((64, 64))
+        with ImagePostProcessor(max_workers=1) as post_processor:
+            processed = asyncio.run(post_processor.aprocess(original))
+        self.assertEqual(processed.png, process_image(original).png)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import io
+import os
+import sys
+import unittest
+
+import numpy as np
+from PIL import Image, ImageFilter
+
+# Add the src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from daily_panda_image.utils.image_scorer import pick_best, score_image
+
+
+def encode(image: Image.Image) -> bytes:
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def detailed_image() -> Image.Image:
+    rng = np.random.default_rng(7)
+    return Image.fromarray(rng.integers(0, 256, (128, 128, 3), dtype=np.uint8))
+
+
+class TestScoreImage(unittest.TestCase):
+    def test_flat_image_scores_zero(self):
+        score = score_image(encode(Image.new("RGB", (64, 64), (40, 90, 40))))
+        self.assertEqual(score.sharpness, 0.0)
+        self.assertEqual(score.entropy, 0.0)
+        self.assertAlmostEqual(score.colour_spread, 1 / 512)
+
+    def test_blur_lowers_sharpness(self):
+        sharp = detailed_image()
+        blurred = sharp.filter(ImageFilter.GaussianBlur(3))
+        self.assertGreater(
+            score_image(encode(sharp)).sharpness, score_image(encode(blurred)).sharpness
+        )
+
+    def test_summary_lists_metrics(self):
+        self.assertIn("entropy", score_image(encode(detailed_image())).summary())
+
+
+class TestPickBest(unittest.TestCase):
+    def test_prefers_detailed_variant(self):
+        detailed = detailed_image()
+        variants = [
+            encode(Image.new("RGB", (128, 128), "grey")),
+            encode(detailed),
+            encode(detailed.filter(ImageFilter.GaussianBlur(4))),
+        ]
+        best, scores = pick_best(variants)
+        self.assertEqual(best, 1)
+        self.assertEqual(len(scores), 3)
+
+    def test_identical_variants_pick_first(self):
+        image = encode(detailed_image())
+        self.assertEqual(pick_best([image, image])[0], 0)
+
+    def test_no_variants(self):
+        with self.assertRaises(ValueError):
+            pick_best([])
+
+
+if __name__ == "__main__":
+    unittest.main()
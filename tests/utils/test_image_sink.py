@@ -0,0 +1,118 @@
+import base64
+import io
+import mmap
+import os
+import sys
+import tracemalloc
+
+import pytest
+
+# Add the src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from daily_panda_image.utils.image_sink import (
+    PNG_SIGNATURE,
+    BufferWriter,
+    copy_into,
+    decode_into,
+    decoded_size,
+)
+
+# Size of the fake image used for the allocation measurement
+LARGE_IMAGE_BYTES = 6 * 1024 * 1024
+
+# Peak allocation allowed while streaming LARGE_IMAGE_BYTES to a file
+STREAMING_PEAK_BUDGET = 512 * 1024
+
+
+def fake_png(size: int) -> bytes:
+    return PNG_SIGNATURE + os.urandom(size - len(PNG_SIGNATURE))
+
+
+@pytest.mark.parametrize("size", [9, 10, 11, 100])
+def test_decoded_size_matches_padding(size):
+    assert decoded_size(base64.b64encode(bytes(size)).decode()) == size
+
+
+def test_decoded_size_rejects_unpadded_text():
+    with pytest.raises(ValueError):
+        decoded_size("abcde")
+
+
+@pytest.mark.parametrize("chunk_chars", [12, 1000, 1 << 16])
+def test_decodes_into_file_in_chunks(chunk_chars):
+    image = fake_png(5000)
+    sink = io.BytesIO()
+    assert decode_into(base64.b64encode(image).decode(), sink, chunk_chars=chunk_chars) == 5000
+    assert sink.getvalue() == image
+
+
+def test_decodes_into_preallocated_buffer():
+    image = fake_png(1000)
+    buffer = bytearray(1024)
+    assert decode_into(base64.b64encode(image).decode(), memoryview(buffer)) == 1000
+    assert buffer[:1000] == image
+
+
+def test_decodes_into_mmap():
+    image = fake_png(4096)
+    with mmap.mmap(-1, 4096) as mapped:
+        decode_into(base64.b64encode(image).decode(), mapped)
+        assert mapped[:] == image
+
+
+def test_rejects_buffer_too_small_before_writing():
+    buffer = bytearray(100)
+    with pytest.raises(ValueError, match="does not fit"):
+        decode_into(base64.b64encode(fake_png(101)).decode(), buffer)
+    assert buffer == bytearray(100)
+
+
+def test_rejects_read_only_buffer():
+    with pytest.raises(TypeError):
+        BufferWriter(b"read only")
+
+
+def test_rejects_non_png_before_writing():
+    sink = io.BytesIO()
+    with pytest.raises(ValueError, match="not a PNG"):
+        decode_into(base64.b64encode(b"GIF89a" + bytes(100)).decode(), sink)
+    assert sink.getvalue() == b""
+
+
+def test_rejects_oversized_image():
+    with pytest.raises(ValueError, match="exceeds"):
+        decode_into(base64.b64encode(fake_png(200)).decode(), io.BytesIO(), max_bytes=100)
+
+
+def test_rejects_corrupt_base64():
+    text = base64.b64encode(fake_png(300)).decode()
+    with pytest.raises(ValueError, match="Invalid base64"):
+        decode_into(text[:200] + "!!!!" + text[204:], io.BytesIO())
+
+
+def test_copy_into_buffer():
+    buffer = bytearray(10)
+    assert copy_into(io.BytesIO(b"0123456789"), buffer) == 10
+    assert buffer == b"0123456789"
+
+
+def test_streaming_peak_allocation_is_one_chunk(tmp_path):
+    text = base64.b64encode(fake_png(LARGE_IMAGE_BYTES)).decode()
+
+    tracemalloc.start()
+    try:
+        with open(tmp_path / "streamed.png", "wb") as f:
+            decode_into(text, f)
+        _, streamed_peak = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        with open(tmp_path / "decoded.png", "wb") as f:
+            f.write(base64.b64decode(text))
+        _, decoded_peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    print(f"peak allocation: streamed {streamed_peak} B, b64decode {decoded_peak} B")
+    assert streamed_peak < STREAMING_PEAK_BUDGET
+    assert decoded_peak >= LARGE_IMAGE_BYTES
+    assert (tmp_path / "streamed.png").read_bytes() == (tmp_path / "decoded.png").read_bytes()
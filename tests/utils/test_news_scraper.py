@@ -0,0 +1,244 @@
+import datetime
+import io
+import os
+import sys
+import time
+from pathlib import Path
+
+import feedparser
+import pytest
+
+# Add the src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+import daily_panda_image.utils.news_scraper as news_scraper
+from daily_panda_image.utils.feed_parser import STREAM_MAX_ITEMS
+from daily_panda_image.utils.headline_index import HeadlineIndex
+from daily_panda_image.utils.news_scraper import NewsScraper
+from tests.stub_server import StubResponse, StubServer
+
+
+def rss(*titles: str) -> str:
+    items = "".join(
+        f"<item><title>{title}</title><description>About {title}</description></item>"
+        for title in titles
+    )
+    return (
+        f'<?xml version="1.0"?><rss version="2.0"><channel><title>t</title>{items}</channel></rss>'
+    )
+
+
+@pytest.fixture
+def server():
+    with StubServer() as stub:
+        yield stub
+
+
+def use_feeds(monkeypatch, server, *paths):
+    monkeypatch.setattr(
+        news_scraper, "NEWS_FEEDS", [(path.strip("/"), server.url(path)) for path in paths]
+    )
+
+
+class TestFetchHeadlines:
+    def test_latency_tracks_slowest_feed(self, monkeypatch, server):
+        server.add("/bbc", StubResponse(rss("Bamboo shortage"), delay=0.4))
+        server.add("/reuters", StubResponse(rss("Zoo opens"), delay=0.4))
+        server.add("/npr", StubResponse(rss("Panda cub born"), delay=0.4))
+        use_feeds(monkeypatch, server, "/bbc", "/reuters", "/npr")
+
+        started = time.monotonic()
+        headlines = NewsScraper.fetch_headlines(concurrent=True)
+        elapsed = time.monotonic() - started
+
+        assert [h["title"] for h in headlines] == ["Bamboo shortage", "Zoo opens", "Panda cub born"]
+        assert elapsed < 0.8  # the sequential sum would be 1.2s
+
+    def test_sequential_mode_sums_latency(self, monkeypatch, server):
+        server.add("/bbc", StubResponse(rss("Bamboo shortage"), delay=0.2))
+        server.add("/npr", StubResponse(rss("Panda cub born"), delay=0.2))
+        use_feeds(monkeypatch, server, "/bbc", "/npr")
+
+        started = time.monotonic()
+        headlines = NewsScraper.fetch_headlines(concurrent=False)
+
+        assert time.monotonic() - started >= 0.4
+        assert [h["title"] for h in headlines] == ["Bamboo shortage", "Panda cub born"]
+
+    def test_merges_in_priority_order_regardless_of_arrival(self, monkeypatch, server):
+        server.add("/slow", StubResponse(rss("First", "Shared"), delay=0.3))
+        server.add("/fast", StubResponse(rss("Shared", "Second")))
+        use_feeds(monkeypatch, server, "/slow", "/fast")
+
+        headlines = NewsScraper.fetch_headlines()
+
+        assert [h["title"] for h in headlines] == ["First", "Shared", "Second"]
+        assert headlines[0]["summary"] == "About First"
+
+    def test_hanging_feed_is_dropped_after_feed_timeout(self, monkeypatch, server):
+        server.add("/bbc", StubResponse(rss("Bamboo shortage")))
+        server.add("/ap", StubResponse(rss("Never arrives"), delay=3))
+        server.add("/npr", StubResponse(rss("Panda cub born")))
+        use_feeds(monkeypatch, server, "/bbc", "/ap", "/npr")
+
+        started = time.monotonic()
+        headlines = NewsScraper.fetch_headlines(feed_timeout=0.3)
+
+        assert time.monotonic() - started < 1.5
+        assert [h["title"] for h in headlines] == ["Bamboo shortage", "Panda cub born"]
+
+    def test_overall_deadline_caps_the_fetch(self, monkeypatch, server):
+        server.add("/bbc", StubResponse(rss("Bamboo shortage"), delay=3))
+        server.add("/npr", StubResponse(rss("Panda cub born")))
+        use_feeds(monkeypatch, server, "/bbc", "/npr")
+
+        started = time.monotonic()
+        headlines = NewsScraper.fetch_headlines(feed_timeout=10, deadline=0.3)
+
+        assert time.monotonic() - started < 1.5
+        assert [h["title"] for h in headlines] == ["Panda cub born"]
+
+    def test_failing_feed_is_skipped(self, monkeypatch, server):
+        server.add("/bbc", StubResponse("boom", status=500))
+        server.add("/npr", StubResponse(rss("Panda cub born")))
+        use_feeds(monkeypatch, server, "/bbc", "/npr")
+
+        assert [h["title"] for h in NewsScraper.fetch_headlines()] == ["Panda cub born"]
+
+    def test_caps_at_max_headlines(self, monkeypatch, server):
+        monkeypatch.setattr(news_scraper, "MAX_HEADLINES", 3)
+        server.add("/bbc", StubResponse(rss("A", "B")))
+        server.add("/npr", StubResponse(rss("C", "D")))
+        use_feeds(monkeypatch, server, "/bbc", "/npr")
+
+        assert [h["title"] for h in NewsScraper.fetch_headlines()] == ["A", "B", "C"]
+
+    def test_fast_parse_falls_back_to_feedparser(self, monkeypatch, server):
+        server.add("/bbc", StubResponse(rss("Bamboo shortage")))
+        server.add("/npr", StubResponse(rss("Panda&nbsp;cub born")))
+        use_feeds(monkeypatch, server, "/bbc", "/npr")
+
+        headlines = NewsScraper.fetch_headlines(fast_parse=True)
+
+        assert [h["title"] for h in headlines] == ["Bamboo shortage", "Panda\xa0cub born"]
+
+
+class TestReadFeed:
+    def test_fast_parse_stops_reading_after_enough_items(self):
+        body = rss(*(f"Story {i} " + "x" * 1000 for i in range(200))).encode()
+        stream = io.BytesIO(body)
+
+        entries, size = NewsScraper.read_feed(stream, fast=True)
+
+        assert len(entries) == STREAM_MAX_ITEMS
+        assert size == stream.tell() < len(body)
+
+    def test_fallback_reparses_the_bytes_already_read(self):
+        body = rss("Panda&nbsp;cub born", *(f"Story {i}" for i in range(2000))).encode()
+
+        entries, size = NewsScraper.read_feed(io.BytesIO(body), fast=True)
+
+        assert entries[0]["title"] == "Panda\xa0cub born"
+        assert (len(entries), size) == (2001, len(body))
+
+
+class TestMergeEntries:
+    def test_near_duplicates_across_feeds_are_folded(self):
+        headlines = NewsScraper.merge_entries(
+            [
+                [{"title": "Trump announces tariffs on EU goods"}],
+                [
+                    {
+                        "title": "Trump announces new tariffs on European Union goods",
+                        "summary": "S",
+                    },
+                    {"title": "Heatwave grips southern Europe"},
+                ],
+            ]
+        )
+        assert [(h["title"], h["sources"]) for h in headlines] == [
+            ("Trump announces tariffs on EU goods", 2),
+            ("Heatwave grips southern Europe", 1),
+        ]
+        assert headlines[0]["summary"] == "S"
+
+    def test_repeat_within_one_feed_counts_once(self):
+        headlines = NewsScraper.merge_entries([[{"title": "Zoo opens"}, {"title": "Zoo opens"}]])
+        assert headlines == [{"title": "Zoo opens", "summary": "", "sources": 1}]
+
+    def test_stories_from_recent_days_go_last(self):
+        today = datetime.date(2026, 6, 10)
+        history = HeadlineIndex(
+            ["Angry Venezuelans accuse government of negligence, Caracas, Venezuela"],
+            [today - datetime.timedelta(days=1)],
+        )
+        entries = [
+            [
+                {"title": "Angry Venezuelans accuse government of negligence after quakes"},
+                {"title": "Panda cub born at Edinburgh zoo"},
+            ]
+        ]
+        titles = [h["title"] for h in NewsScraper.merge_entries(entries, history, today)]
+        assert titles == [
+            "Panda cub born at Edinburgh zoo",
+            "Angry Venezuelans accuse government of negligence after quakes",
+        ]
+
+        # Outside the repeat window the story is fresh again
+        later = today + datetime.timedelta(days=30)
+        titles = [h["title"] for h in NewsScraper.merge_entries(entries, history, later)]
+        assert titles[0].startswith("Angry Venezuelans")
+
+
+FIXTURES = Path(__file__).resolve().parent.parent / "fixtures" / "feeds"
+
+
+class TestSanitizeSummary:
+    def test_plain_text_only_collapses_whitespace(self):
+        assert NewsScraper.sanitize_summary("  Crowds\n  gather. ") == "Crowds gather."
+
+    def test_strips_tags_entities_and_scripts(self):
+        summary = (
+            "<style>.ad{}</style><p>Rivers &amp; levees</p><p>hold&nbsp;firm</p>"
+            "<script>track()</script><!-- ad --><img src='pixel.gif'/><em>again</em>."
+        )
+        assert NewsScraper.sanitize_summary(summary) == "Rivers & levees hold firm again."
+
+    def test_normalises_to_ascii(self):
+        assert NewsScraper.sanitize_summary("<p>\u201cZ\u00fcrich\u201d \u2014 vote</p>") == (
+            '"Zurich" - vote'
+        )
+
+    def test_clamps_at_word_boundary(self):
+        summary = "<p>" + "word " * 200 + "</p>"
+        clamped = NewsScraper.sanitize_summary(summary, max_chars=50)
+        assert len(clamped) <= 50
+        assert clamped.endswith("word...")
+
+    def test_long_body_stops_early_but_keeps_budget(self):
+        body = "<div><p>" + "Sandbags line the river. " * 5000 + "</p></div>"
+        clamped = NewsScraper.sanitize_summary(body, max_chars=300)
+        assert 250 < len(clamped) <= 300
+
+    @pytest.mark.parametrize("path", sorted(FIXTURES.glob("*.xml")), ids=lambda p: p.name)
+    def test_real_world_samples(self, path):
+        entries = feedparser.parse(path.read_bytes()).entries
+        assert entries
+        for entry in entries:
+            summary = NewsScraper.sanitize_summary(entry.get("summary", ""))
+            assert summary
+            assert summary.isascii()
+            assert "<" not in summary and "&nbsp;" not in summary
+            assert "window.__ads" not in summary
+            assert len(summary) <= news_scraper.SUMMARY_MAX_CHARS
+
+
+class TestFormatForPrompt:
+    def test_empty(self):
+        assert NewsScraper.format_for_prompt([]) == "No headlines available."
+
+    def test_numbered_with_summary(self):
+        text = NewsScraper.format_for_prompt(
+            [{"title": "Zoo opens", "summary": "Crowds gather."}, {"title": "Rain"}]
+        )
+        assert text == "1. Zoo opens\n   Summary: Crowds gather.\n2. Rain"
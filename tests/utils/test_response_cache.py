@@ -0,0 +1,55 @@
+import os
+import sys
+
+import pytest
+
+# Add the src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from daily_panda_image.utils.response_cache import ResponseCache, cache_key
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResponseCache(tmp_path / "responses", max_bytes=300)
+
+
+def set_age(cache, key, mtime):
+    os.utime(cache._path(key), (mtime, mtime))
+
+
+class TestCacheKey:
+    def test_stable_and_input_sensitive(self):
+        assert cache_key("chat", "sys", "user", "gpt-4o") == cache_key(
+            "chat", "sys", "user", "gpt-4o"
+        )
+        assert cache_key("chat", "sys", "user", "gpt-4o") != cache_key(
+            "chat", "sys", "user", "gpt-4.1"
+        )
+
+    def test_parts_cannot_run_together(self):
+        assert cache_key("image", "ab", "c") != cache_key("image", "a", "bc")
+
+
+class TestResponseCache:
+    def test_miss_then_hit(self, cache):
+        key = cache_key("image", "prompt", "gpt-image-1-mini", "1024x1024")
+        assert cache.get(key) is None
+        cache.put(key, b"png")
+        assert cache.get(key) == b"png"
+
+    def test_text_round_trip(self, cache):
+        cache.put_text("k" * 64, "A panda.")
+        assert cache.get_text("k" * 64) == "A panda."
+
+    def test_evicts_least_recently_used(self, cache):
+        for i, key in enumerate(["a" * 64, "b" * 64, "c" * 64]):
+            cache.put(key, bytes(100))
+            set_age(cache, key, 1_000 + i)
+
+        cache.get("a" * 64)  # refreshes "a", leaving "b" as the oldest
+        cache.put("d" * 64, bytes(100))
+
+        assert cache.get("b" * 64) is None
+        assert cache.get("a" * 64) is not None
+        assert cache.get("d" * 64) is not None
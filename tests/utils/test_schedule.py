@@ -0,0 +1,48 @@
+import datetime
+import os
+import sys
+
+import pytest
+
+# Add the src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from daily_panda_image.utils.schedule import CronSchedule
+
+
+def utc(*args: int) -> datetime.datetime:
+    return datetime.datetime(*args, tzinfo=datetime.UTC)
+
+
+def test_daily_time_rolls_over_to_tomorrow():
+    schedule = CronSchedule("0 4 * * *")
+    assert schedule.next_after(utc(2026, 6, 1, 3, 59, 59)) == utc(2026, 6, 1, 4, 0)
+    assert schedule.next_after(utc(2026, 6, 1, 4, 0)) == utc(2026, 6, 2, 4, 0)
+
+
+def test_steps_lists_and_ranges():
+    schedule = CronSchedule("*/20 9-10 * * 1,3")  # Mondays and Wednesdays
+    assert schedule.next_after(utc(2026, 6, 1, 10, 45)) == utc(2026, 6, 3, 9, 0)  # a Monday
+    assert schedule.next_after(utc(2026, 6, 1, 9, 5)) == utc(2026, 6, 1, 9, 20)
+
+
+def test_day_of_month_or_day_of_week():
+    schedule = CronSchedule("0 0 13 * 5")  # the 13th, or any Friday
+    assert schedule.next_after(utc(2026, 6, 1)) == utc(2026, 6, 5)
+    assert schedule.next_after(utc(2026, 6, 12, 1)) == utc(2026, 6, 13)
+
+
+def test_sunday_as_seven():
+    assert CronSchedule("0 12 * * 7").next_after(utc(2026, 6, 1)) == utc(2026, 6, 7, 12)
+
+
+def test_other_time_zones_are_converted():
+    tokyo = datetime.timezone(datetime.timedelta(hours=9))
+    moment = datetime.datetime(2026, 6, 1, 12, 0, tzinfo=tokyo)  # 03:00 UTC
+    assert CronSchedule("0 4 * * *").next_after(moment) == utc(2026, 6, 1, 4, 0)
+
+
+@pytest.mark.parametrize("expression", ["0 4 * *", "60 4 * * *", "0 4 31 2 *", "*/0 * * * *"])
+def test_invalid_expressions(expression):
+    with pytest.raises(ValueError):
+        CronSchedule(expression).next_after(utc(2026, 6, 1))
@@ -0,0 +1,115 @@
+import json
+import logging
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+# Add the src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from daily_panda_image.utils.telemetry import (
+    LOGGER_NAME,
+    REGISTRY,
+    JsonFormatter,
+    Span,
+    SpanRegistry,
+    configure_logging,
+    span,
+)
+
+
+@pytest.fixture(autouse=True)
+def clean_registry():
+    REGISTRY.reset()
+    yield
+    REGISTRY.reset()
+
+
+class TestSpan:
+    def test_records_duration_and_attributes(self):
+        with span("image.decode", model="m") as current:
+            current.set(bytes=42)
+        assert current.seconds > 0
+        stats = REGISTRY.stats["image.decode"]
+        assert (stats.count, stats.errors, stats.totals) == (1, 0, {"bytes": 42})
+
+    def test_nested_span_knows_its_parent(self):
+        with span("prompt"), span("chat.completion") as inner:
+            pass
+        assert inner.parent == "prompt"
+        with span("save") as outer:
+            pass
+        assert outer.parent is None
+
+    def test_error_is_recorded_and_reraised(self):
+        with pytest.raises(ValueError), span("feed.fetch") as current:
+            raise ValueError("boom")
+        assert current.error == "ValueError"
+        assert REGISTRY.stats["feed.fetch"].errors == 1
+
+    def test_record_usage_reads_token_counts(self):
+        current = Span("chat.completion")
+        usage = SimpleNamespace(prompt_tokens=120, completion_tokens=80, total_tokens=200)
+        current.record_usage(SimpleNamespace(usage=usage))
+        assert current.attributes == {"prompt_tokens": 120, "completion_tokens": 80}
+
+    def test_record_usage_ignores_missing_usage(self):
+        current = Span("image.generate")
+        current.record_usage(SimpleNamespace())
+        assert current.attributes == {}
+
+
+class TestSpanRegistry:
+    def test_renders_prometheus_text(self):
+        registry = SpanRegistry()
+        registry.observe(Span("file.write", {"bytes": 100}, seconds=0.5))
+        registry.observe(Span("file.write", {"bytes": 50}, seconds=1.5))
+        registry.observe(Span("chat.completion", {"prompt_tokens": 300}, seconds=2.0, error="X"))
+
+        text = registry.render_prometheus()
+
+        assert "# TYPE daily_panda_span_seconds summary" in text
+        assert "_sum counter" not in text and "_count counter" not in text
+        assert 'daily_panda_span_seconds_sum{span="file.write"} 2' in text
+        assert 'daily_panda_span_seconds_count{span="file.write"} 2' in text
+        assert 'daily_panda_span_seconds_max{span="file.write"} 1.5' in text
+        assert 'daily_panda_span_errors_total{span="chat.completion"} 1' in text
+        assert 'daily_panda_span_bytes_total{span="file.write"} 150' in text
+        assert 'daily_panda_span_prompt_tokens_total{span="chat.completion"} 300' in text
+        assert "completion_tokens" not in text
+        assert text.endswith("\n")
+
+
+class TestLogging:
+    @pytest.fixture(autouse=True)
+    def restore_logger(self):
+        package_logger = logging.getLogger(LOGGER_NAME)
+        saved = package_logger.handlers[:], package_logger.level, package_logger.propagate
+        yield
+        package_logger.handlers[:], package_logger.level, package_logger.propagate = saved
+
+    def test_json_formatter_includes_span_fields(self):
+        record = logging.LogRecord(LOGGER_NAME, logging.DEBUG, __file__, 1, "done", None, None)
+        record.fields = {"span": "image.generate", "duration_ms": 12.5, "bytes": 3}
+        entry = json.loads(JsonFormatter().format(record))
+        assert entry["level"] == "debug"
+        assert entry["message"] == "done"
+        assert entry["span"] == "image.generate"
+        assert entry["bytes"] == 3
+
+    def test_spans_are_logged_as_json_at_debug(self, capsys):
+        configure_logging("DEBUG", json_logs=True)
+        with span("file.write", file="panda.png", bytes=7):
+            pass
+        entry = json.loads(capsys.readouterr().out.strip())
+        assert entry["span"] == "file.write"
+        assert entry["file"] == "panda.png"
+        assert entry["duration_ms"] >= 0
+
+    def test_info_level_hides_span_logs(self, capsys):
+        configure_logging("INFO")
+        with span("file.write"):
+            logging.getLogger(f"{LOGGER_NAME}.test").info("saved")
+        assert capsys.readouterr().out == "saved\n"
@@ -37,6 +37,23 @@ class TestEnforceAscii:
             == "Its Just ASCII text! yelled Kramer"
         )
 
+    def test_transliterates_unmapped_characters(self):
+        # Capitals, cedillas and ligatures are not in the table but decompose to ASCII
+        assert (
+            TextProcessor.enforce_ascii("Élaine in İstanbul: ﬁne ş") == "Elaine in Istanbul: fine s"
+        )
+
+    def test_letters_without_decomposition(self):
+        assert TextProcessor.enforce_ascii("Łódź, Ørsted") == "Lodz, Orsted"
+
+    def test_drops_characters_without_ascii_form(self):
+        assert TextProcessor.enforce_ascii("Panda in 東京 today") == "Panda in  today"
+
+    def test_matches_per_character_replacement(self):
+        text = "".join(TextProcessor.ASCII_REPLACEMENTS) + " plain"
+        expected = "".join(TextProcessor.ASCII_REPLACEMENTS.values()) + " plain"
+        assert TextProcessor.enforce_ascii(text) == expected
+
 
 class TestRemoveIncompleteLastSentence:
     def test_complete_sentences(self):
@@ -67,3 +84,20 @@ class TestRemoveIncompleteLastSentence:
 
     def test_empty_string(self):
         assert TextProcessor.remove_incomplete_last_sentence("") == ""
+
+
+class TestEstimateTokens:
+    def test_counts_words_and_punctuation(self):
+        assert TextProcessor.estimate_tokens("Panda cub born, keepers cheer!") == 7
+
+    def test_empty_string(self):
+        assert TextProcessor.estimate_tokens("") == 0
+
+
+class TestExtractHeadline:
+    def test_leading_bracket_line(self):
+        prompt = "[Zoo opens, Edinburgh]\n\nA photorealistic image of a panda."
+        assert TextProcessor.extract_headline(prompt) == "Zoo opens, Edinburgh"
+
+    def test_no_bracket_line(self):
+        assert TextProcessor.extract_headline("A photorealistic image of a panda.") is None